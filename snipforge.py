@@ -1,4 +1,5 @@
 #!/usr/bin/env python3
+# -*- coding: utf-8 -*-
 """
 SnipForge - A GUI-based text expansion tool for Linux and Windows
 Requires: PyQt5, pynput, pyperclip, Pillow
@@ -8,6 +9,7 @@ Install (Windows):
 
 Install (Linux):
     pip install PyQt5 pynput pyperclip Pillow evdev
+    # Optional: pyudev picks up keyboards plugged in while running
     # For Wayland support, add yourself to the 'input' group:
     sudo usermod -aG input $USER
     # Then log out and back in
@@ -17,9 +19,14 @@ __version__ = "1.0.0"
 
 import sys
 import json
+import logging
+import bisect
+import collections
 import os
 import re
 import socket
+import struct
+import threading
 import platform
 from datetime import datetime
 from pathlib import Path
@@ -36,14 +43,15 @@ from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout,
                              QComboBox, QCheckBox, QFileDialog, QGraphicsOpacityEffect,
                              QStackedWidget, QTreeWidget, QTreeWidgetItem, QAbstractItemView,
                              QCalendarWidget, QDialogButtonBox, QScrollArea, QFrame,
-                             QSizePolicy, QDateEdit, QTabWidget, QSpinBox, QGroupBox,
-                             QGridLayout)
-from PyQt5.QtCore import Qt, QThread, pyqtSignal, QTimer, QPointF, QSharedMemory, QDate, QEvent, QObject
-from PyQt5.QtGui import QIcon, QColor, QPixmap, QPainter, QPolygonF, QImage, QClipboard, QFont, QFontDatabase, QSyntaxHighlighter, QTextCharFormat
+                             QDateEdit, QTabWidget, QSpinBox, QGroupBox,
+                             QListView, QStyledItemDelegate, QStyle)
+from PyQt5.QtCore import (Qt, QThread, pyqtSignal, QTimer, QPointF, QSharedMemory, QDate, QEvent, QObject,
+                          QAbstractListModel, QModelIndex, QSize, QRectF, QRunnable, QThreadPool,
+                          QRegularExpression)
+from PyQt5.QtGui import QIcon, QIntValidator, QRegularExpressionValidator, QTextDocument, QColor, QPixmap, QPainter, QPolygonF, QImage, QClipboard, QFont, QFontDatabase, QSyntaxHighlighter, QTextCharFormat
 from pynput import keyboard
 from pynput.keyboard import Key, Controller
 import pyperclip
-from PIL import Image
 import io
 import time
 import subprocess
@@ -58,8 +66,14 @@ if IS_LINUX:
     except ImportError:
         HAS_EVDEV = False
         print("Warning: evdev not available. Using pynput for keyboard input.")
+    try:
+        import pyudev
+        HAS_PYUDEV = True
+    except ImportError:
+        HAS_PYUDEV = False
 else:
     HAS_EVDEV = False
+    HAS_PYUDEV = False
 
 # Windows-specific imports
 if IS_WINDOWS:
@@ -70,6 +84,18 @@ if IS_WINDOWS:
     except ImportError:
         HAS_WIN32 = False
 
+# Keyboard listener diagnostics; silent unless started with --verbose
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
+
+# Starting folder for file pickers (Path.home() looks the home folder up on every call)
+_HOME_DIR = str(Path.home())
+
+
+def _norm_path(path):
+    """Normalize a user-entered file path string, expanding a leading ~"""
+    return os.path.normpath(os.path.expanduser(path))
+
 
 def get_config_dir():
     """Get the configuration directory based on platform."""
@@ -174,6 +200,90 @@ class ToolTipFilter(QObject):
         return False  # Let other events pass through
 
 
+class TableGridSelector(QWidget):
+    """Painted grid for picking table dimensions by hovering and clicking"""
+
+    hovered = pyqtSignal(int, int)   # cols, rows highlighted (0, 0 when none)
+    selected = pyqtSignal(int, int)  # cols, rows clicked
+
+    def __init__(self, max_cols, max_rows, cell_size, cell_gap, is_light_theme=False, parent=None):
+        super().__init__(parent)
+        self.max_cols = max_cols
+        self.max_rows = max_rows
+        self.cell_size = cell_size
+        self.cell_gap = cell_gap
+        self.hover_cols = 0
+        self.hover_rows = 0
+
+        if is_light_theme:
+            self.cell_fill = QColor('#F0F0F0')
+            self.cell_border = QColor('#CCCCCC')
+        else:
+            self.cell_fill = QColor('#3A3A3A')
+            self.cell_border = QColor('#555555')
+        self.hover_fill = QColor('#FF6B00')
+        self.hover_border = QColor('#E65C00')
+
+        self.setFixedSize(
+            max_cols * (cell_size + cell_gap) + cell_gap,
+            max_rows * (cell_size + cell_gap) + cell_gap
+        )
+        self.setMouseTracking(True)
+        self.setCursor(Qt.PointingHandCursor)
+
+    def _cell_at(self, pos):
+        """Map a widget position to 1-based (cols, rows); gaps belong to the cell before them"""
+        pitch = self.cell_size + self.cell_gap
+        col = min(max(pos.x() - self.cell_gap, 0) // pitch, self.max_cols - 1)
+        row = min(max(pos.y() - self.cell_gap, 0) // pitch, self.max_rows - 1)
+        return col + 1, row + 1
+
+    def _set_hover(self, cols, rows):
+        # Mouse moves within the same cell change nothing, so skip the repaint
+        if cols == self.hover_cols and rows == self.hover_rows:
+            return
+        self.hover_cols = cols
+        self.hover_rows = rows
+        self.update()
+        self.hovered.emit(cols, rows)
+
+    def mouseMoveEvent(self, event):
+        self._set_hover(*self._cell_at(event.pos()))
+
+    def mousePressEvent(self, event):
+        if event.button() == Qt.LeftButton:
+            self.selected.emit(*self._cell_at(event.pos()))
+
+    def leaveEvent(self, event):
+        self._set_hover(0, 0)
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.Antialiasing)
+        pitch = self.cell_size + self.cell_gap
+        for row in range(self.max_rows):
+            for col in range(self.max_cols):
+                if col < self.hover_cols and row < self.hover_rows:
+                    painter.setPen(self.hover_border)
+                    painter.setBrush(self.hover_fill)
+                else:
+                    painter.setPen(self.cell_border)
+                    painter.setBrush(self.cell_fill)
+                painter.drawRoundedRect(self.cell_gap + col * pitch, self.cell_gap + row * pitch,
+                                        self.cell_size - 1, self.cell_size - 1, 3, 3)
+
+
+class ClampedIntValidator(QIntValidator):
+    """QIntValidator that snaps out-of-range or empty input to the nearest bound when editing ends"""
+
+    def fixup(self, text):
+        try:
+            value = int(text)
+        except ValueError:
+            return str(self.bottom())
+        return str(max(self.bottom(), min(self.top(), value)))
+
+
 # Cross-platform keyboard controller (pynput)
 _keyboard_controller = None
 
@@ -708,7 +818,7 @@ Combine text, variables, forms, and images!""")
         main_window = self.window()
         dialog = QFileDialog(main_window)
         dialog.setWindowTitle("Select Image")
-        dialog.setDirectory(str(Path.home()))
+        dialog.setDirectory(_HOME_DIR)
         dialog.setNameFilter("Image Files (*.png *.jpg *.jpeg *.gif *.bmp);;All Files (*)")
         dialog.setFileMode(QFileDialog.ExistingFile)
         dialog.setViewMode(QFileDialog.Detail)
@@ -1113,23 +1223,6 @@ class SnippetFormDialog(QDialog):
 
     def _build_lines(self, layout, content):
         """Build content lines with inline form fields"""
-        import re
-
-        # Define patterns for different variable types (excluding toggle sections)
-        patterns = [
-            (r'\{\{calc:([^}]+)\}\}', 'calc'),  # Calculation expression
-            (r'\{\{([^}:]+):multi=([^}]+)\}\}', 'multi'),
-            (r'\{\{([^}:]+):date\}\}', 'date_picker'),  # Date picker field
-            (r'\{\{date([+-])(\d+)\}\}', 'date_arith'),  # Date arithmetic
-            (r'\{\{(date)\}\}', 'date_var'),
-            (r'\{\{(time)\}\}', 'time_var'),
-            (r'\{\{(datetime)\}\}', 'datetime_var'),
-            (r'\{\{(clipboard)\}\}', 'clipboard_var'),
-            (r'\{\{(cursor)\}\}', 'cursor_var'),
-            (r'\{\{([^}=:]+)=([^}]+)\}\}', 'dropdown'),
-            (r'\{\{([^}=:/]+)\}\}', 'text'),  # Exclude / to not match closing toggle tags
-        ]
-
         # Split content into lines
         lines = content.split('\n')
 
@@ -1140,43 +1233,28 @@ class SnippetFormDialog(QDialog):
             line_layout.setContentsMargins(0, 2, 0, 2)
             line_layout.setSpacing(0)
 
-            remaining = line
-            while remaining:
-                earliest_match = None
-                earliest_pos = len(remaining)
-                match_type = None
-                match_groups = None
-                match_full = None
-
-                for pattern, var_type in patterns:
-                    match = re.search(pattern, remaining)
-                    if match and match.start() < earliest_pos:
-                        earliest_match = match
-                        earliest_pos = match.start()
-                        match_type = var_type
-                        match_groups = match.groups()
-                        match_full = match.group(0)
-
-                if earliest_match:
-                    # Add text before match
-                    if earliest_pos > 0:
-                        text_label = QLabel(remaining[:earliest_pos])
-                        text_label.setStyleSheet("color: #333333; background: transparent;")
-                        line_layout.addWidget(text_label)
-
-                    # Create form field
-                    field_id = f"field_{self.field_counter}"
-                    field_widget = self.create_form_field(field_id, match_type, match_groups, match_full)
-                    line_layout.addWidget(field_widget)
-                    self.field_counter += 1
-
-                    remaining = remaining[earliest_match.end():]
-                else:
-                    if remaining:
-                        text_label = QLabel(remaining)
-                        text_label.setStyleSheet("color: #333333; background: transparent;")
-                        line_layout.addWidget(text_label)
-                    remaining = ""
+            # One scan per line; the named group that matched is the field type
+            pos = 0
+            for match in _FORM_FIELD_RE.finditer(line):
+                # Add text before match
+                if match.start() > pos:
+                    text_label = QLabel(line[pos:match.start()])
+                    text_label.setStyleSheet("color: #333333; background: transparent;")
+                    line_layout.addWidget(text_label)
+
+                # Create form field from the groups belonging to the matched type
+                match_type = match.lastgroup
+                match_groups = match.groups()[match.lastindex:match.lastindex + _PREVIEW_FIELD_GROUPS[match_type]]
+                field_id = f"field_{self.field_counter}"
+                field_widget = self.create_form_field(field_id, match_type, match_groups, match.group(0))
+                line_layout.addWidget(field_widget)
+                self.field_counter += 1
+                pos = match.end()
+
+            if pos < len(line):
+                text_label = QLabel(line[pos:])
+                text_label.setStyleSheet("color: #333333; background: transparent;")
+                line_layout.addWidget(text_label)
 
             line_layout.addStretch()
             layout.addWidget(line_widget)
@@ -2379,30 +2457,697 @@ class RichContentEdit(QTextEdit):
         return self.rich_html is not None
 
 
+# Placeholder icon for custom emojis whose image file is missing (shared, built on first use)
+_MISSING_EMOJI_ICON = None
+
+def get_missing_emoji_icon():
+    """Get the shared "?" icon shown for missing custom emoji files"""
+    global _MISSING_EMOJI_ICON
+    if _MISSING_EMOJI_ICON is None:
+        pixmap = QPixmap(32, 32)
+        pixmap.fill(Qt.transparent)
+        painter = QPainter(pixmap)
+        font = QFont()
+        font.setPixelSize(20)
+        font.setBold(True)
+        painter.setFont(font)
+        painter.setPen(QColor('#9E9E9E'))
+        painter.drawText(pixmap.rect(), Qt.AlignCenter, "?")
+        painter.end()
+        _MISSING_EMOJI_ICON = QIcon(pixmap)
+    return _MISSING_EMOJI_ICON
+
+
+class EmojiListModel(QAbstractListModel):
+    """List model for one emoji picker section (emoji strings or custom emoji dicts)"""
+
+    EmojiIdRole = Qt.UserRole + 1     # Emoji character or 'custom:name'
+    CustomDataRole = Qt.UserRole + 2  # Custom emoji dict (None for Unicode emojis)
+
+    def __init__(self, items=(), icon_loader=None, parent=None):
+        super().__init__(parent)
+        self._items = tuple(items)
+        self._icon_loader = icon_loader  # callable(custom_dict) -> QIcon or None
+        self._icons = {}                 # Custom emoji name -> QIcon (None if missing)
+
+    def set_items(self, items):
+        """Replace the section contents"""
+        self.beginResetModel()
+        self._items = tuple(items)
+        self._icons.clear()
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._items)
+
+    def _custom_icon(self, custom_data):
+        name = custom_data.get('name', '')
+        if name not in self._icons:
+            self._icons[name] = self._icon_loader(custom_data) if self._icon_loader else None
+        return self._icons[name]
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        item = self._items[index.row()]
+        if isinstance(item, str):
+            if role in (Qt.DisplayRole, self.EmojiIdRole):
+                return item
+            return None
+
+        # Custom emoji
+        name = item.get('name', '')
+        if role == self.EmojiIdRole:
+            return f"custom:{name}"
+        if role == self.CustomDataRole:
+            return item
+        if role == Qt.DecorationRole:
+            return self._custom_icon(item)
+        if role == Qt.DisplayRole:
+            return None if self._custom_icon(item) else "?"
+        if role == Qt.ToolTipRole:
+            return f":{name}: (right-click for options)"
+        return None
+
+
+class EmojiItemDelegate(QStyledItemDelegate):
+    """Paints emoji picker cells directly instead of creating a button per emoji"""
+
+    CELL_SIZE = 40
+    ICON_SIZE = 32
+
+    def __init__(self, emoji_font, parent=None):
+        super().__init__(parent)
+        self.emoji_font = emoji_font
+        self.hover_fill = QColor(255, 107, 0, 51)
+        self.hover_border = QColor('#FF6B00')
+
+    def sizeHint(self, option, index):
+        return QSize(self.CELL_SIZE, self.CELL_SIZE)
+
+    def paint(self, painter, option, index):
+        painter.save()
+        rect = option.rect
+        if option.state & QStyle.State_MouseOver:
+            painter.setRenderHint(QPainter.Antialiasing)
+            painter.setPen(self.hover_border)
+            painter.setBrush(self.hover_fill)
+            painter.drawRoundedRect(QRectF(rect).adjusted(1.5, 1.5, -1.5, -1.5), 6, 6)
+
+        icon = index.data(Qt.DecorationRole)
+        if icon is not None:
+            inset = (rect.width() - self.ICON_SIZE) // 2
+            icon.paint(painter, rect.adjusted(inset, inset, -inset, -inset))
+        else:
+            painter.setFont(self.emoji_font)
+            painter.setPen(option.palette.color(option.palette.Text))
+            painter.drawText(rect, Qt.AlignCenter, index.data(Qt.DisplayRole) or "")
+        painter.restore()
+
+
+class EmojiGridView(QListView):
+    """Icon-mode list view showing one emoji section at a fixed number per row.
+
+    The view never scrolls itself; it is sized to fit its visible rows and sits
+    inside the picker's scroll area, so cells are painted rather than each
+    being a widget.
+    """
+
+    def __init__(self, model, delegate, per_row, parent=None):
+        super().__init__(parent)
+        self.per_row = per_row
+        cell = delegate.CELL_SIZE + 2  # 2px gap between cells
+
+        self.setObjectName("emojiGrid")
+        self.setModel(model)
+        self.setItemDelegate(delegate)
+        self.setViewMode(QListView.IconMode)
+        self.setMovement(QListView.Static)
+        self.setResizeMode(QListView.Adjust)
+        self.setUniformItemSizes(True)
+        self.setLayoutMode(QListView.Batched)
+        self.setBatchSize(100)
+        self.setGridSize(QSize(cell, cell))
+        self.setDragEnabled(False)
+        self.setSelectionMode(QAbstractItemView.NoSelection)
+        self.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.setFrameShape(QFrame.NoFrame)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.setMouseTracking(True)
+        self.viewport().setAttribute(Qt.WA_Hover, True)
+        self.viewport().setCursor(Qt.PointingHandCursor)
+        self.setContextMenuPolicy(Qt.CustomContextMenu)
+        self.setFixedWidth(per_row * cell)
+
+        model.modelReset.connect(self.update_height)
+        self.update_height()
+
+    def visible_count(self):
+        """Number of rows not hidden by the search filter"""
+        return sum(1 for row in range(self.model().rowCount()) if not self.isRowHidden(row))
+
+    def update_height(self, count=None):
+        """Resize to fit the visible rows (the view never scrolls itself)"""
+        if count is None:
+            count = self.visible_count()
+        rows = -(-count // self.per_row)
+        self.setFixedHeight(rows * self.gridSize().height())
+
+
+# Line prefixes inserted by the editor's list toolbar buttons
+_BULLET = '• '
+_CHECKBOX = '☐ '
+_NUM_PREFIX = tuple(f'{i}. ' for i in range(1, 257))  # "1. " .. "256. "
+
+# Preview field patterns (excluding toggle), in priority order for matches at the same position
+_PREVIEW_FIELD_PATTERNS = (
+    (r'\{\{snippet:([^}]+)\}\}', 'snippet'),
+    (r'\{\{calc:([^}]+)\}\}', 'calc'),
+    (r'\{\{([^}:]+):multi=([^}]+)\}\}', 'multi'),
+    (r'\{\{([^}:]+):date\}\}', 'date_picker'),
+    (r'\{\{date([+-])(\d+)\}\}', 'date_arith'),
+    (r'\{\{(date)\}\}', 'date_var'),
+    (r'\{\{(time)\}\}', 'time_var'),
+    (r'\{\{(datetime)\}\}', 'datetime_var'),
+    (r'\{\{(clipboard)\}\}', 'clipboard_var'),
+    (r'\{\{(cursor)\}\}', 'cursor_var'),
+    (r'\{\{([^}=:]+)=([^}]+)\}\}', 'dropdown'),
+    (r'\{\{([^}=:/]+)\}\}', 'text'),
+)
+# One alternation finds the next field of any type; the named group says which
+_PREVIEW_FIELD_RE = re.compile('|'.join(f'(?P<{var_type}>{pattern})' for pattern, var_type in _PREVIEW_FIELD_PATTERNS))
+_PREVIEW_FIELD_GROUPS = {var_type: re.compile(pattern).groups for pattern, var_type in _PREVIEW_FIELD_PATTERNS}
+# The fill-in form uses the same fields minus embedded snippets (expanded before the form opens)
+_FORM_FIELD_RE = re.compile('|'.join(f'(?P<{var_type}>{pattern})'
+                                     for pattern, var_type in _PREVIEW_FIELD_PATTERNS if var_type != 'snippet'))
+# Toggle sections ({{name:toggle}}...{{/name:toggle}}) and inline formatting markers
+_TOGGLE_RE = re.compile(r'\{\{([^}:]+):toggle\}\}(.*?)\{\{/\1:toggle\}\}', re.DOTALL)
+_BOLD_RE = re.compile(r'\*\*(.+?)\*\*')
+_ITALIC_RE = re.compile(r'(?<![*<])\*([^*]+?)\*(?![*>])')
+
+# Parsed "a|b|c" option lists for dropdown/multi preview fields (shared across builds)
+_FIELD_OPTIONS_CACHE = {}
+
+def split_field_options(options):
+    """Split a dropdown/multi option string into stripped options (cached)"""
+    parsed = _FIELD_OPTIONS_CACHE.get(options)
+    if parsed is None:
+        parsed = _FIELD_OPTIONS_CACHE[options] = tuple(opt.strip() for opt in options.split('|'))
+    return parsed
+
+# Long previews are built this many lines at a time, the rest as they scroll into view
+_PREVIEW_CHUNK_LINES = 200
+
+def split_preview_chunks(content, max_lines=_PREVIEW_CHUNK_LINES):
+    """Split preview content at line breaks into runs of about max_lines lines.
+
+    Never splits inside a toggle section, so each chunk builds on its own.
+    """
+    toggle_spans = [match.span() for match in _TOGGLE_RE.finditer(content)]
+    chunks = []
+    start = 0
+    line_count = 0
+    span_index = 0
+    pos = content.find('\n')
+    while pos != -1:
+        line_count += 1
+        if line_count >= max_lines:
+            while span_index < len(toggle_spans) and toggle_spans[span_index][1] <= pos:
+                span_index += 1
+            if span_index == len(toggle_spans) or toggle_spans[span_index][0] > pos:
+                chunks.append(content[start:pos])
+                start = pos + 1
+                line_count = 0
+        pos = content.find('\n', pos + 1)
+    chunks.append(content[start:])
+    return chunks
+
+def _calc_dialog_styles(is_light):
+    """Stylesheets and instructions markup for the Insert Calculation dialog in one theme"""
+    text_color = '#424242' if is_light else '#E0E0E0'
+    border_color = '#BDBDBD' if is_light else '#555555'
+    return {
+        'dialog': f"QDialog {{ background-color: {'#FFFFFF' if is_light else '#1E1E1E'}; }}",
+        'instructions': f"""<span style="color: {text_color};">
+            <b>Create a calculation expression:</b><br><br>
+            <b>Operators:</b> + - * / % ^ ( )<br>
+            <b>Functions:</b> round, floor, ceil, abs, min, max<br>
+            <b>Reference fields:</b> Use field names from your snippet<br><br>
+            <b>Examples:</b><br>
+            • <code>price * quantity</code><br>
+            • <code>subtotal * 1.08</code> (add 8% tax)<br>
+            • <code>round(total / 12, 2)</code> (monthly payment)<br>
+            • <code>(hours * rate) + bonus</code>
+            </span>""",
+        'expr_label': f"color: {text_color}; font-weight: bold;",
+        'expr_input': f"""
+            QLineEdit {{
+                padding: 8px;
+                border: 1px solid {border_color};
+                border-radius: 4px;
+                background-color: {'#FFFFFF' if is_light else '#2A2A2A'};
+                color: {text_color};
+            }}
+        """,
+        'cancel_btn': f"""
+            QPushButton {{
+                padding: 8px 20px;
+                border: 1px solid {border_color};
+                border-radius: 4px;
+                background-color: {'#F5F5F5' if is_light else '#3A3A3A'};
+                color: {text_color};
+            }}
+            QPushButton:hover {{
+                background-color: {'#E0E0E0' if is_light else '#4A4A4A'};
+            }}
+        """,
+        'insert_btn': """
+            QPushButton {
+                padding: 8px 20px;
+                border: none;
+                border-radius: 4px;
+                background-color: #FF6B00;
+                color: white;
+                font-weight: bold;
+            }
+            QPushButton:hover {
+                background-color: #FF8533;
+            }
+        """,
+    }
+
+
 class SnippetEditorWidget(QWidget):
     """Widget for creating/editing snippets (embedded in main window)"""
 
     save_requested = pyqtSignal(dict)
     cancel_requested = pyqtSignal()
 
+    # Themed dialog stylesheets, built once at class creation
+    _DIALOG_QSS_LIGHT = """
+        QDialog { background-color: #F5F5F5; }
+        QLabel { color: #212121; }
+        QSpinBox { background-color: #FFFFFF; color: #212121; border: 1px solid #BDBDBD; padding: 4px; border-radius: 4px; }
+        QLineEdit { background-color: #FFFFFF; color: #212121; border: 1px solid #BDBDBD; padding: 6px; border-radius: 4px; }
+        QLineEdit:focus { border-color: #FF6B00; }
+        QPushButton { background-color: #FF6B00; color: white; border: none; border-radius: 4px; padding: 8px 16px; }
+        QPushButton:hover { background-color: #FF8C00; }
+        QCheckBox { color: #212121; }
+        QScrollArea { border: none; background-color: #F5F5F5; }
+    """
+    _DIALOG_QSS_DARK = """
+        QDialog { background-color: #1E1E1E; }
+        QLabel { color: #E0E0E0; }
+        QSpinBox { background-color: #2A2A2A; color: #E0E0E0; border: 1px solid #424242; padding: 4px; border-radius: 4px; }
+        QLineEdit { background-color: #2A2A2A; color: #E0E0E0; border: 1px solid #424242; padding: 6px; border-radius: 4px; }
+        QLineEdit:focus { border-color: #FF6B00; }
+        QPushButton { background-color: #FF6B00; color: white; border: none; border-radius: 4px; padding: 8px 16px; }
+        QPushButton:hover { background-color: #FF8C00; }
+        QCheckBox { color: #E0E0E0; }
+        QScrollArea { border: none; background-color: #1E1E1E; }
+    """
+
+    _CANCEL_BTN_QSS_LIGHT = "QPushButton { background-color: #9E9E9E; } QPushButton:hover { background-color: #BDBDBD; }"
+    _CANCEL_BTN_QSS_DARK = "QPushButton { background-color: #424242; } QPushButton:hover { background-color: #555555; }"
+
+    _FILE_DIALOG_QSS_LIGHT = """
+        QFileDialog, QDialog { background-color: #F5F5F5; }
+        QWidget { background-color: #F5F5F5; color: #212121; }
+        QFrame { background-color: #F5F5F5; }
+        QTreeView, QListView, QTableView {
+            background-color: #FFFFFF; color: #212121;
+            border: 1px solid #BDBDBD;
+        }
+        QTreeView::item:selected, QListView::item:selected, QTableView::item:selected {
+            background-color: #FFE0B2; color: #212121;
+        }
+        QLineEdit {
+            background-color: #FFFFFF; color: #212121;
+            border: 1px solid #BDBDBD; border-radius: 4px; padding: 4px;
+        }
+        QPushButton {
+            background-color: #FF6B00; color: white;
+            border: none; border-radius: 4px; padding: 6px 12px;
+        }
+        QPushButton:hover { background-color: #FF8C00; }
+        QComboBox {
+            background-color: #FFFFFF; color: #212121;
+            border: 1px solid #BDBDBD; border-radius: 4px; padding: 4px;
+        }
+        QHeaderView::section {
+            background-color: #E0E0E0; color: #212121;
+            border: none; padding: 4px;
+        }
+        QToolButton {
+            background-color: #E0E0E0;
+            border: 1px solid #BDBDBD; border-radius: 4px; padding: 4px;
+        }
+        QToolButton:hover { background-color: #D0D0D0; }
+    """
+    _FILE_DIALOG_QSS_DARK = """
+        QFileDialog, QDialog { background-color: #1E1E1E; }
+        QWidget { background-color: #1E1E1E; color: #E0E0E0; }
+        QFrame { background-color: #1E1E1E; }
+        QTreeView, QListView, QTableView {
+            background-color: #2A2A2A; color: #E0E0E0;
+            border: 1px solid #424242;
+        }
+        QTreeView::item:selected, QListView::item:selected, QTableView::item:selected {
+            background-color: #3D2814; color: #FFFFFF;
+        }
+        QLineEdit {
+            background-color: #2A2A2A; color: #E0E0E0;
+            border: 1px solid #424242; border-radius: 4px; padding: 4px;
+        }
+        QPushButton {
+            background-color: #FF6B00; color: white;
+            border: none; border-radius: 4px; padding: 6px 12px;
+        }
+        QPushButton:hover { background-color: #FF8C00; }
+        QComboBox {
+            background-color: #2A2A2A; color: #E0E0E0;
+            border: 1px solid #424242; border-radius: 4px; padding: 4px;
+        }
+        QHeaderView::section {
+            background-color: #2A2A2A; color: #E0E0E0;
+            border: none; padding: 4px;
+        }
+        QToolButton {
+            background-color: #3D3D3D;
+            border: 1px solid #424242; border-radius: 4px; padding: 4px;
+        }
+        QToolButton:hover { background-color: #4A4A4A; }
+    """
+
+    _INPUT_DIALOG_QSS_LIGHT = """
+        QInputDialog {
+            background-color: #F5F5F5;
+        }
+        QInputDialog QLabel {
+            color: #212121;
+        }
+        QInputDialog QLineEdit {
+            background-color: #FFFFFF;
+            color: #212121;
+            border: 1px solid #BDBDBD;
+            padding: 6px;
+            border-radius: 4px;
+        }
+        QInputDialog QLineEdit:focus {
+            border-color: #FF6B00;
+        }
+        QInputDialog QPushButton {
+            background-color: #FF6B00;
+            color: white;
+            border: none;
+            border-radius: 4px;
+            padding: 8px 16px;
+            min-width: 70px;
+        }
+        QInputDialog QPushButton:hover {
+            background-color: #FF8C00;
+        }
+        QInputDialog QComboBox {
+            background-color: #FFFFFF;
+            color: #212121;
+            border: 1px solid #BDBDBD;
+            padding: 6px;
+            border-radius: 4px;
+        }
+        QInputDialog QComboBox QAbstractItemView {
+            background-color: #FFFFFF;
+            color: #212121;
+            selection-background-color: #FFE0CC;
+        }
+    """
+    _INPUT_DIALOG_QSS_DARK = """
+        QInputDialog {
+            background-color: #1E1E1E;
+        }
+        QInputDialog QLabel {
+            color: #E0E0E0;
+        }
+        QInputDialog QLineEdit {
+            background-color: #2A2A2A;
+            color: #E0E0E0;
+            border: 1px solid #424242;
+            padding: 6px;
+            border-radius: 4px;
+        }
+        QInputDialog QLineEdit:focus {
+            border-color: #FF6B00;
+        }
+        QInputDialog QPushButton {
+            background-color: #FF6B00;
+            color: white;
+            border: none;
+            border-radius: 4px;
+            padding: 8px 16px;
+            min-width: 70px;
+        }
+        QInputDialog QPushButton:hover {
+            background-color: #FF8C00;
+        }
+        QInputDialog QComboBox {
+            background-color: #2A2A2A;
+            color: #E0E0E0;
+            border: 1px solid #424242;
+            padding: 6px;
+            border-radius: 4px;
+        }
+        QInputDialog QComboBox QAbstractItemView {
+            background-color: #1E1E1E;
+            color: #E0E0E0;
+            selection-background-color: #3D2814;
+        }
+    """
+
+    # Insert Calculation dialog styles, formatted once per theme
+    _CALC_DIALOG_QSS_LIGHT = _calc_dialog_styles(True)
+    _CALC_DIALOG_QSS_DARK = _calc_dialog_styles(False)
+
+    # Preview content: dark background for every child, transparent text runs
+    _PREVIEW_CONTENT_QSS = """
+        * { background-color: #1E1E1E; }
+        QLabel#previewText { color: #E0E0E0; background: transparent; }
+    """
+
+    # Preview form field styles (one parse per distinct string)
+    _PREVIEW_SNIPPET_QSS = """
+        QLabel {
+            background-color: #E8EAF6;
+            color: #3F51B5;
+            border: 1px solid #7986CB;
+            border-radius: 3px;
+            padding: 2px 8px;
+            font-weight: 500;
+        }
+    """
+    _PREVIEW_TEXT_FIELD_QSS = """
+        QLineEdit {
+            background-color: #FFFDE7;
+            color: #333333;
+            border: 1px solid #FDD835;
+            border-radius: 3px;
+            padding: 2px 6px;
+            min-width: 120px;
+            max-width: 200px;
+        }
+    """
+    _PREVIEW_COMBO_QSS = """
+        QComboBox {
+            background-color: #FFFDE7;
+            color: #333333;
+            border: 1px solid #FDD835;
+            border-radius: 3px;
+            padding: 2px 6px;
+            min-width: 100px;
+        }
+        QComboBox::drop-down {
+            border: none;
+            width: 20px;
+        }
+        QComboBox QAbstractItemView {
+            background-color: #FFFDE7;
+            color: #333333;
+            selection-background-color: #FDD835;
+        }
+    """
+    _PREVIEW_MULTI_QSS = """
+        QCheckBox {
+            color: #E0E0E0;
+            spacing: 4px;
+        }
+        QCheckBox::indicator {
+            width: 14px;
+            height: 14px;
+            border: 2px solid #4A90D9;
+            border-radius: 3px;
+            background-color: #1E1E1E;
+        }
+        QCheckBox::indicator:checked {
+            background-color: #4A90D9;
+        }
+    """
+    _PREVIEW_DATE_EDIT_QSS = """
+        QDateEdit {
+            background-color: #FFFDE7;
+            color: #333333;
+            border: 1px solid #FDD835;
+            border-radius: 3px;
+            padding: 2px 6px;
+            min-width: 110px;
+        }
+        QDateEdit::drop-down {
+            border: none;
+            width: 20px;
+        }
+    """
+    _PREVIEW_DATE_LABEL_QSS = """
+        QLabel {
+            background-color: #E3F2FD;
+            color: #1565C0;
+            border: 1px solid #64B5F6;
+            border-radius: 3px;
+            padding: 2px 8px;
+            font-weight: 500;
+        }
+    """
+    _PREVIEW_CLIPBOARD_QSS = """
+        QLabel {
+            background-color: #F3E5F5;
+            color: #7B1FA2;
+            border: 1px solid #BA68C8;
+            border-radius: 3px;
+            padding: 2px 8px;
+            font-weight: 500;
+            font-size: 10px;
+        }
+    """
+    _PREVIEW_CURSOR_QSS = """
+        QLabel {
+            background-color: #E8F5E9;
+            color: #2E7D32;
+            border: 1px solid #81C784;
+            border-radius: 3px;
+            padding: 2px 8px;
+            font-weight: 500;
+            font-size: 10px;
+        }
+    """
+    _PREVIEW_CALC_QSS = """
+        QLabel {
+            background-color: #FFF3E0;
+            color: #E65100;
+            border: 1px solid #FFB74D;
+            border-radius: 3px;
+            padding: 2px 8px;
+            font-weight: 500;
+            font-family: monospace;
+        }
+    """
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.snippet = {}
         self.is_editing = False
         self.edit_index = -1
         self.snippets_list = []  # Reference to all snippets for Insert Snippet feature
+        self._snippet_desc_by_trigger = {}  # Preview chip labels, rebuilt by set_snippets
         self.date_format_getter = lambda: '%m/%d/%Y'  # Default date format getter
         self.time_format_getter = lambda: '%I:%M %p'  # Default time format getter
         self.is_light_theme = False  # Track current theme for dialog styling
+        self._main_window = None  # Top-level window, resolved on first dialog open
+        self._preview_dialog = None  # Last preview dialog, reused while its content is unchanged
+        self._preview_key = None
+        self._update_dialog_stylesheets()
 
         # Emoji picker data (lazy-loaded)
         self.emoji_database = None      # Categorized emoji data
-        self.emoji_favorites = []       # User's favorite emojis
+        self.emoji_favorites = {}       # User's favorite emojis (ordered dict used as a set)
         self.custom_emojis = []         # Custom emoji list
+        self._custom_by_name = {}       # Custom emoji name -> entry in custom_emojis
         self.emoji_search_index = {}    # Name -> emoji for search
+        self._sorted_search_terms = []  # Sorted search index keys for prefix lookup
+        self._category_plan = ()        # (cat_id, cat_name, emojis) for database sections
+        self._emoji_qss_cache = {}      # is_light_theme -> picker stylesheet
+        self._custom_icon_cache = {}    # (path, mtime, size) -> scaled custom emoji QIcon
+        self._custom_image_cache = {}   # (path, mtime) -> 24px QImage inserted into content
+
+        # Preview field type -> widget builder
+        self._preview_field_builders = {
+            'snippet': self._preview_snippet,
+            'text': self._preview_text,
+            'dropdown': self._preview_dropdown,
+            'multi': self._preview_multi,
+            'date_picker': self._preview_date_picker,
+            'date_arith': self._preview_date_arith,
+            'date_var': self._preview_date,
+            'time_var': self._preview_time,
+            'datetime_var': self._preview_datetime,
+            'clipboard_var': self._preview_clipboard,
+            'cursor_var': self._preview_cursor,
+            'calc': self._preview_calc,
+        }
+        # A blank preview line is a spacer as tall as a text row (line plus 2px margins)
+        self._preview_blank_line_px = self.fontMetrics().lineSpacing() + 4
 
         self.init_ui()
 
+    def _get_main_window(self):
+        """Return the top-level window, caching it once the editor is embedded"""
+        if self._main_window is None:
+            window = self.window()
+            if window is self:
+                return window  # Not parented yet; don't cache
+            self._main_window = window
+        return self._main_window
+
+    def _get_custom_icon(self, img_path, size=32, mtime=None):
+        """Return a scaled custom emoji icon, reusing it until the file changes"""
+        if mtime is None:
+            try:
+                mtime = img_path.stat().st_mtime
+            except OSError:
+                return None
+        key = (str(img_path), mtime, size)
+        icon = self._custom_icon_cache.get(key)
+        if icon is None:
+            icon = self._custom_icon_cache[key] = QIcon(self._load_emoji_pixmap(img_path, size))
+        return icon
+
+    def _load_emoji_pixmap(self, img_path, size=32):
+        """Load an emoji image no larger than size, only smoothing real downscales"""
+        pixmap = QPixmap(str(img_path))
+        largest = max(pixmap.width(), pixmap.height())
+        if largest <= size:
+            return pixmap
+        transform = Qt.SmoothTransformation if largest > size * 2 else Qt.FastTransformation
+        return pixmap.scaled(size, size, Qt.KeepAspectRatio, transform)
+
+    def _get_custom_insert_image(self, img_path):
+        """Return the 24px image inserted for a custom emoji (None if it can't be loaded)"""
+        try:
+            key = (str(img_path), img_path.stat().st_mtime)
+        except OSError:
+            return None
+        image = self._custom_image_cache.get(key)
+        if image is None:
+            image = QImage(str(img_path))
+            if image.isNull():
+                return None
+            # Scale to reasonable emoji size (24x24)
+            image = self._custom_image_cache[key] = image.scaled(24, 24, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+        return image
+
+    def _invalidate_custom_icon(self, img_path):
+        """Drop cached icons and insert images for a custom emoji file"""
+        path_str = str(img_path)
+        for cache in (self._custom_icon_cache, self._custom_image_cache):
+            for key in [k for k in cache if k[0] == path_str]:
+                del cache[key]
+
     def set_date_format_getter(self, getter):
         """Set the function to get the current date format"""
         self.date_format_getter = getter
@@ -2412,6 +3157,10 @@ class SnippetEditorWidget(QWidget):
         self.time_format_getter = getter
 
     def init_ui(self):
+        # Suspend repaints while the layouts are assembled so Qt computes
+        # geometry once at the end instead of after every setter
+        self.setUpdatesEnabled(False)
+
         # Make widget background transparent to show main window background
         self.setStyleSheet("background: transparent;")
 
@@ -2957,9 +3706,13 @@ class SnippetEditorWidget(QWidget):
         main_layout.addLayout(left_column, 3)
         main_layout.addWidget(right_scroll, 1)
 
+        self.setUpdatesEnabled(True)
+        self.updateGeometry()
+
     def update_theme(self, is_light_theme):
         """Update editor widget styling based on current theme"""
         self.is_light_theme = is_light_theme
+        self._update_dialog_stylesheets()
         # Define button-specific style modifiers
         btn_style_modifiers = {
             'italic_btn': "QPushButton { font-style: italic; }",
@@ -3103,16 +3856,16 @@ class SnippetEditorWidget(QWidget):
         cursor_pos = cursor.position()
 
         # Use same pattern as working dialogs - main window as parent
-        main_window = self.window()
+        main_window = self._get_main_window()
         dialog = QFileDialog(main_window)
         dialog.setWindowTitle("Select Image")
-        dialog.setDirectory(str(Path.home()))
+        dialog.setDirectory(_HOME_DIR)
         dialog.setNameFilter("Image Files (*.png *.jpg *.jpeg *.gif *.bmp);;All Files (*)")
         dialog.setFileMode(QFileDialog.ExistingFile)
         dialog.setViewMode(QFileDialog.Detail)
         dialog.setOption(QFileDialog.DontUseNativeDialog, True)
         dialog.setAttribute(Qt.WA_TranslucentBackground, False)
-        dialog.setStyleSheet(self.get_file_dialog_stylesheet())
+        dialog.setStyleSheet(self._current_file_qss)
 
         if dialog.exec_() == QDialog.Accepted:
             files = dialog.selectedFiles()
@@ -3131,12 +3884,12 @@ class SnippetEditorWidget(QWidget):
         if cursor.hasSelection():
             # Convert selected lines to bullet list
             selected_text = cursor.selectedText()
-            lines = selected_text.split('\u2029')  # QTextEdit uses paragraph separator
-            bulleted = '\n'.join(f'• {line}' for line in lines if line.strip())
-            cursor.insertText(bulleted)
+            # selectedText() uses U+2029 between paragraphs; splitlines() handles it natively
+            lines = selected_text.splitlines()
+            cursor.insertText('\n'.join([_BULLET + line for line in lines if line and not line.isspace()]))
         else:
             # Insert single bullet point
-            cursor.insertText('• ')
+            cursor.insertText(_BULLET)
         self.content_input.setTextCursor(cursor)
         self.content_input.setFocus()
 
@@ -3146,9 +3899,14 @@ class SnippetEditorWidget(QWidget):
         if cursor.hasSelection():
             # Convert selected lines to numbered list
             selected_text = cursor.selectedText()
-            lines = selected_text.split('\u2029')  # QTextEdit uses paragraph separator
-            numbered = '\n'.join(f'{i+1}. {line}' for i, line in enumerate(lines) if line.strip())
-            cursor.insertText(numbered)
+            # selectedText() uses U+2029 between paragraphs; splitlines() handles it natively
+            lines = selected_text.splitlines()
+            # Filter blank lines first so numbering stays contiguous
+            lines = [line for line in lines if line and not line.isspace()]
+            cursor.insertText('\n'.join([
+                (_NUM_PREFIX[i] if i < len(_NUM_PREFIX) else f'{i + 1}. ') + line
+                for i, line in enumerate(lines)
+            ]))
         else:
             # Insert "1. " at cursor
             cursor.insertText('1. ')
@@ -3161,132 +3919,44 @@ class SnippetEditorWidget(QWidget):
         if cursor.hasSelection():
             # Convert selected lines to checkbox list
             selected_text = cursor.selectedText()
-            lines = selected_text.split('\u2029')  # QTextEdit uses paragraph separator
-            checkboxed = '\n'.join(f'☐ {line}' for line in lines if line.strip())
-            cursor.insertText(checkboxed)
+            # selectedText() uses U+2029 between paragraphs; splitlines() handles it natively
+            lines = selected_text.splitlines()
+            cursor.insertText('\n'.join([_CHECKBOX + line for line in lines if line and not line.isspace()]))
         else:
             # Insert checkbox at cursor
-            cursor.insertText('☐ ')
+            cursor.insertText(_CHECKBOX)
         self.content_input.setTextCursor(cursor)
         self.content_input.setFocus()
 
+    def _update_dialog_stylesheets(self):
+        """Resolve the dialog stylesheets for the current theme (call on theme change)"""
+        self._current_dialog_qss = self.get_dialog_stylesheet()
+        self._current_cancel_qss = self.get_cancel_btn_stylesheet()
+        self._current_file_qss = self.get_file_dialog_stylesheet()
+        self._current_input_qss = self.get_input_dialog_stylesheet()
+
     def get_dialog_stylesheet(self):
         """Get stylesheet for dialogs based on current theme"""
-        if self.is_light_theme:
-            return """
-                QDialog { background-color: #F5F5F5; }
-                QLabel { color: #212121; }
-                QSpinBox { background-color: #FFFFFF; color: #212121; border: 1px solid #BDBDBD; padding: 4px; border-radius: 4px; }
-                QLineEdit { background-color: #FFFFFF; color: #212121; border: 1px solid #BDBDBD; padding: 6px; border-radius: 4px; }
-                QLineEdit:focus { border-color: #FF6B00; }
-                QPushButton { background-color: #FF6B00; color: white; border: none; border-radius: 4px; padding: 8px 16px; }
-                QPushButton:hover { background-color: #FF8C00; }
-                QCheckBox { color: #212121; }
-                QScrollArea { border: none; background-color: #F5F5F5; }
-            """
-        else:
-            return """
-                QDialog { background-color: #1E1E1E; }
-                QLabel { color: #E0E0E0; }
-                QSpinBox { background-color: #2A2A2A; color: #E0E0E0; border: 1px solid #424242; padding: 4px; border-radius: 4px; }
-                QLineEdit { background-color: #2A2A2A; color: #E0E0E0; border: 1px solid #424242; padding: 6px; border-radius: 4px; }
-                QLineEdit:focus { border-color: #FF6B00; }
-                QPushButton { background-color: #FF6B00; color: white; border: none; border-radius: 4px; padding: 8px 16px; }
-                QPushButton:hover { background-color: #FF8C00; }
-                QCheckBox { color: #E0E0E0; }
-                QScrollArea { border: none; background-color: #1E1E1E; }
-            """
+        return self._DIALOG_QSS_LIGHT if self.is_light_theme else self._DIALOG_QSS_DARK
 
     def get_cancel_btn_stylesheet(self):
         """Get cancel button stylesheet based on current theme"""
-        if self.is_light_theme:
-            return "QPushButton { background-color: #9E9E9E; } QPushButton:hover { background-color: #BDBDBD; }"
-        else:
-            return "QPushButton { background-color: #424242; } QPushButton:hover { background-color: #555555; }"
+        return self._CANCEL_BTN_QSS_LIGHT if self.is_light_theme else self._CANCEL_BTN_QSS_DARK
 
     def get_file_dialog_stylesheet(self):
         """Get stylesheet for QFileDialog based on current theme"""
-        if self.is_light_theme:
-            return """
-                QFileDialog, QDialog { background-color: #F5F5F5; }
-                QWidget { background-color: #F5F5F5; color: #212121; }
-                QFrame { background-color: #F5F5F5; }
-                QTreeView, QListView, QTableView {
-                    background-color: #FFFFFF; color: #212121;
-                    border: 1px solid #BDBDBD;
-                }
-                QTreeView::item:selected, QListView::item:selected, QTableView::item:selected {
-                    background-color: #FFE0B2; color: #212121;
-                }
-                QLineEdit {
-                    background-color: #FFFFFF; color: #212121;
-                    border: 1px solid #BDBDBD; border-radius: 4px; padding: 4px;
-                }
-                QPushButton {
-                    background-color: #FF6B00; color: white;
-                    border: none; border-radius: 4px; padding: 6px 12px;
-                }
-                QPushButton:hover { background-color: #FF8C00; }
-                QComboBox {
-                    background-color: #FFFFFF; color: #212121;
-                    border: 1px solid #BDBDBD; border-radius: 4px; padding: 4px;
-                }
-                QHeaderView::section {
-                    background-color: #E0E0E0; color: #212121;
-                    border: none; padding: 4px;
-                }
-                QToolButton {
-                    background-color: #E0E0E0;
-                    border: 1px solid #BDBDBD; border-radius: 4px; padding: 4px;
-                }
-                QToolButton:hover { background-color: #D0D0D0; }
-            """
-        else:
-            return """
-                QFileDialog, QDialog { background-color: #1E1E1E; }
-                QWidget { background-color: #1E1E1E; color: #E0E0E0; }
-                QFrame { background-color: #1E1E1E; }
-                QTreeView, QListView, QTableView {
-                    background-color: #2A2A2A; color: #E0E0E0;
-                    border: 1px solid #424242;
-                }
-                QTreeView::item:selected, QListView::item:selected, QTableView::item:selected {
-                    background-color: #3D2814; color: #FFFFFF;
-                }
-                QLineEdit {
-                    background-color: #2A2A2A; color: #E0E0E0;
-                    border: 1px solid #424242; border-radius: 4px; padding: 4px;
-                }
-                QPushButton {
-                    background-color: #FF6B00; color: white;
-                    border: none; border-radius: 4px; padding: 6px 12px;
-                }
-                QPushButton:hover { background-color: #FF8C00; }
-                QComboBox {
-                    background-color: #2A2A2A; color: #E0E0E0;
-                    border: 1px solid #424242; border-radius: 4px; padding: 4px;
-                }
-                QHeaderView::section {
-                    background-color: #2A2A2A; color: #E0E0E0;
-                    border: none; padding: 4px;
-                }
-                QToolButton {
-                    background-color: #3D3D3D;
-                    border: 1px solid #424242; border-radius: 4px; padding: 4px;
-                }
-                QToolButton:hover { background-color: #4A4A4A; }
-            """
+        return self._FILE_DIALOG_QSS_LIGHT if self.is_light_theme else self._FILE_DIALOG_QSS_DARK
 
     def create_dialog(self, title, min_width=300, min_height=150):
         """Create a dialog with proper non-transparent background"""
         # Get the main window as parent to avoid inheriting transparent background
-        main_window = self.window()
+        main_window = self._get_main_window()
         dialog = QDialog(main_window)
         dialog.setWindowTitle(title)
         dialog.setMinimumSize(min_width, min_height)
         # Ensure dialog has solid background (not transparent)
         dialog.setAttribute(Qt.WA_TranslucentBackground, False)
-        dialog.setStyleSheet(self.get_dialog_stylesheet())
+        dialog.setStyleSheet(self._current_dialog_qss)
         return dialog
 
     def create_custom_spinbox(self, min_val=1, max_val=20, initial_val=3):
@@ -3303,6 +3973,8 @@ class SnippetEditorWidget(QWidget):
         container.value_edit.setFixedHeight(28)
         container.min_val = min_val
         container.max_val = max_val
+        container._val = initial_val  # Last in-range value entered
+        container.value_edit.setValidator(ClampedIntValidator(min_val, max_val, container.value_edit))
 
         # Circular button style with orange accent
         if self.is_light_theme:
@@ -3387,33 +4059,33 @@ class SnippetEditorWidget(QWidget):
         # Value edit styling
         container.value_edit.setStyleSheet(edit_style)
 
-        def clamp_value():
-            try:
-                val = int(container.value_edit.text())
-                val = max(container.min_val, min(container.max_val, val))
-                container.value_edit.setText(str(val))
-            except ValueError:
-                container.value_edit.setText(str(container.min_val))
+        def sync_value(text):
+            # The validator only admits digits; commit the value once it is in range
+            if container.value_edit.hasAcceptableInput():
+                container._val = int(text)
+
+        def commit_value():
+            # Enter/focus-out has already run fixup(), so the text is in range;
+            # clamp again anyway so the field always shows exactly value()
+            text = container.value_edit.text()
+            val = int(text) if text.isdigit() else container.min_val
+            container._val = max(container.min_val, min(container.max_val, val))
+            container.value_edit.setText(str(container._val))
 
         def decrease():
-            try:
-                current = int(container.value_edit.text())
-                if current > container.min_val:
-                    container.value_edit.setText(str(current - 1))
-            except ValueError:
-                container.value_edit.setText(str(container.min_val))
+            if container._val > container.min_val:
+                container._val -= 1
+                container.value_edit.setText(str(container._val))
 
         def increase():
-            try:
-                current = int(container.value_edit.text())
-                if current < container.max_val:
-                    container.value_edit.setText(str(current + 1))
-            except ValueError:
-                container.value_edit.setText(str(container.min_val))
+            if container._val < container.max_val:
+                container._val += 1
+                container.value_edit.setText(str(container._val))
 
         minus_btn.clicked.connect(decrease)
         plus_btn.clicked.connect(increase)
-        container.value_edit.editingFinished.connect(clamp_value)
+        container.value_edit.textEdited.connect(sync_value)
+        container.value_edit.editingFinished.connect(commit_value)
 
         layout.addWidget(minus_btn)
         layout.addWidget(container.value_edit)
@@ -3421,110 +4093,26 @@ class SnippetEditorWidget(QWidget):
 
         # Add value() method to container
         def get_value():
-            try:
-                return int(container.value_edit.text())
-            except ValueError:
-                return container.min_val
+            if not container.value_edit.hasAcceptableInput():
+                commit_value()  # Read mid-edit: settle the field first so it matches
+            return container._val
         container.value = get_value
 
         return container
 
     def get_input_dialog_stylesheet(self):
         """Get stylesheet for QInputDialog based on current theme"""
-        if self.is_light_theme:
-            return """
-                QInputDialog {
-                    background-color: #F5F5F5;
-                }
-                QInputDialog QLabel {
-                    color: #212121;
-                }
-                QInputDialog QLineEdit {
-                    background-color: #FFFFFF;
-                    color: #212121;
-                    border: 1px solid #BDBDBD;
-                    padding: 6px;
-                    border-radius: 4px;
-                }
-                QInputDialog QLineEdit:focus {
-                    border-color: #FF6B00;
-                }
-                QInputDialog QPushButton {
-                    background-color: #FF6B00;
-                    color: white;
-                    border: none;
-                    border-radius: 4px;
-                    padding: 8px 16px;
-                    min-width: 70px;
-                }
-                QInputDialog QPushButton:hover {
-                    background-color: #FF8C00;
-                }
-                QInputDialog QComboBox {
-                    background-color: #FFFFFF;
-                    color: #212121;
-                    border: 1px solid #BDBDBD;
-                    padding: 6px;
-                    border-radius: 4px;
-                }
-                QInputDialog QComboBox QAbstractItemView {
-                    background-color: #FFFFFF;
-                    color: #212121;
-                    selection-background-color: #FFE0CC;
-                }
-            """
-        else:
-            return """
-                QInputDialog {
-                    background-color: #1E1E1E;
-                }
-                QInputDialog QLabel {
-                    color: #E0E0E0;
-                }
-                QInputDialog QLineEdit {
-                    background-color: #2A2A2A;
-                    color: #E0E0E0;
-                    border: 1px solid #424242;
-                    padding: 6px;
-                    border-radius: 4px;
-                }
-                QInputDialog QLineEdit:focus {
-                    border-color: #FF6B00;
-                }
-                QInputDialog QPushButton {
-                    background-color: #FF6B00;
-                    color: white;
-                    border: none;
-                    border-radius: 4px;
-                    padding: 8px 16px;
-                    min-width: 70px;
-                }
-                QInputDialog QPushButton:hover {
-                    background-color: #FF8C00;
-                }
-                QInputDialog QComboBox {
-                    background-color: #2A2A2A;
-                    color: #E0E0E0;
-                    border: 1px solid #424242;
-                    padding: 6px;
-                    border-radius: 4px;
-                }
-                QInputDialog QComboBox QAbstractItemView {
-                    background-color: #1E1E1E;
-                    color: #E0E0E0;
-                    selection-background-color: #3D2814;
-                }
-            """
+        return self._INPUT_DIALOG_QSS_LIGHT if self.is_light_theme else self._INPUT_DIALOG_QSS_DARK
 
     def get_text_input(self, title, label, default_text=''):
         """Show a styled text input dialog"""
-        main_window = self.window()
+        main_window = self._get_main_window()
         dialog = QInputDialog(main_window)
         dialog.setWindowTitle(title)
         dialog.setLabelText(label)
         dialog.setTextValue(default_text)
         dialog.setAttribute(Qt.WA_TranslucentBackground, False)
-        dialog.setStyleSheet(self.get_input_dialog_stylesheet())
+        dialog.setStyleSheet(self._current_input_qss)
 
         if dialog.exec_() == QDialog.Accepted:
             return dialog.textValue(), True
@@ -3532,14 +4120,14 @@ class SnippetEditorWidget(QWidget):
 
     def get_item_input(self, title, label, items, current=0, editable=False):
         """Show a styled item selection dialog"""
-        main_window = self.window()
+        main_window = self._get_main_window()
         dialog = QInputDialog(main_window)
         dialog.setWindowTitle(title)
         dialog.setLabelText(label)
         dialog.setComboBoxItems(items)
         dialog.setComboBoxEditable(editable)
         dialog.setAttribute(Qt.WA_TranslucentBackground, False)
-        dialog.setStyleSheet(self.get_input_dialog_stylesheet())
+        dialog.setStyleSheet(self._current_input_qss)
 
         if dialog.exec_() == QDialog.Accepted:
             return dialog.textValue(), True
@@ -3547,11 +4135,11 @@ class SnippetEditorWidget(QWidget):
 
     def insert_table(self):
         """Insert a markdown-style table using visual grid selector"""
-        main_window = self.window()
+        main_window = self._get_main_window()
         dialog = QDialog(main_window)
         dialog.setWindowTitle("Insert Table")
         dialog.setAttribute(Qt.WA_TranslucentBackground, False)
-        dialog.setStyleSheet(self.get_dialog_stylesheet())
+        dialog.setStyleSheet(self._current_dialog_qss)
 
         # Grid dimensions
         max_cols = 10
@@ -3575,53 +4163,6 @@ class SnippetEditorWidget(QWidget):
             size_label.setStyleSheet("font-size: 16px; font-weight: bold; color: #FF6B00; padding: 4px;")
         layout.addWidget(size_label)
 
-        # Create grid container widget
-        grid_widget = QWidget()
-        grid_widget.setFixedSize(
-            max_cols * (cell_size + cell_gap) + cell_gap,
-            max_rows * (cell_size + cell_gap) + cell_gap
-        )
-        grid_widget.setCursor(Qt.PointingHandCursor)
-
-        # Store cell buttons
-        cells = []
-
-        # Styling
-        if self.is_light_theme:
-            cell_default = f"""
-                background-color: #F0F0F0;
-                border: 1px solid #CCCCCC;
-                border-radius: 3px;
-                min-width: {cell_size}px; max-width: {cell_size}px;
-                min-height: {cell_size}px; max-height: {cell_size}px;
-            """
-            cell_hover = f"""
-                background-color: #FF6B00;
-                border: 1px solid #E65C00;
-                border-radius: 3px;
-                min-width: {cell_size}px; max-width: {cell_size}px;
-                min-height: {cell_size}px; max-height: {cell_size}px;
-            """
-        else:
-            cell_default = f"""
-                background-color: #3A3A3A;
-                border: 1px solid #555555;
-                border-radius: 3px;
-                min-width: {cell_size}px; max-width: {cell_size}px;
-                min-height: {cell_size}px; max-height: {cell_size}px;
-            """
-            cell_hover = f"""
-                background-color: #FF6B00;
-                border: 1px solid #E65C00;
-                border-radius: 3px;
-                min-width: {cell_size}px; max-width: {cell_size}px;
-                min-height: {cell_size}px; max-height: {cell_size}px;
-            """
-
-        grid_layout = QGridLayout(grid_widget)
-        grid_layout.setSpacing(cell_gap)
-        grid_layout.setContentsMargins(cell_gap, cell_gap, cell_gap, cell_gap)
-
         def update_grid(hover_col, hover_row):
             dialog.selected_cols = hover_col
             dialog.selected_rows = hover_row
@@ -3631,39 +4172,15 @@ class SnippetEditorWidget(QWidget):
             else:
                 size_label.setText("Select size")
 
-            for row in range(max_rows):
-                for col in range(max_cols):
-                    cell = cells[row][col]
-                    if col < hover_col and row < hover_row:
-                        cell.setStyleSheet(cell_hover)
-                    else:
-                        cell.setStyleSheet(cell_default)
-
-        def cell_clicked(col, row):
-            dialog.selected_cols = col + 1
-            dialog.selected_rows = row + 1
+        def cell_clicked(cols, rows):
+            dialog.selected_cols = cols
+            dialog.selected_rows = rows
             dialog.accept()
 
-        for row in range(max_rows):
-            row_cells = []
-            for col in range(max_cols):
-                cell = QPushButton()
-                cell.setStyleSheet(cell_default)
-                cell.setFlat(True)
-                cell.setCursor(Qt.PointingHandCursor)
-
-                # Capture col/row in closure
-                cell.enterEvent = lambda e, c=col, r=row: update_grid(c + 1, r + 1)
-                cell.clicked.connect(lambda checked, c=col, r=row: cell_clicked(c, r))
-
-                grid_layout.addWidget(cell, row, col)
-                row_cells.append(cell)
-            cells.append(row_cells)
-
-        # Reset on mouse leave
-        def grid_leave(event):
-            update_grid(0, 0)
-        grid_widget.leaveEvent = grid_leave
+        # Grid is painted by a single widget rather than one button per cell
+        grid_widget = TableGridSelector(max_cols, max_rows, cell_size, cell_gap, self.is_light_theme)
+        grid_widget.hovered.connect(update_grid)
+        grid_widget.selected.connect(cell_clicked)
 
         layout.addWidget(grid_widget, alignment=Qt.AlignCenter)
 
@@ -3672,7 +4189,7 @@ class SnippetEditorWidget(QWidget):
             custom_dialog = QDialog(dialog)
             custom_dialog.setWindowTitle("Custom Table Size")
             custom_dialog.setAttribute(Qt.WA_TranslucentBackground, False)
-            custom_dialog.setStyleSheet(self.get_dialog_stylesheet())
+            custom_dialog.setStyleSheet(self._current_dialog_qss)
 
             custom_layout = QVBoxLayout(custom_dialog)
             custom_layout.setSpacing(16)
@@ -3693,7 +4210,7 @@ class SnippetEditorWidget(QWidget):
             custom_btn_layout.addStretch()
             custom_cancel = QPushButton("Cancel")
             custom_cancel.clicked.connect(custom_dialog.reject)
-            custom_cancel.setStyleSheet(self.get_cancel_btn_stylesheet())
+            custom_cancel.setStyleSheet(self._current_cancel_qss)
             custom_btn_layout.addWidget(custom_cancel)
             custom_insert = QPushButton("Insert")
             custom_insert.clicked.connect(custom_dialog.accept)
@@ -3743,7 +4260,7 @@ class SnippetEditorWidget(QWidget):
         btn_layout.addStretch()
         cancel_btn = QPushButton("Cancel")
         cancel_btn.clicked.connect(dialog.reject)
-        cancel_btn.setStyleSheet(self.get_cancel_btn_stylesheet())
+        cancel_btn.setStyleSheet(self._current_cancel_qss)
         cancel_btn.setFixedWidth(80)
         btn_layout.addWidget(cancel_btn)
         btn_layout.addStretch()
@@ -3753,28 +4270,30 @@ class SnippetEditorWidget(QWidget):
             cols = dialog.selected_cols  # Columns (horizontal)
             rows = dialog.selected_rows  # Rows (vertical)
 
-            # Build editable HTML table
-            html_lines = ['<table border="1">']
-            for r in range(rows):
-                html_lines.append('  <tr>')
-                for c in range(cols):
-                    html_lines.append('    <td> </td>')
-                html_lines.append('  </tr>')
-            html_lines.append('</table>')
+            # Build editable HTML table (every row is identical, so repeat one template)
+            row_html = '  <tr>\n' + '    <td> </td>\n' * cols + '  </tr>\n'
+            html = '<table border="1">\n' + row_html * rows + '</table>'
 
-            self.insert_variable('\n' + '\n'.join(html_lines) + '\n')
+            self.insert_variable('\n' + html + '\n')
 
     def show_emoji_picker(self):
         """Show Slack-like emoji picker dialog with full Unicode emoji set"""
-        main_window = self.window()
+        main_window = self._get_main_window()
 
         # Lazy-load emoji database from emoji library
         if self.emoji_database is None:
             self.emoji_database, self.emoji_search_index, self.emoji_categories = main_window.build_emoji_database()
+            self._sorted_search_terms = sorted(self.emoji_search_index)
+            self._category_plan = tuple(
+                (cat_id, cat_name, self.emoji_database[cat_id])
+                for cat_id, cat_icon, cat_name in self.emoji_categories
+                if cat_id not in ('favorites', 'custom') and self.emoji_database.get(cat_id)
+            )
 
         # Load favorites and custom emojis
-        self.emoji_favorites = main_window.load_emoji_favorites()
+        self.emoji_favorites = dict.fromkeys(main_window.load_emoji_favorites())
         self.custom_emojis = main_window.load_custom_emojis()
+        self._custom_by_name = {ce.get('name'): ce for ce in self.custom_emojis}
 
         # Create dialog
         dialog = QDialog(main_window)
@@ -3802,80 +4321,86 @@ class SnippetEditorWidget(QWidget):
             tab_selected_bg = "#424242"
             section_header_color = "#9E9E9E"
 
-        dialog.setStyleSheet(f"""
-            QDialog {{ background-color: {bg_color}; }}
-            QLabel {{ color: {text_color}; }}
-            QLineEdit {{
-                background-color: {input_bg};
-                color: {text_color};
-                border: 1px solid {input_border};
-                padding: 8px 12px;
-                border-radius: 6px;
-                font-size: 14px;
-            }}
-            QLineEdit:focus {{ border-color: #FF6B00; }}
-            QScrollArea {{
-                border: none;
-                background-color: {scroll_bg};
-            }}
-            QPushButton#closeBtn {{
-                background-color: transparent;
-                color: {text_color};
-                border: none;
-                font-size: 18px;
-                font-weight: bold;
-                min-width: 32px;
-                max-width: 32px;
-                min-height: 32px;
-                max-height: 32px;
-            }}
-            QPushButton#closeBtn:hover {{ color: #FF6B00; }}
-            QPushButton#emojiBtn {{
-                font-size: 24px;
-                background-color: transparent;
-                border: 1px solid transparent;
-                border-radius: 6px;
-                padding: 0px;
-                margin: 1px;
-                min-width: 40px;
-                max-width: 40px;
-                min-height: 40px;
-                max-height: 40px;
-            }}
-            QPushButton#emojiBtn:hover {{
-                background-color: rgba(255, 107, 0, 0.2);
-                border-color: #FF6B00;
-            }}
-            QPushButton#categoryTab {{
-                font-size: 20px;
-                background-color: {tab_bg};
-                border: none;
-                border-bottom: 3px solid transparent;
-                padding: 8px 6px;
-                min-width: 42px;
-                max-width: 42px;
-                min-height: 42px;
-                max-height: 42px;
-            }}
-            QPushButton#categoryTab:hover {{
-                background-color: {tab_selected_bg};
-            }}
-            QPushButton#categoryTab:checked {{
-                background-color: {tab_selected_bg};
-                border-bottom: 3px solid #FF6B00;
-            }}
-            QPushButton#addEmojiBtn {{
-                background-color: {tab_bg};
-                color: #FF6B00;
-                border: 1px dashed #FF6B00;
-                border-radius: 6px;
-                padding: 8px 16px;
-                font-size: 13px;
-            }}
-            QPushButton#addEmojiBtn:hover {{
-                background-color: rgba(255, 107, 0, 0.1);
-            }}
-        """)
+        # Stylesheet text only depends on the theme, so format it once per theme
+        emoji_qss = self._emoji_qss_cache.get(self.is_light_theme)
+        if emoji_qss is None:
+            emoji_qss = f"""
+                QDialog {{ background-color: {bg_color}; }}
+                QLabel {{ color: {text_color}; }}
+                QLineEdit {{
+                    background-color: {input_bg};
+                    color: {text_color};
+                    border: 1px solid {input_border};
+                    padding: 8px 12px;
+                    border-radius: 6px;
+                    font-size: 14px;
+                }}
+                QLineEdit:focus {{ border-color: #FF6B00; }}
+                QScrollArea {{
+                    border: none;
+                    background-color: {scroll_bg};
+                }}
+                QPushButton#closeBtn {{
+                    background-color: transparent;
+                    color: {text_color};
+                    border: none;
+                    font-size: 18px;
+                    font-weight: bold;
+                    min-width: 32px;
+                    max-width: 32px;
+                    min-height: 32px;
+                    max-height: 32px;
+                }}
+                QPushButton#closeBtn:hover {{ color: #FF6B00; }}
+                QWidget#emojiGridBg {{ background-color: {scroll_bg}; }}
+                QLabel#emojiSectionLabel {{
+                    font-weight: bold;
+                    font-size: 13px;
+                    color: {section_header_color};
+                    padding-top: 4px;
+                }}
+                QLabel#emojiEmptyLabel {{
+                    color: {section_header_color};
+                    font-style: italic;
+                    padding: 12px;
+                }}
+                QListView#emojiGrid {{
+                    background-color: {scroll_bg};
+                    color: {text_color};
+                    border: none;
+                }}
+                QPushButton#categoryTab {{
+                    font-size: 20px;
+                    background-color: {tab_bg};
+                    border: none;
+                    border-bottom: 3px solid transparent;
+                    padding: 8px 6px;
+                    min-width: 42px;
+                    max-width: 42px;
+                    min-height: 42px;
+                    max-height: 42px;
+                }}
+                QPushButton#categoryTab:hover {{
+                    background-color: {tab_selected_bg};
+                }}
+                QPushButton#categoryTab:checked {{
+                    background-color: {tab_selected_bg};
+                    border-bottom: 3px solid #FF6B00;
+                }}
+                QPushButton#addEmojiBtn {{
+                    background-color: {tab_bg};
+                    color: #FF6B00;
+                    border: 1px dashed #FF6B00;
+                    border-radius: 6px;
+                    padding: 8px 16px;
+                    font-size: 13px;
+                }}
+                QPushButton#addEmojiBtn:hover {{
+                    background-color: rgba(255, 107, 0, 0.1);
+                }}
+            """
+            self._emoji_qss_cache[self.is_light_theme] = emoji_qss
+        dialog.setStyleSheet(emoji_qss)
 
         layout = QVBoxLayout(dialog)
         layout.setSpacing(8)
@@ -3884,7 +4409,7 @@ class SnippetEditorWidget(QWidget):
         # Top row: Search + Close button
         top_row = QHBoxLayout()
         search_input = QLineEdit()
-        search_input.setPlaceholderText("🔍 Search emojis...")
+        search_input.setPlaceholderText("🔍 Search emojis... (*text matches anywhere)")
         top_row.addWidget(search_input, 1)
 
         close_btn = QPushButton("×")
@@ -3918,115 +4443,149 @@ class SnippetEditorWidget(QWidget):
         scroll.setStyleSheet(f"background-color: {scroll_bg};")
 
         emoji_container = QWidget()
-        emoji_container.setStyleSheet(f"background-color: {scroll_bg};")
+        emoji_container.setObjectName("emojiGridBg")
         emoji_main_layout = QVBoxLayout(emoji_container)
         emoji_main_layout.setSpacing(16)
         emoji_main_layout.setContentsMargins(8, 8, 8, 8)
 
-        # Store all emoji buttons for filtering
-        all_emoji_buttons = []
+        # Emoji sections are model-backed list views; track them for filtering
+        emoji_views = []  # (cat_id, view)
         EMOJIS_PER_ROW = 10
 
         # Emoji font
         emoji_font = QFont()
         emoji_font.setFamily("Noto Color Emoji")
         emoji_font.setPointSize(18)
+        emoji_delegate = EmojiItemDelegate(emoji_font, dialog)
+
+        # Stat each custom emoji file once per picker (new entries are stat'ed as added)
+        custom_mtimes = {}  # Custom emoji name -> file mtime (None if missing)
+
+        def stat_custom_emojis():
+            for custom_em in self.custom_emojis:
+                name = custom_em.get('name')
+                if name not in custom_mtimes:
+                    img_path = Path(main_window.custom_emojis_dir) / custom_em.get('filename', '')
+                    try:
+                        custom_mtimes[name] = img_path.stat().st_mtime
+                    except OSError:
+                        custom_mtimes[name] = None
+
+        stat_custom_emojis()
+
+        def load_custom_icon(custom_data):
+            """Load a custom emoji image as a 32px icon (shared "?" icon if the file is missing)"""
+            mtime = custom_mtimes.get(custom_data.get('name'))
+            if mtime is None:
+                return get_missing_emoji_icon()
+            img_path = Path(main_window.custom_emojis_dir) / custom_data.get('filename', '')
+            return self._get_custom_icon(img_path, mtime=mtime) or get_missing_emoji_icon()
+
+        # Inverted index per view (emoji id -> rows) so filtering touches only
+        # the rows whose visibility actually changes
+        rows_by_emoji = {}       # view -> {emoji_id: [row, ...]}
+        last_visible = [None]    # Emoji ids shown by the current filter (None = all)
+
+        def index_view(view):
+            """Rebuild a view's emoji id -> rows index (and re-apply an active filter)"""
+            model = view.model()
+            index = {}
+            for row in range(model.rowCount()):
+                index.setdefault(model.index(row).data(EmojiListModel.EmojiIdRole), []).append(row)
+            rows_by_emoji[view] = index
+
+            visible = last_visible[0]
+            if visible is not None:
+                for row in range(model.rowCount()):
+                    view.setRowHidden(row, True)
+                for emoji_id in visible & index.keys():
+                    for row in index[emoji_id]:
+                        view.setRowHidden(row, False)
+                view.update_height()
+
+        def create_emoji_view(cat_id, items):
+            """Create a list view + model for one section and wire its signals"""
+            model = EmojiListModel(items, load_custom_icon, dialog)
+            view = EmojiGridView(model, emoji_delegate, EMOJIS_PER_ROW)
+            view.clicked.connect(on_emoji_clicked)
+            view.customContextMenuRequested.connect(lambda pos, v=view: on_emoji_context_menu(v, pos))
+            model.modelReset.connect(lambda v=view: index_view(v))
+            emoji_views.append((cat_id, view))
+            index_view(view)
+            return view
+
+        def on_emoji_clicked(index):
+            custom_data = index.data(EmojiListModel.CustomDataRole)
+            if custom_data is not None:
+                self._insert_custom_emoji(custom_data, dialog, main_window)
+            else:
+                self._insert_emoji(index.data(Qt.DisplayRole), dialog, main_window)
+
+        def on_emoji_context_menu(view, pos):
+            index = view.indexAt(pos)
+            if not index.isValid():
+                return
+            global_pos = view.viewport().mapToGlobal(view.visualRect(index).bottomLeft())
+            custom_data = index.data(EmojiListModel.CustomDataRole)
+            if view is custom_view and custom_data is not None:
+                show_custom_emoji_context_menu(global_pos, custom_data)
+            else:
+                show_emoji_context_menu(global_pos, index.data(EmojiListModel.EmojiIdRole))
 
-        # Container for favorites section (will be rebuilt when favorites change)
+        # Favorites section (rebuilt in place when favorites change)
         favorites_container = QWidget()
-        favorites_container.setStyleSheet(f"background-color: {scroll_bg};")
+        favorites_container.setObjectName("emojiGridBg")
         favorites_layout = QVBoxLayout(favorites_container)
         favorites_layout.setSpacing(4)
         favorites_layout.setContentsMargins(0, 0, 0, 0)
 
+        fav_label = QLabel('⭐ Favorites')
+        fav_label.setObjectName("emojiSectionLabel")
+        favorites_layout.addWidget(fav_label)
+        fav_view = create_emoji_view('favorites', [])
+        favorites_layout.addWidget(fav_view)
+        fav_empty_label = QLabel("Right-click any emoji to add it to favorites")
+        fav_empty_label.setObjectName("emojiEmptyLabel")
+        favorites_layout.addWidget(fav_empty_label)
+
         def rebuild_favorites_section():
             """Rebuild the favorites section without closing the dialog"""
-            # Clear existing widgets
-            while favorites_layout.count():
-                item = favorites_layout.takeAt(0)
-                if item.widget():
-                    item.widget().deleteLater()
-
-            # Remove old favorites buttons from all_emoji_buttons
-            nonlocal all_emoji_buttons
-            all_emoji_buttons = [(b, e, c, l, g) for b, e, c, l, g in all_emoji_buttons if c != 'favorites']
-
-            # Add label
-            fav_label = QLabel('⭐ Favorites')
-            fav_label.setStyleSheet(f"font-weight: bold; font-size: 13px; color: {section_header_color}; padding-top: 4px;")
-            favorites_layout.addWidget(fav_label)
+            items = []
+            for fav_em in self.emoji_favorites:
+                # Check if this is a custom emoji (starts with "custom:")
+                if fav_em.startswith('custom:'):
+                    custom_name = fav_em[7:]  # Remove "custom:" prefix
+                    custom_data = self._custom_by_name.get(custom_name)
+                    if custom_data:
+                        items.append(custom_data)
+                else:
+                    items.append(fav_em)
 
+            favorites_container.setUpdatesEnabled(False)
+            fav_view.model().set_items(items)
             if self.emoji_favorites:
-                fav_grid = QWidget()
-                fav_grid.setStyleSheet(f"background-color: {scroll_bg};")
-                fav_grid_layout = QGridLayout(fav_grid)
-                fav_grid_layout.setSpacing(2)
-                fav_grid_layout.setContentsMargins(0, 0, 0, 0)
-
-                for i, fav_em in enumerate(self.emoji_favorites):
-                    row = i // EMOJIS_PER_ROW
-                    col = i % EMOJIS_PER_ROW
-
-                    # Check if this is a custom emoji (starts with "custom:")
-                    if fav_em.startswith('custom:'):
-                        custom_name = fav_em[7:]  # Remove "custom:" prefix
-                        custom_data = next((ce for ce in self.custom_emojis if ce.get('name') == custom_name), None)
-                        if custom_data:
-                            btn = QPushButton()
-                            btn.setObjectName("emojiBtn")
-                            btn.setFixedSize(40, 40)
-                            btn.setCursor(Qt.PointingHandCursor)
-                            img_path = Path(main_window.custom_emojis_dir) / custom_data.get('filename', '')
-                            if img_path.exists():
-                                pixmap = QPixmap(str(img_path)).scaled(32, 32, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-                                btn.setIcon(QIcon(pixmap))
-                                btn.setIconSize(pixmap.size())
-                            else:
-                                btn.setText("?")
-                            btn.clicked.connect(lambda checked, ce=custom_data: self._insert_custom_emoji(ce, dialog, main_window))
-                            btn.setContextMenuPolicy(Qt.CustomContextMenu)
-                            btn.customContextMenuRequested.connect(
-                                lambda pos, b=btn, e=fav_em: show_emoji_context_menu(b, e)
-                            )
-                            fav_grid_layout.addWidget(btn, row, col)
-                            all_emoji_buttons.append((btn, fav_em, 'favorites', fav_label, fav_grid))
-                    else:
-                        # Regular emoji
-                        btn = QPushButton(fav_em)
-                        btn.setObjectName("emojiBtn")
-                        btn.setFixedSize(40, 40)
-                        btn.setSizePolicy(QSizePolicy.Fixed, QSizePolicy.Fixed)
-                        btn.setFont(emoji_font)
-                        btn.setCursor(Qt.PointingHandCursor)
-                        btn.clicked.connect(lambda checked, e=fav_em: self._insert_emoji(e, dialog, main_window))
-                        btn.setContextMenuPolicy(Qt.CustomContextMenu)
-                        btn.customContextMenuRequested.connect(
-                            lambda pos, b=btn, e=fav_em: show_emoji_context_menu(b, e)
-                        )
-                        fav_grid_layout.addWidget(btn, row, col)
-                        all_emoji_buttons.append((btn, fav_em, 'favorites', fav_label, fav_grid))
-
-                favorites_layout.addWidget(fav_grid)
-                section_widgets['favorites'] = (fav_label, fav_grid)
+                fav_empty_label.hide()
+                fav_view.show()
+                section_widgets['favorites'] = (fav_label, fav_view)
             else:
-                empty_label = QLabel("Right-click any emoji to add it to favorites")
-                empty_label.setStyleSheet(f"color: {section_header_color}; font-style: italic; padding: 12px;")
-                favorites_layout.addWidget(empty_label)
-                section_widgets['favorites'] = (fav_label, empty_label)
+                fav_view.hide()
+                fav_empty_label.show()
+                section_widgets['favorites'] = (fav_label, fav_empty_label)
+            favorites_container.setUpdatesEnabled(True)
 
         # Helper to toggle favorite status
         def toggle_favorite(emoji_id):
             """Toggle favorite status. emoji_id is either an emoji char or 'custom:name'"""
             if emoji_id in self.emoji_favorites:
-                self.emoji_favorites.remove(emoji_id)
+                del self.emoji_favorites[emoji_id]
             else:
-                self.emoji_favorites.append(emoji_id)
-            main_window.save_emoji_favorites(self.emoji_favorites)
+                self.emoji_favorites[emoji_id] = None
+            main_window.save_emoji_favorites(list(self.emoji_favorites))
             # Rebuild favorites section in-place
             rebuild_favorites_section()
 
         # Helper to show emoji context menu
-        def show_emoji_context_menu(button, emoji_id):
+        def show_emoji_context_menu(global_pos, emoji_id):
             """Show context menu. emoji_id is either an emoji char or 'custom:name'"""
             menu = QMenu(dialog)
             menu.setStyleSheet(f"""
@@ -4049,169 +4608,142 @@ class SnippetEditorWidget(QWidget):
             else:
                 action = menu.addAction("⭐ Add to Favorites")
             action.triggered.connect(lambda: toggle_favorite(emoji_id))
-            menu.exec_(button.mapToGlobal(button.rect().bottomLeft()))
+            menu.exec_(global_pos)
 
         def create_emoji_section(cat_id, cat_name, emojis_list):
             """Create a section with label and emoji grid"""
             section_label = QLabel(cat_name)
-            section_label.setStyleSheet(f"font-weight: bold; font-size: 13px; color: {section_header_color}; padding-top: 4px;")
+            section_label.setObjectName("emojiSectionLabel")
             emoji_main_layout.addWidget(section_label)
 
-            grid_widget = QWidget()
-            grid_widget.setStyleSheet(f"background-color: {scroll_bg};")
-            grid_layout = QGridLayout(grid_widget)
-            grid_layout.setSpacing(2)
-            grid_layout.setContentsMargins(0, 0, 0, 0)
-
-            for i, em in enumerate(emojis_list):
-                row = i // EMOJIS_PER_ROW
-                col = i % EMOJIS_PER_ROW
-
-                btn = QPushButton(em)
-                btn.setObjectName("emojiBtn")
-                btn.setFixedSize(40, 40)
-                btn.setSizePolicy(QSizePolicy.Fixed, QSizePolicy.Fixed)
-                btn.setFont(emoji_font)
-                btn.setCursor(Qt.PointingHandCursor)
-                btn.clicked.connect(lambda checked, e=em: self._insert_emoji(e, dialog, main_window))
-                # Add right-click context menu for favorites
-                btn.setContextMenuPolicy(Qt.CustomContextMenu)
-                btn.customContextMenuRequested.connect(
-                    lambda pos, b=btn, e=em: show_emoji_context_menu(b, e)
-                )
-                grid_layout.addWidget(btn, row, col)
-                all_emoji_buttons.append((btn, em, cat_id, section_label, grid_widget))
-
-            emoji_main_layout.addWidget(grid_widget)
-            section_widgets[cat_id] = (section_label, grid_widget)
+            # Start empty at full height; the model is filled once the section
+            # scrolls into view (or a search needs it)
+            view = create_emoji_view(cat_id, [])
+            view.update_height(len(emojis_list))
+            pending_sections[view] = emojis_list
+            emoji_main_layout.addWidget(view)
+            section_widgets[cat_id] = (section_label, view)
+
+        def load_pending_sections(load_all=False):
+            """Fill the models of deferred sections that are visible (or all of them)"""
+            if not pending_sections:
+                return
+            visible_rect = scroll.viewport().rect().translated(0, scroll.verticalScrollBar().value())
+            for view in list(pending_sections):
+                if load_all or view.geometry().intersects(visible_rect):
+                    view.model().set_items(pending_sections.pop(view))
+
+        pending_sections = {}  # view -> emojis not yet loaded into its model
+
+        # Build all sections with updates off so the container lays out once
+        emoji_container.setUpdatesEnabled(False)
 
         # Add Favorites section container
         emoji_main_layout.addWidget(favorites_container)
         rebuild_favorites_section()
 
         # Add emoji sections from database
-        for cat_id, cat_icon, cat_name in self.emoji_categories:
-            if cat_id in ('favorites', 'custom'):
-                continue  # Skip - handled separately
-            emojis_list = self.emoji_database.get(cat_id, [])
-            if emojis_list:
-                create_emoji_section(cat_id, cat_name, emojis_list)
+        for cat_id, cat_name, emojis_list in self._category_plan:
+            create_emoji_section(cat_id, cat_name, emojis_list)
 
         # Add Custom section
         custom_section_label = QLabel('Custom')
-        custom_section_label.setStyleSheet(f"font-weight: bold; font-size: 13px; color: {section_header_color}; padding-top: 4px;")
+        custom_section_label.setObjectName("emojiSectionLabel")
         emoji_main_layout.addWidget(custom_section_label)
 
-        if self.custom_emojis:
-            custom_grid = QWidget()
-            custom_grid.setStyleSheet(f"background-color: {scroll_bg};")
-            custom_layout = QGridLayout(custom_grid)
-            custom_layout.setSpacing(2)
-            custom_layout.setContentsMargins(0, 0, 0, 0)
-
-            def delete_custom_emoji(emoji_to_delete):
-                """Delete a custom emoji"""
-                name = emoji_to_delete.get('name', '')
-                reply = QMessageBox.question(
-                    dialog, "Delete Custom Emoji",
-                    f"Delete custom emoji :{name}:?",
-                    QMessageBox.Yes | QMessageBox.No, QMessageBox.No
-                )
-                if reply == QMessageBox.Yes:
-                    # Remove from favorites if present
-                    fav_key = f"custom:{name}"
-                    if fav_key in self.emoji_favorites:
-                        self.emoji_favorites.remove(fav_key)
-                        main_window.save_emoji_favorites(self.emoji_favorites)
-                    # Remove from list
-                    self.custom_emojis = [e for e in self.custom_emojis if e.get('name') != name]
-                    main_window.save_custom_emojis(self.custom_emojis)
-                    # Delete file
-                    filename = emoji_to_delete.get('filename', '')
-                    file_path = Path(main_window.custom_emojis_dir) / filename
-                    if file_path.exists():
-                        file_path.unlink()
-                    # Refresh dialog
-                    dialog.reject()
-                    self.show_emoji_picker()
-
-            def show_custom_emoji_context_menu(button, custom_emoji):
-                """Show context menu for custom emoji with favorite and delete options"""
-                menu = QMenu(dialog)
-                menu.setStyleSheet(f"""
-                    QMenu {{
-                        background-color: {input_bg};
-                        color: {text_color};
-                        border: 1px solid {input_border};
-                        padding: 4px;
-                    }}
-                    QMenu::item {{
-                        padding: 6px 20px;
-                    }}
-                    QMenu::item:selected {{
-                        background-color: #FF6B00;
-                        color: white;
-                    }}
-                """)
-                name = custom_emoji.get('name', '')
-                emoji_id = f"custom:{name}"
-
-                # Favorite action
-                if emoji_id in self.emoji_favorites:
-                    fav_action = menu.addAction("⭐ Remove from Favorites")
-                else:
-                    fav_action = menu.addAction("⭐ Add to Favorites")
-                fav_action.triggered.connect(lambda: toggle_favorite(emoji_id))
-
-                menu.addSeparator()
-
-                # Delete action
-                del_action = menu.addAction("🗑️ Delete Custom Emoji")
-                del_action.triggered.connect(lambda: delete_custom_emoji(custom_emoji))
-
-                menu.exec_(button.mapToGlobal(button.rect().bottomLeft()))
-
-            for i, custom_em in enumerate(self.custom_emojis):
-                row = i // EMOJIS_PER_ROW
-                col = i % EMOJIS_PER_ROW
-
-                btn = QPushButton()
-                btn.setObjectName("emojiBtn")
-                btn.setFixedSize(40, 40)
-                btn.setCursor(Qt.PointingHandCursor)
-
-                # Load custom emoji image
-                img_path = Path(main_window.custom_emojis_dir) / custom_em.get('filename', '')
-                if img_path.exists():
-                    pixmap = QPixmap(str(img_path)).scaled(32, 32, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-                    btn.setIcon(QIcon(pixmap))
-                    btn.setIconSize(pixmap.size())
-                else:
-                    btn.setText("?")
-
-                btn.setToolTip(f":{custom_em.get('name', 'custom')}: (right-click for options)")
-                btn.clicked.connect(lambda checked, ce=custom_em: self._insert_custom_emoji(ce, dialog, main_window))
-
-                # Add right-click context menu for favorites and deletion
-                btn.setContextMenuPolicy(Qt.CustomContextMenu)
-                btn.customContextMenuRequested.connect(
-                    lambda pos, ce=custom_em, b=btn: show_custom_emoji_context_menu(b, ce)
-                )
+        def delete_custom_emoji(emoji_to_delete):
+            """Delete a custom emoji"""
+            name = emoji_to_delete.get('name', '')
+            reply = QMessageBox.question(
+                dialog, "Delete Custom Emoji",
+                f"Delete custom emoji :{name}:?",
+                QMessageBox.Yes | QMessageBox.No, QMessageBox.No
+            )
+            if reply == QMessageBox.Yes:
+                # Remove from favorites if present
+                fav_key = f"custom:{name}"
+                if fav_key in self.emoji_favorites:
+                    del self.emoji_favorites[fav_key]
+                    main_window.save_emoji_favorites(list(self.emoji_favorites))
+                # Remove from list
+                self.custom_emojis = [e for e in self.custom_emojis if e.get('name') != name]
+                self._custom_by_name.pop(name, None)
+                custom_mtimes.pop(name, None)
+                main_window.save_custom_emojis(self.custom_emojis)
+                # Delete file
+                filename = emoji_to_delete.get('filename', '')
+                file_path = Path(main_window.custom_emojis_dir) / filename
+                self._invalidate_custom_icon(file_path)
+                if file_path.exists():
+                    file_path.unlink()
+                # Refresh only the affected sections
+                rebuild_custom_section()
+                rebuild_favorites_section()
+
+        def show_custom_emoji_context_menu(global_pos, custom_emoji):
+            """Show context menu for custom emoji with favorite and delete options"""
+            menu = QMenu(dialog)
+            menu.setStyleSheet(f"""
+                QMenu {{
+                    background-color: {input_bg};
+                    color: {text_color};
+                    border: 1px solid {input_border};
+                    padding: 4px;
+                }}
+                QMenu::item {{
+                    padding: 6px 20px;
+                }}
+                QMenu::item:selected {{
+                    background-color: #FF6B00;
+                    color: white;
+                }}
+            """)
+            name = custom_emoji.get('name', '')
+            emoji_id = f"custom:{name}"
 
-                custom_layout.addWidget(btn, row, col)
-                all_emoji_buttons.append((btn, f"custom:{custom_em.get('name', '')}", 'custom', custom_section_label, custom_grid))
+            # Favorite action
+            if emoji_id in self.emoji_favorites:
+                fav_action = menu.addAction("⭐ Remove from Favorites")
+            else:
+                fav_action = menu.addAction("⭐ Add to Favorites")
+            fav_action.triggered.connect(lambda: toggle_favorite(emoji_id))
+
+            menu.addSeparator()
+
+            # Delete action
+            del_action = menu.addAction("🗑️ Delete Custom Emoji")
+            del_action.triggered.connect(lambda: delete_custom_emoji(custom_emoji))
+
+            menu.exec_(global_pos)
+
+        custom_view = create_emoji_view('custom', [])
+        emoji_main_layout.addWidget(custom_view)
+        custom_empty_label = QLabel("Add custom emojis with the button below")
+        custom_empty_label.setObjectName("emojiEmptyLabel")
+        emoji_main_layout.addWidget(custom_empty_label)
+
+        def rebuild_custom_section():
+            """Rebuild the custom section without closing the dialog"""
+            stat_custom_emojis()
+            custom_view.model().set_items(self.custom_emojis)
+            if self.custom_emojis:
+                custom_empty_label.hide()
+                custom_view.show()
+                section_widgets['custom'] = (custom_section_label, custom_view)
+            else:
+                custom_view.hide()
+                custom_empty_label.show()
+                section_widgets['custom'] = (custom_section_label, custom_empty_label)
 
-            emoji_main_layout.addWidget(custom_grid)
-            section_widgets['custom'] = (custom_section_label, custom_grid)
-        else:
-            empty_label = QLabel("Add custom emojis with the button below")
-            empty_label.setStyleSheet(f"color: {section_header_color}; font-style: italic; padding: 12px;")
-            emoji_main_layout.addWidget(empty_label)
-            section_widgets['custom'] = (custom_section_label, empty_label)
+        rebuild_custom_section()
 
         emoji_main_layout.addStretch()
+        emoji_container.setUpdatesEnabled(True)
+        emoji_container.updateGeometry()
         scroll.setWidget(emoji_container)
         layout.addWidget(scroll)
+        scroll.verticalScrollBar().valueChanged.connect(lambda value: load_pending_sections())
+        scroll.verticalScrollBar().rangeChanged.connect(lambda minimum, maximum: load_pending_sections())
 
         # Add Custom Emoji button
         add_layout = QHBoxLayout()
@@ -4219,7 +4751,7 @@ class SnippetEditorWidget(QWidget):
         add_emoji_btn = QPushButton("+ Add Custom Emoji")
         add_emoji_btn.setObjectName("addEmojiBtn")
         add_emoji_btn.setCursor(Qt.PointingHandCursor)
-        add_emoji_btn.clicked.connect(lambda: self._show_add_custom_emoji_dialog(dialog, main_window))
+        add_emoji_btn.clicked.connect(lambda: self._show_add_custom_emoji_dialog(dialog, main_window, rebuild_custom_section))
         add_layout.addWidget(add_emoji_btn)
         add_layout.addStretch()
         layout.addLayout(add_layout)
@@ -4240,39 +4772,74 @@ class SnippetEditorWidget(QWidget):
             category_buttons[0][1].setChecked(True)
 
         # Search filtering with name-based lookup
+        def set_rows_hidden(emoji_ids, hidden):
+            for view, index in rows_by_emoji.items():
+                for emoji_id in emoji_ids & index.keys():
+                    for row in index[emoji_id]:
+                        view.setRowHidden(row, hidden)
+
         def filter_emojis(text):
             text = text.lower().strip()
 
             if not text:
                 # Show all emojis
-                for btn, em, cat_id, label, grid in all_emoji_buttons:
-                    btn.show()
+                if last_visible[0] is not None:
+                    for cat_id, view in emoji_views:
+                        for row in range(view.model().rowCount()):
+                            view.setRowHidden(row, False)
+                        view.update_height()
+                    last_visible[0] = None
                 for cat_id, (label, widget) in section_widgets.items():
                     label.show()
                     widget.show()
                 return
 
-            # Find matching emojis from search index
+            # Searching needs every section's rows
+            load_pending_sections(load_all=True)
+
+            # Find matching emojis from search index: prefix match by default,
+            # substring match when the query starts with '*'
             matching_emojis = set()
-            for term, emojis_set in self.emoji_search_index.items():
-                if text in term:
-                    matching_emojis.update(emojis_set)
+            substring = text.startswith('*')
+            if substring:
+                text = text.lstrip('*')
+                for term, emojis_set in self.emoji_search_index.items():
+                    if text in term:
+                        matching_emojis.update(emojis_set)
+            else:
+                terms = self._sorted_search_terms
+                i = bisect.bisect_left(terms, text)
+                while i < len(terms) and terms[i].startswith(text):
+                    matching_emojis.update(self.emoji_search_index[terms[i]])
+                    i += 1
 
             # Also match custom emojis by name
             for custom_em in self.custom_emojis:
-                if text in custom_em.get('name', '').lower():
+                name = custom_em.get('name', '').lower()
+                if (text in name) if substring else name.startswith(text):
                     matching_emojis.add(f"custom:{custom_em.get('name', '')}")
 
-            # Show/hide buttons
+            # Only touch rows whose visibility changes since the last filter
+            previous = last_visible[0]
+            if previous is None:
+                for cat_id, view in emoji_views:
+                    for row in range(view.model().rowCount()):
+                        view.setRowHidden(row, True)
+                set_rows_hidden(matching_emojis, False)
+            else:
+                set_rows_hidden(previous - matching_emojis, True)
+                set_rows_hidden(matching_emojis - previous, False)
+            last_visible[0] = matching_emojis
+
+            # Resize views and show/hide category sections
             visible_categories = set()
-            for btn, em, cat_id, label, grid in all_emoji_buttons:
-                if em in matching_emojis:
-                    btn.show()
+            for cat_id, view in emoji_views:
+                index = rows_by_emoji[view]
+                count = sum(len(index[emoji_id]) for emoji_id in matching_emojis & index.keys())
+                view.update_height(count)
+                if count:
                     visible_categories.add(cat_id)
-                else:
-                    btn.hide()
 
-            # Show/hide category sections
             for cat_id, (label, widget) in section_widgets.items():
                 if cat_id in visible_categories:
                     label.show()
@@ -4281,7 +4848,13 @@ class SnippetEditorWidget(QWidget):
                     label.hide()
                     widget.hide()
 
-        search_input.textChanged.connect(filter_emojis)
+        # Debounce typing so a burst of keystrokes runs one filter pass; the
+        # timer is owned by the dialog so it dies with it
+        filter_timer = QTimer(dialog)
+        filter_timer.setSingleShot(True)
+        filter_timer.setInterval(60)
+        filter_timer.timeout.connect(lambda: filter_emojis(search_input.text()))
+        search_input.textChanged.connect(lambda text: filter_timer.start())
 
         dialog.exec_()
 
@@ -4306,18 +4879,16 @@ class SnippetEditorWidget(QWidget):
         else:
             # Insert as embedded image in the QTextEdit
             cursor = self.content_input.textCursor()
-            image = QImage(str(img_path))
-            if not image.isNull():
-                # Scale to reasonable emoji size (24x24)
-                scaled = image.scaled(24, 24, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-                cursor.insertImage(scaled)
+            image = self._get_custom_insert_image(img_path)
+            if image is not None:
+                cursor.insertImage(image)
             else:
                 # Fallback to shortcode if image can't be loaded
                 self.insert_variable(f":{name}:")
             self.content_input.setFocus()
 
-    def _show_add_custom_emoji_dialog(self, parent_dialog, main_window):
-        """Show dialog to add a custom emoji"""
+    def _show_add_custom_emoji_dialog(self, parent_dialog, main_window, on_added=None):
+        """Show dialog to add a custom emoji; on_added refreshes the open picker"""
         dialog = QDialog(parent_dialog)
         dialog.setWindowTitle("Add Custom Emoji")
         dialog.setMinimumSize(400, 300)
@@ -4419,7 +4990,7 @@ class SnippetEditorWidget(QWidget):
         def browse_file():
             file_path, _ = QFileDialog.getOpenFileName(
                 dialog, "Select Emoji Image",
-                str(Path.home()),
+                _HOME_DIR,
                 "Images (*.png *.gif *.PNG *.GIF *.jpg *.jpeg *.JPG *.JPEG)"
             )
             if file_path:
@@ -4456,10 +5027,9 @@ class SnippetEditorWidget(QWidget):
                 return
 
             # Check for duplicate names
-            for existing in self.custom_emojis:
-                if existing.get('name') == name:
-                    QMessageBox.warning(dialog, "Duplicate Name", f"An emoji named ':{name}:' already exists.")
-                    return
+            if name in self._custom_by_name:
+                QMessageBox.warning(dialog, "Duplicate Name", f"An emoji named ':{name}:' already exists.")
+                return
 
             # Process and save image (auto-resize if needed)
             src_path = Path(selected_file[0])
@@ -4467,20 +5037,29 @@ class SnippetEditorWidget(QWidget):
             dest_path = main_window.custom_emojis_dir / filename
 
             try:
-                # Open with PIL and resize if needed
+                # Open with PIL and resize if needed (Pillow is only loaded when adding emojis)
+                from PIL import Image
                 img = Image.open(src_path)
+                max_size = 128  # Good size for emoji
 
-                # Convert to RGBA for PNG compatibility
-                if img.mode != 'RGBA':
-                    img = img.convert('RGBA')
+                # Let JPEG decode at a reduced scale instead of full resolution
+                if img.format == 'JPEG':
+                    img.draft('RGB', (max_size, max_size))
 
-                # Resize if larger than 128x128 (good size for emoji)
-                max_size = 128
+                # Convert for PNG compatibility, keeping alpha only when the source has it
+                if 'A' in img.getbands() or img.mode == 'P':
+                    if img.mode != 'RGBA':
+                        img = img.convert('RGBA')
+                elif img.mode != 'RGB':
+                    img = img.convert('RGB')
+
+                # Resize if larger than 128x128
                 if img.width > max_size or img.height > max_size:
                     img.thumbnail((max_size, max_size), Image.LANCZOS)
 
-                # Save as PNG
-                img.save(dest_path, 'PNG', optimize=True)
+                # Save as PNG (a single deflate pass is plenty for a 128px image)
+                img.save(dest_path, 'PNG', optimize=False, compress_level=6)
+                self._invalidate_custom_icon(dest_path)
             except Exception as e:
                 QMessageBox.warning(dialog, "Image Error", f"Could not process image: {str(e)}")
                 return
@@ -4492,12 +5071,16 @@ class SnippetEditorWidget(QWidget):
                 'insert_mode': 'shortcode' if shortcode_radio.isChecked() else 'image'
             }
             self.custom_emojis.append(new_emoji)
+            self._custom_by_name[name] = new_emoji
             main_window.save_custom_emojis(self.custom_emojis)
 
             dialog.accept()
-            # Close and reopen parent dialog to refresh
-            parent_dialog.reject()
-            self.show_emoji_picker()
+            if on_added:
+                on_added()
+            else:
+                # Close and reopen parent dialog to refresh
+                parent_dialog.reject()
+                self.show_emoji_picker()
 
         save_btn.clicked.connect(save_emoji)
 
@@ -4505,7 +5088,7 @@ class SnippetEditorWidget(QWidget):
 
     def show_find_replace(self):
         """Show find and replace dialog"""
-        main_window = self.window()
+        main_window = self._get_main_window()
         dialog = QDialog(main_window)
         dialog.setWindowTitle("Find and Replace")
         dialog.setMinimumSize(400, 200)
@@ -4569,24 +5152,20 @@ class SnippetEditorWidget(QWidget):
             text = find_input.text()
             if not text:
                 return
-            content = self.content_input.toPlainText()
-            cursor = self.content_input.textCursor()
-            start_pos = cursor.position()
-
-            flags = 0 if case_cb.isChecked() else re.IGNORECASE
-            pattern = re.compile(re.escape(text), flags)
-
-            # Search from current position
-            match = pattern.search(content, start_pos)
-            if not match:
-                # Wrap around to beginning
-                match = pattern.search(content)
-
-            if match:
-                cursor.setPosition(match.start())
-                cursor.setPosition(match.end(), cursor.KeepAnchor)
-                self.content_input.setTextCursor(cursor)
-                status_label.setText(f"Found at position {match.start()}")
+            # Search the document directly rather than a toPlainText() copy
+            document = self.content_input.document()
+            flags = QTextDocument.FindFlags()
+            if case_cb.isChecked():
+                flags |= QTextDocument.FindCaseSensitively
+
+            # Search from current position, wrapping around to the beginning
+            found = document.find(text, self.content_input.textCursor(), flags)
+            if found.isNull():
+                found = document.find(text, 0, flags)
+
+            if not found.isNull():
+                self.content_input.setTextCursor(found)
+                status_label.setText(f"Found at position {found.selectionStart()}")
             else:
                 status_label.setText("Not found")
 
@@ -4601,11 +5180,27 @@ class SnippetEditorWidget(QWidget):
             replacement = replace_input.text()
             if not text:
                 return
-            content = self.content_input.toPlainText()
-            flags = 0 if case_cb.isChecked() else re.IGNORECASE
-            new_content, count = re.subn(re.escape(text), replacement, content, flags=flags)
+            document = self.content_input.document()
+            flags = QTextDocument.FindFlags()
+            if case_cb.isChecked():
+                flags |= QTextDocument.FindCaseSensitively
+
+            # Edit matches in place as one undo step instead of resetting the document
+            cursor = self.content_input.textCursor()
+            cursor.beginEditBlock()
+            count = 0
+            found = document.find(text, 0, flags)
+            while not found.isNull():
+                cursor.setPosition(found.selectionStart())
+                cursor.setPosition(found.selectionEnd(), cursor.KeepAnchor)
+                cursor.insertText(replacement)
+                count += 1
+                found = document.find(text, cursor.position(), flags)
+            cursor.endEditBlock()
+
             if count > 0:
-                self.content_input.setPlainText(new_content)
+                # Like setPlainText(), drop stored rich HTML that no longer matches the text
+                self.content_input.rich_html = None
                 status_label.setText(f"Replaced {count} occurrence(s)")
             else:
                 status_label.setText("No matches found")
@@ -4624,7 +5219,7 @@ class SnippetEditorWidget(QWidget):
 
         close_btn = QPushButton("Close")
         close_btn.clicked.connect(dialog.accept)
-        close_btn.setStyleSheet(self.get_cancel_btn_stylesheet())
+        close_btn.setStyleSheet(self._current_cancel_qss)
         btn_layout.addWidget(close_btn)
 
         layout.addLayout(btn_layout)
@@ -4641,7 +5236,7 @@ class SnippetEditorWidget(QWidget):
 
     def show_calendar_dialog(self):
         """Show calendar dialog to select a date"""
-        main_window = self.window()
+        main_window = self._get_main_window()
         dialog = QDialog(main_window)
         dialog.setWindowTitle("Select Date")
         dialog.setMinimumSize(350, 300)
@@ -4761,7 +5356,7 @@ class SnippetEditorWidget(QWidget):
 
     def insert_calculation_dialog(self):
         """Show dialog to create a dynamic calculation"""
-        main_window = self.window()
+        main_window = self._get_main_window()
         dialog = QDialog(main_window)
         dialog.setWindowTitle('Insert Calculation')
         dialog.setMinimumWidth(400)
@@ -4769,47 +5364,26 @@ class SnippetEditorWidget(QWidget):
         dialog.setAttribute(Qt.WA_TranslucentBackground, False)
 
         # Get theme
-        is_light = self.is_light_theme
-        bg_color = '#FFFFFF' if is_light else '#1E1E1E'
-        dialog.setStyleSheet(f"QDialog {{ background-color: {bg_color}; }}")
+        qss = self._CALC_DIALOG_QSS_LIGHT if self.is_light_theme else self._CALC_DIALOG_QSS_DARK
+        dialog.setStyleSheet(qss['dialog'])
 
         layout = QVBoxLayout(dialog)
         layout.setSpacing(12)
         layout.setContentsMargins(20, 20, 20, 20)
 
         # Instructions
-        text_color = '#424242' if is_light else '#E0E0E0'
-        text_color = '#424242' if is_light else '#E0E0E0'
-        instructions = QLabel(f"""<span style="color: {text_color};">
-            <b>Create a calculation expression:</b><br><br>
-            <b>Operators:</b> + - * / % ^ ( )<br>
-            <b>Functions:</b> round, floor, ceil, abs, min, max<br>
-            <b>Reference fields:</b> Use field names from your snippet<br><br>
-            <b>Examples:</b><br>
-            • <code>price * quantity</code><br>
-            • <code>subtotal * 1.08</code> (add 8% tax)<br>
-            • <code>round(total / 12, 2)</code> (monthly payment)<br>
-            • <code>(hours * rate) + bonus</code>
-            </span>""")
+        instructions = QLabel(qss['instructions'])
         instructions.setWordWrap(True)
         layout.addWidget(instructions)
 
         # Expression input
         expr_label = QLabel("Expression:")
-        expr_label.setStyleSheet(f"color: {text_color}; font-weight: bold;")
+        expr_label.setStyleSheet(qss['expr_label'])
         layout.addWidget(expr_label)
 
         expr_input = QLineEdit()
         expr_input.setPlaceholderText("e.g., price * quantity * 1.08")
-        expr_input.setStyleSheet(f"""
-            QLineEdit {{
-                padding: 8px;
-                border: 1px solid {'#BDBDBD' if is_light else '#555555'};
-                border-radius: 4px;
-                background-color: {'#FFFFFF' if is_light else '#2A2A2A'};
-                color: {text_color};
-            }}
-        """)
+        expr_input.setStyleSheet(qss['expr_input'])
         layout.addWidget(expr_input)
 
         layout.addStretch()
@@ -4820,35 +5394,12 @@ class SnippetEditorWidget(QWidget):
 
         cancel_btn = QPushButton("Cancel")
         cancel_btn.clicked.connect(dialog.reject)
-        cancel_btn.setStyleSheet(f"""
-            QPushButton {{
-                padding: 8px 20px;
-                border: 1px solid {'#BDBDBD' if is_light else '#555555'};
-                border-radius: 4px;
-                background-color: {'#F5F5F5' if is_light else '#3A3A3A'};
-                color: {text_color};
-            }}
-            QPushButton:hover {{
-                background-color: {'#E0E0E0' if is_light else '#4A4A4A'};
-            }}
-        """)
+        cancel_btn.setStyleSheet(qss['cancel_btn'])
         btn_layout.addWidget(cancel_btn)
 
         insert_btn = QPushButton("Insert")
         insert_btn.clicked.connect(dialog.accept)
-        insert_btn.setStyleSheet("""
-            QPushButton {
-                padding: 8px 20px;
-                border: none;
-                border-radius: 4px;
-                background-color: #FF6B00;
-                color: white;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background-color: #FF8533;
-            }
-        """)
+        insert_btn.setStyleSheet(qss['insert_btn'])
         btn_layout.addWidget(insert_btn)
 
         layout.addLayout(btn_layout)
@@ -4861,6 +5412,13 @@ class SnippetEditorWidget(QWidget):
     def set_snippets(self, snippets):
         """Set the snippets list for Insert Snippet feature"""
         self.snippets_list = snippets
+        # Index descriptions by trigger once; the first snippet with a trigger wins
+        desc_by_trigger = {}
+        for s in snippets:
+            trigger = s.get('trigger', '')
+            if trigger and trigger not in desc_by_trigger:
+                desc_by_trigger[trigger] = s.get('description', '') or trigger
+        self._snippet_desc_by_trigger = desc_by_trigger
 
     def insert_snippet_dialog(self):
         """Show dialog to select a snippet to embed"""
@@ -4887,10 +5445,9 @@ class SnippetEditorWidget(QWidget):
                                        'Select snippet to embed:', items, 0, False)
         if ok and item:
             # Find the trigger for the selected item
-            for display, trigger in snippet_options:
-                if display == item:
-                    self.insert_variable('{{snippet:' + trigger + '}}')
-                    break
+            trigger = dict(snippet_options).get(item)
+            if trigger:
+                self.insert_variable('{{snippet:' + trigger + '}}')
 
     def get_snippet(self):
         """Return the snippet data"""
@@ -4923,9 +5480,24 @@ class SnippetEditorWidget(QWidget):
         """Show a preview of the snippet with rendered form fields"""
         content = self.content_input.toPlainText()
         trigger = self.trigger_input.text()
+        clock = (datetime.now(), self.date_format_getter(), self.time_format_getter())
+
+        # Reopen the last preview if nothing it renders has changed (the
+        # formatted timestamp covers date/time fields going stale)
+        now, date_fmt, time_fmt = clock
+        preview_key = (content, trigger, now.strftime(f"{date_fmt} {time_fmt}"))
+        if self._preview_dialog is not None and self._preview_key == preview_key:
+            # Start from the snippet's defaults, as a freshly built preview would
+            self._reset_preview_fields(self._preview_dialog)
+            self._preview_dialog.exec_()
+            return
+        if self._preview_dialog is not None:
+            self._preview_dialog.deleteLater()
 
-        main_window = self.window()
+        main_window = self._get_main_window()
         dialog = QDialog(main_window)
+        self._preview_dialog = dialog
+        self._preview_key = preview_key
         dialog.setWindowTitle("Snippet Preview")
         dialog.setMinimumSize(600, 400)
         dialog.setAttribute(Qt.WA_TranslucentBackground, False)
@@ -4974,16 +5546,29 @@ class SnippetEditorWidget(QWidget):
 
         # Preview content widget
         preview_widget = QWidget()
-        preview_widget.setStyleSheet("background-color: #1E1E1E;")
+        preview_widget.setStyleSheet(self._PREVIEW_CONTENT_QSS)
         preview_layout = QVBoxLayout(preview_widget)
         preview_layout.setContentsMargins(16, 16, 16, 16)
 
-        # Build the preview with inline form elements
-        self.build_preview_content(preview_layout, content)
+        # Build the preview with inline form elements; long snippets only
+        # build their first chunk now and the rest as the user scrolls
+        pending_chunks = split_preview_chunks(content)
+        self.build_preview_content(preview_layout, pending_chunks.pop(0), clock)
 
         scroll.setWidget(preview_widget)
         main_layout.addWidget(scroll)
 
+        if pending_chunks:
+            scrollbar = scroll.verticalScrollBar()
+
+            def load_pending_chunks():
+                """Build the next chunk once the view nears the end of what is built"""
+                if pending_chunks and scrollbar.value() >= scrollbar.maximum() - scroll.viewport().height():
+                    self.build_preview_content(preview_layout, pending_chunks.pop(0), clock)
+
+            scrollbar.valueChanged.connect(lambda value: load_pending_chunks())
+            scrollbar.rangeChanged.connect(lambda minimum, maximum: load_pending_chunks())
+
         # Close button
         close_btn = QPushButton("Close")
         close_btn.clicked.connect(dialog.accept)
@@ -5007,28 +5592,37 @@ class SnippetEditorWidget(QWidget):
 
         dialog.exec_()
 
-    def build_preview_content(self, layout, content):
+    def _reset_preview_fields(self, dialog):
+        """Put a reused preview's inline form fields back to their initial state"""
+        for field in dialog.findChildren(QLineEdit):
+            if not isinstance(field.parent(), QDateEdit):  # Skip the date edit's own line edit
+                field.clear()
+        for combo in dialog.findChildren(QComboBox):
+            combo.setCurrentIndex(0)
+        for date_edit in dialog.findChildren(QDateEdit):
+            date_edit.setDate(QDate.currentDate())
+        for checkbox in dialog.findChildren(QCheckBox):
+            # Toggle sections start checked, multi-select options unchecked
+            checkbox.setChecked(checkbox.objectName() == "previewToggle")
+        dialog.findChild(QScrollArea).verticalScrollBar().setValue(0)
+
+    def build_preview_content(self, layout, content, clock=None):
         """Build preview content with rendered form fields inline"""
-        import re
+        # One timestamp and format lookup per build keeps every date/time field consistent
+        if clock is None:
+            clock = (datetime.now(), self.date_format_getter(), self.time_format_getter())
 
         # Process toggle sections first - these can span multiple lines
-        self._build_preview_recursive(layout, content)
-
-    def _build_preview_recursive(self, layout, content):
-        """Recursively build preview, handling toggle sections"""
-        import re
-
-        # Pattern for toggle sections: {{name:toggle}}...{{/name:toggle}}
-        toggle_pattern = r'\{\{([^}:]+):toggle\}\}(.*?)\{\{/\1:toggle\}\}'
+        self._build_preview_recursive(layout, content, clock)
 
-        # Find the first toggle section
-        match = re.search(toggle_pattern, content, re.DOTALL)
-
-        if match:
+    def _build_preview_recursive(self, layout, content, clock):
+        """Build preview, handling toggle sections in a single pass"""
+        pos = 0
+        for match in _TOGGLE_RE.finditer(content):
             # Content before the toggle
-            before_content = content[:match.start()]
-            if before_content:
-                self._build_preview_lines(layout, before_content)
+            if match.start() > pos:
+                self._build_preview_lines(layout, content[pos:match.start()], clock,
+                                          after_tag=pos > 0, before_tag=True)
 
             # The toggle section
             toggle_name = match.group(1).strip()
@@ -5046,6 +5640,7 @@ class SnippetEditorWidget(QWidget):
             checkbox_layout.setContentsMargins(0, 0, 0, 0)
 
             checkbox = QCheckBox(toggle_name)
+            checkbox.setObjectName("previewToggle")
             checkbox.setChecked(True)
             checkbox.setStyleSheet("""
                 QCheckBox {
@@ -5073,324 +5668,230 @@ class SnippetEditorWidget(QWidget):
             content_layout.setContentsMargins(26, 0, 0, 0)
             content_layout.setSpacing(2)
 
-            self._build_preview_lines(content_layout, toggle_content)
+            self._build_preview_lines(content_layout, toggle_content, clock,
+                                      after_tag=True, before_tag=True)
             toggle_layout.addWidget(content_container)
 
             layout.addWidget(toggle_container)
+            pos = match.end()
 
-            # Content after the toggle
-            after_content = content[match.end():]
-            if after_content:
-                self._build_preview_recursive(layout, after_content)
-        else:
-            # No more toggle sections
-            self._build_preview_lines(layout, content)
+        # Content after the last toggle (or all of it if there are none)
+        if pos < len(content) or pos == 0:
+            self._build_preview_lines(layout, content[pos:], clock, after_tag=pos > 0)
 
-    def _build_preview_lines(self, layout, content):
-        """Build preview lines with inline form fields"""
-        import re
+    def _build_preview_lines(self, layout, content, clock, after_tag=False, before_tag=False):
+        """Build preview lines with inline form fields.
 
+        after_tag/before_tag mark content that directly follows/precedes a toggle
+        tag; an empty piece next to the tag is part of the tag's line, not a blank line.
+        """
         def convert_formatting_to_html(text):
             """Convert formatting markers to HTML for preview display"""
             # Convert bold: **text** -> <b>text</b>
-            text = re.sub(r'\*\*(.+?)\*\*', r'<b>\1</b>', text)
+            text = _BOLD_RE.sub(r'<b>\1</b>', text)
             # Convert italic: *text* -> <i>text</i>
-            text = re.sub(r'(?<![*<])\*([^*]+?)\*(?![*>])', r'<i>\1</i>', text)
+            text = _ITALIC_RE.sub(r'<i>\1</i>', text)
             # <u>text</u> is already HTML
             return text
 
-        # Define patterns for different variable types (excluding toggle)
-        patterns = [
-            (r'\{\{snippet:([^}]+)\}\}', 'snippet'),
-            (r'\{\{calc:([^}]+)\}\}', 'calc'),
-            (r'\{\{([^}:]+):multi=([^}]+)\}\}', 'multi'),
-            (r'\{\{([^}:]+):date\}\}', 'date_picker'),
-            (r'\{\{date([+-])(\d+)\}\}', 'date_arith'),
-            (r'\{\{(date)\}\}', 'date_var'),
-            (r'\{\{(time)\}\}', 'time_var'),
-            (r'\{\{(datetime)\}\}', 'datetime_var'),
-            (r'\{\{(clipboard)\}\}', 'clipboard_var'),
-            (r'\{\{(cursor)\}\}', 'cursor_var'),
-            (r'\{\{([^}=:]+)=([^}]+)\}\}', 'dropdown'),
-            (r'\{\{([^}=:/]+)\}\}', 'text'),
-        ]
+        plain_run = []  # HTML of consecutive field-free lines, shown by one label
+
+        def flush_plain_run():
+            """Add the pending run of plain lines as a single rich-text label"""
+            if not plain_run:
+                return
+            if len(plain_run) == 1:
+                html_text = plain_run[0]
+            else:
+                # One paragraph per line; the bottom margin matches the gap between separate rows
+                gap = 4 + max(layout.spacing(), 0)
+                html_text = ''.join(f'<p style="margin: 0 0 {gap}px 0;">{line_html}</p>'
+                                    for line_html in plain_run[:-1])
+                html_text += f'<p style="margin: 0;">{plain_run[-1]}</p>'
+            text_label = QLabel(html_text)
+            text_label.setTextFormat(Qt.RichText)
+            text_label.setObjectName("previewText")
+            text_label.setContentsMargins(0, 2, 0, 2)
+            layout.addWidget(text_label)
+            plain_run.clear()
 
         # Split content into lines for processing
         lines = content.split('\n')
+        first = 1 if after_tag and not lines[0] else 0
+        last = len(lines) - 1 if before_tag and not lines[-1] else len(lines)
+        lines = lines[first:last]
+        if not lines:
+            return
 
         for line in lines:
+            # Scan each line once; the matches drive both the plain-line check and the row build
+            matches = list(_PREVIEW_FIELD_RE.finditer(line))
+
+            # Lines without fields join the current run of plain text
+            if line and not matches:
+                plain_run.append(convert_formatting_to_html(line))
+                continue
+            flush_plain_run()
+
+            # Blank lines need no widgets, just their row height
+            if not line:
+                layout.addSpacing(self._preview_blank_line_px)
+                continue
+
             line_widget = QWidget()
             line_layout = QHBoxLayout(line_widget)
             line_layout.setContentsMargins(0, 2, 0, 2)
             line_layout.setSpacing(0)
 
-            remaining = line
-            while remaining:
-                earliest_match = None
-                earliest_pos = len(remaining)
-                match_type = None
-                match_groups = None
-
-                for pattern, var_type in patterns:
-                    match = re.search(pattern, remaining)
-                    if match and match.start() < earliest_pos:
-                        earliest_match = match
-                        earliest_pos = match.start()
-                        match_type = var_type
-                        match_groups = match.groups()
-
-                if earliest_match:
-                    if earliest_pos > 0:
-                        # Convert formatting and use rich text label
-                        html_text = convert_formatting_to_html(remaining[:earliest_pos])
-                        text_label = QLabel(html_text)
-                        text_label.setTextFormat(Qt.RichText)
-                        text_label.setStyleSheet("color: #E0E0E0; background: transparent;")
-                        line_layout.addWidget(text_label)
-
-                    field_widget = self.create_preview_field(match_type, match_groups)
-                    line_layout.addWidget(field_widget)
-
-                    remaining = remaining[earliest_match.end():]
-                else:
-                    if remaining:
-                        # Convert formatting and use rich text label
-                        html_text = convert_formatting_to_html(remaining)
-                        text_label = QLabel(html_text)
-                        text_label.setTextFormat(Qt.RichText)
-                        text_label.setStyleSheet("color: #E0E0E0; background: transparent;")
-                        line_layout.addWidget(text_label)
-                    remaining = ""
+            pos = 0
+            for match in matches:
+                if match.start() > pos:
+                    # Convert formatting and use rich text label
+                    html_text = convert_formatting_to_html(line[pos:match.start()])
+                    text_label = QLabel(html_text)
+                    text_label.setTextFormat(Qt.RichText)
+                    text_label.setObjectName("previewText")
+                    line_layout.addWidget(text_label)
+
+                # The field's own groups follow its named group
+                match_type = match.lastgroup
+                match_groups = match.groups()[match.lastindex:match.lastindex + _PREVIEW_FIELD_GROUPS[match_type]]
+                field_widget = self.create_preview_field(match_type, match_groups, clock)
+                line_layout.addWidget(field_widget)
+                pos = match.end()
+
+            if pos < len(line):
+                # Convert formatting and use rich text label
+                html_text = convert_formatting_to_html(line[pos:])
+                text_label = QLabel(html_text)
+                text_label.setTextFormat(Qt.RichText)
+                text_label.setObjectName("previewText")
+                line_layout.addWidget(text_label)
 
             line_layout.addStretch()
             layout.addWidget(line_widget)
 
+        flush_plain_run()
         layout.addStretch()
 
-    def create_preview_field(self, field_type, groups):
-        """Create a preview widget for a form field"""
-        if field_type == 'snippet':
-            trigger = groups[0]
-            # Find snippet description for display
-            desc = trigger
-            for s in self.snippets_list:
-                if s.get('trigger', '') == trigger:
-                    desc = s.get('description', '') or trigger
-                    break
-            label = QLabel(f"[{desc}]")
-            label.setStyleSheet("""
-                QLabel {
-                    background-color: #E8EAF6;
-                    color: #3F51B5;
-                    border: 1px solid #7986CB;
-                    border-radius: 3px;
-                    padding: 2px 8px;
-                    font-weight: 500;
-                }
-            """)
-            return label
-
-        elif field_type == 'text':
-            name = groups[0]
-            field = QLineEdit()
-            field.setPlaceholderText(name)
-            field.setStyleSheet("""
-                QLineEdit {
-                    background-color: #FFFDE7;
-                    color: #333333;
-                    border: 1px solid #FDD835;
-                    border-radius: 3px;
-                    padding: 2px 6px;
-                    min-width: 120px;
-                    max-width: 200px;
-                }
-            """)
-            return field
-
-        elif field_type == 'dropdown':
-            name, options = groups
-            combo = QComboBox()
-            combo.addItems([opt.strip() for opt in options.split('|')])
-            combo.setStyleSheet("""
-                QComboBox {
-                    background-color: #FFFDE7;
-                    color: #333333;
-                    border: 1px solid #FDD835;
-                    border-radius: 3px;
-                    padding: 2px 6px;
-                    min-width: 100px;
-                }
-                QComboBox::drop-down {
-                    border: none;
-                    width: 20px;
-                }
-                QComboBox QAbstractItemView {
-                    background-color: #FFFDE7;
-                    color: #333333;
-                    selection-background-color: #FDD835;
-                }
-            """)
-            return combo
-
-        elif field_type == 'multi':
-            name, options = groups
-            container = QWidget()
-            container_layout = QHBoxLayout(container)
-            container_layout.setContentsMargins(0, 0, 0, 0)
-            container_layout.setSpacing(8)
-            for opt in options.split('|'):
-                cb = QCheckBox(opt.strip())
-                cb.setStyleSheet("""
-                    QCheckBox {
-                        color: #E0E0E0;
-                        spacing: 4px;
-                    }
-                    QCheckBox::indicator {
-                        width: 14px;
-                        height: 14px;
-                        border: 2px solid #4A90D9;
-                        border-radius: 3px;
-                        background-color: #1E1E1E;
-                    }
-                    QCheckBox::indicator:checked {
-                        background-color: #4A90D9;
-                    }
-                """)
-                container_layout.addWidget(cb)
-            return container
-
-        elif field_type == 'date_picker':
-            name = groups[0]
-            date_edit = QDateEdit()
-            date_edit.setDate(QDate.currentDate())
-            date_edit.setCalendarPopup(True)
-            date_edit.setDisplayFormat("MM/dd/yyyy")
-            date_edit.setStyleSheet("""
-                QDateEdit {
-                    background-color: #FFFDE7;
-                    color: #333333;
-                    border: 1px solid #FDD835;
-                    border-radius: 3px;
-                    padding: 2px 6px;
-                    min-width: 110px;
-                }
-                QDateEdit::drop-down {
-                    border: none;
-                    width: 20px;
-                }
-            """)
-            return date_edit
-
-        elif field_type == 'date_arith':
-            from datetime import timedelta
-            operator, days = groups
-            days = int(days)
-            if operator == '-':
-                days = -days
-            result_date = datetime.now() + timedelta(days=days)
-            label = QLabel(result_date.strftime(self.date_format_getter()))
-            label.setStyleSheet("""
-                QLabel {
-                    background-color: #E3F2FD;
-                    color: #1565C0;
-                    border: 1px solid #64B5F6;
-                    border-radius: 3px;
-                    padding: 2px 8px;
-                    font-weight: 500;
-                }
-            """)
-            return label
-
-        elif field_type == 'date_var':
-            label = QLabel(datetime.now().strftime(self.date_format_getter()))
-            label.setStyleSheet("""
-                QLabel {
-                    background-color: #E3F2FD;
-                    color: #1565C0;
-                    border: 1px solid #64B5F6;
-                    border-radius: 3px;
-                    padding: 2px 8px;
-                    font-weight: 500;
-                }
-            """)
-            return label
-
-        elif field_type == 'time_var':
-            label = QLabel(datetime.now().strftime(self.time_format_getter()))
-            label.setStyleSheet("""
-                QLabel {
-                    background-color: #E3F2FD;
-                    color: #1565C0;
-                    border: 1px solid #64B5F6;
-                    border-radius: 3px;
-                    padding: 2px 8px;
-                    font-weight: 500;
-                }
-            """)
-            return label
-
-        elif field_type == 'datetime_var':
-            label = QLabel(datetime.now().strftime(self.date_format_getter() + ' ' + self.time_format_getter()))
-            label.setStyleSheet("""
-                QLabel {
-                    background-color: #E3F2FD;
-                    color: #1565C0;
-                    border: 1px solid #64B5F6;
-                    border-radius: 3px;
-                    padding: 2px 8px;
-                    font-weight: 500;
-                }
-            """)
-            return label
-
-        elif field_type == 'clipboard_var':
-            label = QLabel("CLIPBOARD")
-            label.setStyleSheet("""
-                QLabel {
-                    background-color: #F3E5F5;
-                    color: #7B1FA2;
-                    border: 1px solid #BA68C8;
-                    border-radius: 3px;
-                    padding: 2px 8px;
-                    font-weight: 500;
-                    font-size: 10px;
-                }
-            """)
-            return label
-
-        elif field_type == 'cursor_var':
-            label = QLabel("CURSOR")
-            label.setStyleSheet("""
-                QLabel {
-                    background-color: #E8F5E9;
-                    color: #2E7D32;
-                    border: 1px solid #81C784;
-                    border-radius: 3px;
-                    padding: 2px 8px;
-                    font-weight: 500;
-                    font-size: 10px;
-                }
-            """)
-            return label
+    def create_preview_field(self, field_type, groups, clock=None):
+        """Create a preview widget for a form field.
 
-        elif field_type == 'calc':
-            expr = groups[0]
-            label = QLabel(f"= {expr}")
-            label.setStyleSheet("""
-                QLabel {
-                    background-color: #FFF3E0;
-                    color: #E65100;
-                    border: 1px solid #FFB74D;
-                    border-radius: 3px;
-                    padding: 2px 8px;
-                    font-weight: 500;
-                    font-family: monospace;
-                }
-            """)
-            return label
+        clock is (now, date_format, time_format), shared across one preview build.
+        """
+        builder = self._preview_field_builders.get(field_type)
+        if builder is None:
+            return QLabel("")  # Fallback
+        if clock is None:
+            clock = (datetime.now(), self.date_format_getter(), self.time_format_getter())
+        return builder(groups, clock)
+
+    def _preview_snippet(self, groups, clock):
+        """Chip naming the embedded snippet"""
+        trigger = groups[0]
+        # Find snippet description for display
+        desc = self._snippet_desc_by_trigger.get(trigger, trigger)
+        label = QLabel(f"[{desc}]")
+        label.setStyleSheet(self._PREVIEW_SNIPPET_QSS)
+        return label
+
+    def _preview_text(self, groups, clock):
+        """Text input placeholder"""
+        name = groups[0]
+        field = QLineEdit()
+        field.setPlaceholderText(name)
+        field.setStyleSheet(self._PREVIEW_TEXT_FIELD_QSS)
+        return field
+
+    def _preview_dropdown(self, groups, clock):
+        """Dropdown with the field options"""
+        name, options = groups
+        combo = QComboBox()
+        combo.addItems(split_field_options(options))
+        combo.setStyleSheet(self._PREVIEW_COMBO_QSS)
+        return combo
+
+    def _preview_multi(self, groups, clock):
+        """Row of checkboxes for a multi-select field"""
+        name, options = groups
+        container = QWidget()
+        container_layout = QHBoxLayout(container)
+        container_layout.setContentsMargins(0, 0, 0, 0)
+        container_layout.setSpacing(8)
+        container.setStyleSheet(self._PREVIEW_MULTI_QSS)  # Applies to every checkbox
+        for opt in split_field_options(options):
+            container_layout.addWidget(QCheckBox(opt))
+        return container
 
-        # Fallback
-        return QLabel("")
+    def _preview_date_picker(self, groups, clock):
+        """Date picker field"""
+        date_edit = QDateEdit()
+        date_edit.setDate(QDate.currentDate())
+        date_edit.setCalendarPopup(True)
+        date_edit.setDisplayFormat("MM/dd/yyyy")
+        date_edit.setStyleSheet(self._PREVIEW_DATE_EDIT_QSS)
+        return date_edit
+
+    def _preview_date_arith(self, groups, clock):
+        """Label showing today plus/minus N days"""
+        from datetime import timedelta
+        operator, days = groups
+        days = int(days)
+        if operator == '-':
+            days = -days
+        now, date_fmt, time_fmt = clock
+        result_date = now + timedelta(days=days)
+        label = QLabel(result_date.strftime(date_fmt))
+        label.setStyleSheet(self._PREVIEW_DATE_LABEL_QSS)
+        return label
+
+    def _preview_date(self, groups, clock):
+        """Label showing today's date"""
+        now, date_fmt, time_fmt = clock
+        label = QLabel(now.strftime(date_fmt))
+        label.setStyleSheet(self._PREVIEW_DATE_LABEL_QSS)
+        return label
+
+    def _preview_time(self, groups, clock):
+        """Label showing the current time"""
+        now, date_fmt, time_fmt = clock
+        label = QLabel(now.strftime(time_fmt))
+        label.setStyleSheet(self._PREVIEW_DATE_LABEL_QSS)
+        return label
+
+    def _preview_datetime(self, groups, clock):
+        """Label showing the current date and time"""
+        now, date_fmt, time_fmt = clock
+        label = QLabel(now.strftime(f"{date_fmt} {time_fmt}"))
+        label.setStyleSheet(self._PREVIEW_DATE_LABEL_QSS)
+        return label
+
+    def _preview_clipboard(self, groups, clock):
+        """Clipboard placeholder chip"""
+        label = QLabel("CLIPBOARD")
+        label.setStyleSheet(self._PREVIEW_CLIPBOARD_QSS)
+        return label
+
+    def _preview_cursor(self, groups, clock):
+        """Cursor position placeholder chip"""
+        label = QLabel("CURSOR")
+        label.setStyleSheet(self._PREVIEW_CURSOR_QSS)
+        return label
+
+    def _preview_calc(self, groups, clock):
+        """Chip showing a calculation expression"""
+        expr = groups[0]
+        label = QLabel(f"= {expr}")
+        label.setStyleSheet(self._PREVIEW_CALC_QSS)
+        return label
+
+
+# Characters that end a word, for the "require delimiter before trigger" setting
+_TRIGGER_DELIMITERS = frozenset(' \t\n.,;:!?()[]{}<>"\'`~@#$%^&*-+=|\\/')
+
+# Kernel struct input_event (timeval, type, code, value), read straight from evdev devices
+_INPUT_EVENT = struct.Struct('llHHi')
+_INPUT_EVENT_READ_SIZE = _INPUT_EVENT.size * 64
 
 
 class KeyboardListener(QThread):
@@ -5403,22 +5904,27 @@ class KeyboardListener(QThread):
     def __init__(self, snippets, settings=None):
         super().__init__()
         self.snippets = snippets
-        self.current_buffer = ""
+        self._snippets_version = 0       # Bumped by update_snippets/update_settings
+        self._trigger_index = {}         # Triggers as a trie walked from their last character
+        self._trigger_starts = frozenset()  # First characters of the triggers, None if unused
+        self._trigger_index_version = None  # Snippets version the index was built for
+        self.current_buffer = collections.deque(maxlen=50)  # Recently typed characters
         self.running = True
         self.keyboard_controller = Controller()
         self.shift_pressed = False
         self.caps_lock = False
-        self.pynput_listener = None  # For pynput mode
+        self.pynput_events = None  # For pynput mode
+        self._pynput_lock = threading.Lock()  # Hands pynput_events between run_pynput() and stop()
 
         # Trigger settings
-        settings = settings or {}
-        self.case_sensitive = settings.get('case_sensitive', True)
-        self.require_delimiter = settings.get('require_delimiter', False)
-        self.require_prefix = settings.get('require_prefix', False)
-        self.prefix_char = settings.get('prefix_char', '/')
+        self.update_settings(settings or {})
 
         # Determine which input method to use
         self.use_evdev = IS_LINUX and HAS_EVDEV
+        # stop() writes to this pipe to wake the evdev loop, which blocks until input arrives
+        self._wakeup_read = self._wakeup_write = None
+        if self.use_evdev:
+            self._wakeup_read, self._wakeup_write = os.pipe()
 
         # Key code to character mapping (US layout) - only used for evdev
         if self.use_evdev:
@@ -5451,26 +5957,97 @@ class KeyboardListener(QThread):
                 ecodes.KEY_KPASTERISK: ('*', '*'), ecodes.KEY_KPMINUS: ('-', '-'), ecodes.KEY_KPPLUS: ('+', '+'),
             }
 
+            # key_map flattened into tables indexed by key code (all mapped codes are < 256)
+            self._key_lower = bytearray(256)
+            self._key_upper = bytearray(256)
+            self._key_is_letter = bytearray(256)
+            for code, (lower, upper) in self.key_map.items():
+                self._key_lower[code] = ord(lower)
+                self._key_upper[code] = ord(upper)
+                self._key_is_letter[code] = lower.isalpha()
+
+            # Key code -> handler, so each event costs one lookup (special keys override key_map)
+            self._evdev_dispatch = dict.fromkeys(self.key_map, self._on_evdev_char)
+            self._evdev_dispatch.update({
+                ecodes.KEY_LEFTSHIFT: self._on_evdev_shift,
+                ecodes.KEY_RIGHTSHIFT: self._on_evdev_shift,
+                ecodes.KEY_CAPSLOCK: self._on_evdev_caps_lock,
+                ecodes.KEY_SPACE: self._on_evdev_clear,
+                ecodes.KEY_ENTER: self._on_evdev_clear,
+                ecodes.KEY_BACKSPACE: self._on_evdev_backspace,
+            })
+
     def find_keyboards(self):
         """Find all keyboard devices (evdev only)"""
         if not self.use_evdev:
             return []
         keyboards = []
         for path in list_devices():
-            try:
-                device = InputDevice(path)
-                capabilities = device.capabilities()
-                # Check if device has key events and has letter keys (it's a keyboard)
-                if ecodes.EV_KEY in capabilities:
-                    keys = capabilities[ecodes.EV_KEY]
-                    # Check for common letter keys to identify as keyboard
-                    if ecodes.KEY_A in keys and ecodes.KEY_Z in keys:
-                        keyboards.append(device)
-                        print(f"Found keyboard: {device.name} at {device.path}")
-            except Exception as e:
-                pass
+            device = self.open_keyboard(path)
+            if device:
+                keyboards.append(device)
         return keyboards
 
+    def open_keyboard(self, path):
+        """Open the input device at path if it is a keyboard, else return None"""
+        try:
+            device = InputDevice(path)
+            capabilities = device.capabilities()
+            # Check if device has key events and has letter keys (it's a keyboard)
+            if ecodes.EV_KEY in capabilities:
+                keys = capabilities[ecodes.EV_KEY]
+                # Check for common letter keys to identify as keyboard
+                if ecodes.KEY_A in keys and ecodes.KEY_Z in keys:
+                    logger.info("Found keyboard: %s at %s", device.name, device.path)
+                    return device
+            device.close()
+        except Exception as e:
+            pass
+        return None
+
+    def start_hotplug_monitor(self, selector):
+        """Watch udev for input devices coming and going (needs pyudev)"""
+        if not HAS_PYUDEV:
+            return None
+        try:
+            monitor = pyudev.Monitor.from_netlink(pyudev.Context())
+            monitor.filter_by('input')
+            monitor.start()
+            selector.register(monitor, selectors.EVENT_READ)
+            return monitor
+        except Exception as e:
+            print(f"Keyboard hotplug monitoring unavailable: {e}")
+            return None
+
+    def handle_hotplug_events(self, monitor, selector):
+        """Register keyboards that were plugged in and drop ones that were removed"""
+        registered = {getattr(key.fileobj, 'path', None): key.fileobj
+                      for key in selector.get_map().values()}
+        udev_device = monitor.poll(timeout=0)
+        while udev_device is not None:
+            path = udev_device.device_node
+            if path and path.startswith('/dev/input/event'):
+                if udev_device.action == 'add' and path not in registered:
+                    device = self.open_keyboard(path)
+                    if device:
+                        selector.register(device, selectors.EVENT_READ)
+                        registered[path] = device
+                elif udev_device.action == 'remove' and path in registered:
+                    self.drop_keyboard(registered.pop(path), selector)
+            udev_device = monitor.poll(timeout=0)
+
+    def drop_keyboard(self, device, selector):
+        """Stop listening to a keyboard that went away"""
+        try:
+            selector.unregister(device)
+        except KeyError:
+            return  # Already dropped (udev remove and a failed read can both report it)
+        logger.info("Keyboard removed: %s", device.path)
+        try:
+            device.close()
+        except OSError:
+            pass
+
     def run(self):
         """Start listening to keyboard input"""
         if self.use_evdev:
@@ -5488,50 +6065,64 @@ class KeyboardListener(QThread):
             # Fall back to pynput
             print("Falling back to pynput...")
             self.use_evdev = False
+            os.close(self._wakeup_read)
             self.run_pynput()
             return
 
         selector = selectors.DefaultSelector()
+        selector.register(self._wakeup_read, selectors.EVENT_READ)
         for kbd in keyboards:
             selector.register(kbd, selectors.EVENT_READ)
+        # Plugged/unplugged keyboards arrive through the same select instead of a rescan
+        monitor = self.start_hotplug_monitor(selector)
 
+        # Block until a keyboard (or stop()) has something to read - no idle wakeups
+        ev_key = ecodes.EV_KEY
         while self.running:
-            for key, mask in selector.select(timeout=0.1):
+            for key, mask in selector.select():
                 device = key.fileobj
+                if device == self._wakeup_read:
+                    continue
+                if device is monitor:
+                    self.handle_hotplug_events(monitor, selector)
+                    continue
                 try:
-                    for event in device.read():
-                        if event.type == ecodes.EV_KEY:
-                            self.handle_evdev_event(event)
+                    # Drain everything queued on the device; a short read means nothing is left,
+                    # so the steady state doesn't end on an EAGAIN exception
+                    while True:
+                        data = os.read(device.fd, _INPUT_EVENT_READ_SIZE)
+                        for _sec, _usec, event_type, code, value in _INPUT_EVENT.iter_unpack(data):
+                            if event_type == ev_key:
+                                self.handle_evdev_event(code, value)
+                        if len(data) < _INPUT_EVENT_READ_SIZE:
+                            break
                 except BlockingIOError:
-                    pass
+                    pass  # Woken with nothing to read, or the last read exactly filled the buffer
+                except OSError:
+                    # Unplugged - an unreadable device would otherwise wake select forever
+                    self.drop_keyboard(device, selector)
                 except Exception as e:
-                    print(f"Error reading device: {e}")
+                    logger.debug("Error reading device: %s", e)
 
         selector.close()
+        os.close(self._wakeup_read)
 
     def run_pynput(self):
         """Start listening using pynput (Windows/X11/fallback)"""
         print("Using pynput for keyboard input")
 
-        def on_press(key):
-            if not self.running:
-                return False
-            self.handle_pynput_press(key)
-
-        def on_release(key):
-            if not self.running:
-                return False
-            self.handle_pynput_release(key)
-
-        self.pynput_listener = keyboard.Listener(on_press=on_press, on_release=on_release)
-        self.pynput_listener.start()
-
-        # Keep thread alive while running
-        while self.running:
-            time.sleep(0.1)
-
-        if self.pynput_listener:
-            self.pynput_listener.stop()
+        # pynput's listener queues key events and this thread consumes them;
+        # stop() ends the iteration, so there is no polling loop to wait out
+        with keyboard.Events() as events:
+            with self._pynput_lock:
+                if not self.running:
+                    return  # stop() came first and had nothing to end
+                self.pynput_events = events
+            for event in events:
+                if not self.running:
+                    break
+                if isinstance(event, keyboard.Events.Press):
+                    self.handle_pynput_press(event.key)
 
     def handle_pynput_press(self, key):
         """Handle pynput key press event"""
@@ -5539,81 +6130,95 @@ class KeyboardListener(QThread):
             # Get character from key
             if hasattr(key, 'char') and key.char:
                 char = key.char
-                self.current_buffer += char
-
-                # Keep buffer at reasonable length
-                if len(self.current_buffer) > 50:
-                    self.current_buffer = self.current_buffer[-50:]
+                if not self.current_buffer and self._cannot_start_trigger(char):
+                    return
+                self.current_buffer.extend(char)  # Bounded: old characters fall off the front
 
                 self.check_triggers()
             elif key == Key.space:
-                self.current_buffer = ""
+                self.current_buffer.clear()
             elif key == Key.enter:
-                self.current_buffer = ""
+                self.current_buffer.clear()
             elif key == Key.backspace:
                 if self.current_buffer:
-                    self.current_buffer = self.current_buffer[:-1]
+                    self.current_buffer.pop()
         except Exception as e:
             pass
 
-    def handle_pynput_release(self, key):
-        """Handle pynput key release event"""
-        pass  # We don't need to track releases for basic functionality
-
-    def handle_evdev_event(self, event):
+    def handle_evdev_event(self, code, value):
         """Handle an evdev key event (Linux)"""
         # Key states: 0 = up, 1 = down, 2 = hold/repeat
+        handler = self._evdev_dispatch.get(code)
+        if handler:
+            handler(code, value)
 
-        # Track shift state
-        if event.code in (ecodes.KEY_LEFTSHIFT, ecodes.KEY_RIGHTSHIFT):
-            self.shift_pressed = event.value != 0
-            return
+    def _on_evdev_shift(self, code, value):
+        """Track shift state"""
+        self.shift_pressed = value != 0
 
-        # Track caps lock
-        if event.code == ecodes.KEY_CAPSLOCK and event.value == 1:
+    def _on_evdev_caps_lock(self, code, value):
+        """Track caps lock"""
+        if value == 1:
             self.caps_lock = not self.caps_lock
-            return
 
+    def _on_evdev_clear(self, code, value):
+        """Clear buffer on space or enter"""
+        if value == 1:
+            self.current_buffer.clear()
+
+    def _on_evdev_backspace(self, code, value):
+        """Handle backspace"""
+        if value == 1 and self.current_buffer:
+            self.current_buffer.pop()
+
+    def _on_evdev_char(self, code, value):
+        """Convert key code to character and check for matches"""
         # Only process key down events (not releases or repeats)
-        if event.value != 1:
+        if value != 1:
             return
 
-        # Clear buffer on space or enter
-        if event.code in (ecodes.KEY_SPACE, ecodes.KEY_ENTER):
-            self.current_buffer = ""
-            return
+        # Determine if we should use uppercase
+        use_upper = self.shift_pressed
+        if self._key_is_letter[code]:
+            use_upper = self.shift_pressed != self.caps_lock  # XOR for caps lock behavior
 
-        # Handle backspace
-        if event.code == ecodes.KEY_BACKSPACE:
-            if self.current_buffer:
-                self.current_buffer = self.current_buffer[:-1]
+        char = chr(self._key_upper[code] if use_upper else self._key_lower[code])
+        if not self.current_buffer and self._cannot_start_trigger(char):
             return
+        self.current_buffer.append(char)  # Bounded: old characters fall off the front
 
-        # Convert key code to character
-        if event.code in self.key_map:
-            lower, upper = self.key_map[event.code]
+        # Check for matches
+        self.check_triggers()
 
-            # Determine if we should use uppercase
-            use_upper = self.shift_pressed
-            if lower.isalpha():
-                use_upper = self.shift_pressed != self.caps_lock  # XOR for caps lock behavior
+    def _cannot_start_trigger(self, char):
+        """Check whether typed text on an empty buffer can never be part of a match.
 
-            char = upper if use_upper else lower
-            self.current_buffer += char
-
-            # Keep buffer at reasonable length
-            if len(self.current_buffer) > 50:
-                self.current_buffer = self.current_buffer[-50:]
+        Matches are suffixes of the buffer, so leading text that no trigger begins with
+        never matters, unless it is needed as the character before a delimited trigger.
+        """
+        self._refresh_trigger_index()
+        starts = self._trigger_starts
+        if starts is None:
+            return False
+        return starts.isdisjoint(char if self.case_sensitive else char.lower())
 
-            # Check for matches
-            self.check_triggers()
+    def _refresh_trigger_index(self):
+        """Rebuild the trigger trie when the snippets or trigger settings have changed"""
+        version = self._snippets_version
+        if self._trigger_index_version != version:
+            self._trigger_index, self._trigger_starts = self._build_trigger_index()
+            self._trigger_index_version = version
 
-    def check_triggers(self):
-        """Check if current buffer matches any trigger based on settings"""
-        # Common delimiters that would end a word
-        delimiters = ' \t\n.,;:!?()[]{}<>"\'`~@#$%^&*-+=|\\/'
+    def _build_trigger_index(self):
+        """Build a trie of the full triggers, reversed so it is walked from the newest key.
 
-        for snippet in self.snippets:
+        Each trigger's last node lists (snippet position, snippet, full trigger) under None.
+        Also returns the set of characters the triggers start with (None when a delimiter
+        is required, as then any character can matter).
+        """
+        root = {}
+        starts = set()
+        for position, snippet in enumerate(self.snippets):
             trigger = snippet.get('trigger', '')
             if not trigger:
                 continue
@@ -5623,267 +6228,326 @@ class KeyboardListener(QThread):
             if self.require_prefix:
                 full_trigger = self.prefix_char + trigger
 
-            # Check for match (case-sensitive or case-insensitive)
-            buffer_to_check = self.current_buffer
-            trigger_to_match = full_trigger
-
             if not self.case_sensitive:
-                buffer_to_check = buffer_to_check.lower()
-                trigger_to_match = full_trigger.lower()
-
-            if buffer_to_check.endswith(trigger_to_match):
-                # Check delimiter requirement
-                if self.require_delimiter:
-                    # There must be a delimiter before the trigger (or buffer starts with trigger)
-                    trigger_start = len(self.current_buffer) - len(full_trigger)
-                    if trigger_start > 0:
-                        char_before = self.current_buffer[trigger_start - 1]
-                        if char_before not in delimiters:
-                            continue  # No delimiter before trigger, skip
-
-                print(f"Trigger matched! Buffer: '{self.current_buffer}' | Trigger: '{full_trigger}'")
-                self.trigger_detected.emit(snippet)
-                self.current_buffer = ""
+                full_trigger_key = full_trigger.lower()
+            else:
+                full_trigger_key = full_trigger
+            starts.add(full_trigger_key[0])
+
+            node = root
+            for char in reversed(full_trigger_key):
+                node = node.setdefault(char, {})
+            node.setdefault(None, []).append((position, snippet, full_trigger))
+        return root, (None if self.require_delimiter else frozenset(starts))
+
+    def check_triggers(self):
+        """Check if current buffer matches any trigger based on settings"""
+        self._refresh_trigger_index()
+
+        # Check for match (case-sensitive or case-insensitive)
+        if self.case_sensitive:
+            typed = reversed(self.current_buffer)
+        else:
+            typed = reversed(''.join(self.current_buffer).lower())
+
+        # Walk back from the last typed character; every trigger end passed is a trigger
+        # the buffer ends with, so the cost is bounded by the longest trigger
+        matches = []
+        node = self._trigger_index
+        for char in typed:
+            node = node.get(char)
+            if node is None:
                 break
+            matches.extend(node.get(None, ()))
+
+        # Earliest snippet in the list wins, as with a front-to-back scan
+        matches.sort(key=lambda match: match[0])
+        for position, snippet, full_trigger in matches:
+            # Check delimiter requirement
+            if self.require_delimiter:
+                # There must be a delimiter before the trigger (or buffer starts with trigger)
+                trigger_start = len(self.current_buffer) - len(full_trigger)
+                if trigger_start > 0:
+                    char_before = self.current_buffer[trigger_start - 1]
+                    if char_before not in _TRIGGER_DELIMITERS:
+                        continue  # No delimiter before trigger, skip
+
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Trigger matched! Buffer: '%s' | Trigger: '%s'", ''.join(self.current_buffer), full_trigger)
+            self.trigger_detected.emit(snippet)
+            self.current_buffer.clear()
+            break
 
     def update_snippets(self, snippets):
         """Update the snippets list"""
         self.snippets = snippets
+        self._snippets_version += 1  # The trigger index is rebuilt on the next key press
+
+    def update_settings(self, settings):
+        """Update the trigger matching settings"""
+        self.case_sensitive = settings.get('case_sensitive', True)
+        self.require_delimiter = settings.get('require_delimiter', False)
+        self.require_prefix = settings.get('require_prefix', False)
+        self.prefix_char = settings.get('prefix_char', '/')
+        self._snippets_version += 1  # Case and prefix are baked into the trigger index
 
     def stop(self):
         """Stop the listener"""
-        self.running = False
+        with self._pynput_lock:
+            self.running = False
+            pynput_events = self.pynput_events
+        if self._wakeup_write is not None:
+            try:
+                os.write(self._wakeup_write, b'\0')
+            except OSError:
+                pass  # Loop already gone
+            os.close(self._wakeup_write)
+            self._wakeup_write = None
+        if pynput_events is not None:
+            pynput_events.__exit__(None, None, None)  # Stops pynput and ends the event iteration
 
 
-class SettingsDialog(QDialog):
-    """Dialog for application settings with tabbed interface"""
+class SettingsWriter(QRunnable):
+    """Writes the settings file on a thread pool thread.
 
-    def __init__(self, parent=None, current_settings=None):
-        super().__init__(parent)
-        self.settings = current_settings or {}
-        self.parent_window = parent
-        self.setWindowTitle("Settings")
-        self.setMinimumSize(550, 500)
+    Only the newest settings handed to save() are written; states replaced before
+    the pool gets to them are dropped. The file is replaced atomically so a reader
+    never sees a partial write.
+    """
 
-        # Detect current theme from parent window
-        self.is_light_theme = False
-        if parent and hasattr(parent, 'current_theme'):
-            self.is_light_theme = (parent.current_theme == 'Light')
+    def __init__(self, path):
+        super().__init__()
+        self.setAutoDelete(False)  # Started again for every batch of saves
+        self.path = path
+        self._lock = threading.Lock()
+        self._pending = None
+        self._running = False
+
+    def save(self, settings):
+        """Queue a copy of settings to be written"""
+        with self._lock:
+            self._pending = dict(settings)
+            if self._running:
+                return  # The running write loop will pick it up
+            self._running = True
+        QThreadPool.globalInstance().start(self)
 
-        self.init_ui()
+    def run(self):
+        try:
+            while True:
+                with self._lock:
+                    settings, self._pending = self._pending, None
+                    if settings is None:
+                        self._running = False
+                        return
+                self.write(settings)
+        except BaseException:
+            # Never leave _running stuck, or every later save() would be dropped.
+            # (Not a finally: a clean exit already cleared it under the lock, and a
+            # save() may have started a new run since.)
+            with self._lock:
+                self._running = False
+            raise
+
+    def write(self, settings):
+        """Write settings to the file, leaving the old file in place on failure"""
+        temp_path = self.path.with_name(self.path.name + '.tmp')
+        try:
+            with open(temp_path, 'w') as f:
+                json.dump(settings, f, indent=2)
+            os.replace(temp_path, self.path)
+        except Exception as e:
+            print(f"Error saving settings: {e}")
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
 
-    def get_dark_stylesheet(self):
-        """Return the dark theme stylesheet for settings dialog"""
-        return """
-            QDialog {
-                background-color: #1E1E1E;
-            }
-            QLabel {
-                color: #E0E0E0;
-                font-size: 13px;
-            }
-            QTabWidget::pane {
-                border: 1px solid #424242;
-                background-color: #1E1E1E;
-                border-radius: 4px;
-            }
-            QTabBar::tab {
-                background-color: #2A2A2A;
-                color: #888888;
-                padding: 8px 16px;
-                margin-right: 2px;
-                border-top-left-radius: 4px;
-                border-top-right-radius: 4px;
-            }
-            QTabBar::tab:selected {
-                background-color: #1E1E1E;
-                color: #FF6B00;
-                border-bottom: 2px solid #FF6B00;
-            }
-            QTabBar::tab:hover:!selected {
-                background-color: #333333;
-            }
-            QComboBox, QSpinBox, QLineEdit {
-                background-color: #2A2A2A;
-                color: #E0E0E0;
-                border: 1px solid #424242;
-                border-radius: 4px;
-                padding: 6px 10px;
-                min-width: 120px;
-                font-size: 13px;
-            }
-            QComboBox::drop-down {
-                border: none;
-                width: 24px;
-            }
-            QComboBox::down-arrow {
-                width: 0;
-                height: 0;
-                border-left: 5px solid transparent;
-                border-right: 5px solid transparent;
-                border-top: 6px solid #E0E0E0;
-            }
-            QComboBox QAbstractItemView {
-                background-color: #2A2A2A;
-                color: #E0E0E0;
-                selection-background-color: #FF6B00;
-            }
-            QCheckBox {
-                color: #E0E0E0;
-                spacing: 8px;
-                font-size: 13px;
-            }
-            QCheckBox::indicator {
-                width: 18px;
-                height: 18px;
-                border: 2px solid #424242;
-                border-radius: 3px;
-                background-color: #2A2A2A;
-            }
-            QCheckBox::indicator:checked {
-                background-color: #FF6B00;
-                border-color: #FF6B00;
-            }
-            QCheckBox::indicator:hover {
-                border-color: #FF6B00;
-            }
-            QPushButton {
-                background-color: #FF6B00;
-                color: white;
-                border: none;
-                border-radius: 4px;
-                padding: 8px 20px;
-                font-weight: 500;
-                font-size: 13px;
-            }
-            QPushButton:hover {
-                background-color: #FF8C00;
-            }
-            QGroupBox {
-                color: #FF6B00;
-                font-weight: bold;
-                border: 1px solid #424242;
-                border-radius: 4px;
-                margin-top: 12px;
-                padding-top: 8px;
-            }
-            QGroupBox::title {
-                subcontrol-origin: margin;
-                left: 10px;
-                padding: 0 5px;
-            }
-        """
 
-    def get_light_stylesheet(self):
-        """Return the light theme stylesheet for settings dialog"""
-        return """
-            QDialog {
-                background-color: #F5F5F5;
-            }
-            QLabel {
-                color: #212121;
-                font-size: 13px;
-            }
-            QTabWidget::pane {
-                border: 1px solid #E0E0E0;
-                background-color: rgba(255, 255, 255, 220);
-                border-radius: 4px;
-            }
-            QTabBar::tab {
-                background-color: rgba(238, 238, 238, 230);
-                color: #616161;
-                padding: 8px 16px;
-                margin-right: 2px;
-                border: 1px solid #E0E0E0;
-                border-bottom: none;
-                border-top-left-radius: 4px;
-                border-top-right-radius: 4px;
-            }
-            QTabBar::tab:selected {
-                background-color: rgba(255, 255, 255, 240);
-                color: #FF6B00;
-                border-bottom: 2px solid #FF6B00;
-            }
-            QTabBar::tab:hover:!selected {
-                background-color: rgba(224, 224, 224, 230);
-            }
-            QComboBox, QSpinBox, QLineEdit {
-                background-color: rgba(255, 255, 255, 230);
-                color: #212121;
-                border: 1px solid #BDBDBD;
-                border-radius: 4px;
-                padding: 6px 10px;
-                min-width: 120px;
-                font-size: 13px;
-            }
-            QComboBox::drop-down {
-                border: none;
-                width: 24px;
-            }
-            QComboBox::down-arrow {
-                width: 0;
-                height: 0;
-                border-left: 5px solid transparent;
-                border-right: 5px solid transparent;
-                border-top: 6px solid #616161;
-            }
-            QComboBox QAbstractItemView {
-                background-color: rgba(255, 255, 255, 250);
-                color: #212121;
-                selection-background-color: #FFE0B2;
-            }
-            QCheckBox {
-                color: #212121;
-                spacing: 8px;
-                font-size: 13px;
-            }
-            QCheckBox::indicator {
-                width: 18px;
-                height: 18px;
-                border: 2px solid #BDBDBD;
-                border-radius: 3px;
-                background-color: #FFFFFF;
-            }
-            QCheckBox::indicator:checked {
-                background-color: #FF6B00;
-                border-color: #FF6B00;
-            }
-            QCheckBox::indicator:hover {
-                border-color: #FF6B00;
-            }
-            QPushButton {
-                background-color: #FF6B00;
-                color: white;
-                border: none;
-                border-radius: 4px;
-                padding: 8px 20px;
-                font-weight: 500;
-                font-size: 13px;
-            }
-            QPushButton:hover {
-                background-color: #FF8C00;
-            }
-            QGroupBox {
-                color: #FF6B00;
-                font-weight: bold;
-                border: 1px solid #E0E0E0;
-                border-radius: 4px;
-                margin-top: 12px;
-                padding-top: 8px;
-                background-color: rgba(255, 255, 255, 180);
-            }
-            QGroupBox::title {
-                subcontrol-origin: margin;
-                left: 10px;
-                padding: 0 5px;
-            }
-        """
+class SettingsDialog(QDialog):
+    """Dialog for application settings with tabbed interface"""
+
+    # Settings the main window background and the trigger listener depend on
+    _BACKGROUND_SETTINGS = frozenset({'theme', 'show_background', 'custom_background',
+                                      'custom_background_light', 'background_opacity'})
+    _TRIGGER_SETTINGS = frozenset({'case_sensitive', 'require_delimiter', 'require_prefix', 'prefix_char'})
+
+    # Limits for snippet import files, checked before and after parsing
+    _IMPORT_MAX_BYTES = 50 * 1024 * 1024
+    _IMPORT_MAX_SNIPPETS = 100_000
+    _IMPORT_REQUIRED_KEYS = frozenset({'trigger', 'content'})
+
+    def __init__(self, parent=None, current_settings=None):
+        super().__init__(parent)
+        self.settings = current_settings or {}
+        self.parent_window = parent
+        self.setWindowTitle("Settings")
+        self.setMinimumSize(550, 500)
+
+        # Detect current theme from parent window
+        self.is_light_theme = False
+        if parent and hasattr(parent, 'current_theme'):
+            self.is_light_theme = (parent.current_theme == 'Light')
+
+        # Widget changes are applied once they settle, not on every keystroke or spin step
+        self._apply_timer = QTimer(self)
+        self._apply_timer.setSingleShot(True)
+        self._apply_timer.setInterval(250)
+        self._apply_timer.timeout.connect(self.apply_settings)
+
+        self._file_dialogs = {}  # Reused file dialogs, see choose_path()
+
+        self.init_ui()
+        self._last_applied = self.get_settings()  # Baseline for working out what changed
+
+    # Settings dialog stylesheet; the dark and light themes only fill in different palettes
+    _QSS_TEMPLATE = """
+        QDialog {
+            background-color: %(dialog_bg)s;
+        }
+        QLabel {
+            color: %(text)s;
+            font-size: 13px;
+        }
+        QTabWidget::pane {
+            border: 1px solid %(frame_border)s;
+            background-color: %(pane_bg)s;
+            border-radius: 4px;
+        }
+        QTabBar::tab {
+            background-color: %(tab_bg)s;
+            color: %(tab_text)s;
+            padding: 8px 16px;
+            margin-right: 2px;%(tab_extra)s
+            border-top-left-radius: 4px;
+            border-top-right-radius: 4px;
+        }
+        QTabBar::tab:selected {
+            background-color: %(tab_selected_bg)s;
+            color: #FF6B00;
+            border-bottom: 2px solid #FF6B00;
+        }
+        QTabBar::tab:hover:!selected {
+            background-color: %(tab_hover_bg)s;
+        }
+        QComboBox, QSpinBox, QLineEdit {
+            background-color: %(input_bg)s;
+            color: %(text)s;
+            border: 1px solid %(input_border)s;
+            border-radius: 4px;
+            padding: 6px 10px;
+            min-width: 120px;
+            font-size: 13px;
+        }
+        QComboBox::drop-down {
+            border: none;
+            width: 24px;
+        }
+        QComboBox::down-arrow {
+            width: 0;
+            height: 0;
+            border-left: 5px solid transparent;
+            border-right: 5px solid transparent;
+            border-top: 6px solid %(arrow)s;
+        }
+        QComboBox QAbstractItemView {
+            background-color: %(popup_bg)s;
+            color: %(text)s;
+            selection-background-color: %(popup_selection)s;
+        }
+        QCheckBox {
+            color: %(text)s;
+            spacing: 8px;
+            font-size: 13px;
+        }
+        QCheckBox::indicator {
+            width: 18px;
+            height: 18px;
+            border: 2px solid %(input_border)s;
+            border-radius: 3px;
+            background-color: %(indicator_bg)s;
+        }
+        QCheckBox::indicator:checked {
+            background-color: #FF6B00;
+            border-color: #FF6B00;
+        }
+        QCheckBox::indicator:hover {
+            border-color: #FF6B00;
+        }
+        QPushButton {
+            background-color: #FF6B00;
+            color: white;
+            border: none;
+            border-radius: 4px;
+            padding: 8px 20px;
+            font-weight: 500;
+            font-size: 13px;
+        }
+        QPushButton:hover {
+            background-color: #FF8C00;
+        }
+        QPushButton#accentBtn, QPushButton#accentBrowseBtn {
+            background-color: #4A90D9;
+        }
+        QPushButton#accentBtn:hover, QPushButton#accentBrowseBtn:hover {
+            background-color: #5AA0E9;
+        }
+        QPushButton#accentBrowseBtn {
+            padding: 6px 12px;
+        }
+        QGroupBox {
+            color: #FF6B00;
+            font-weight: bold;
+            border: 1px solid %(frame_border)s;
+            border-radius: 4px;
+            margin-top: 12px;
+            padding-top: 8px;%(group_extra)s
+        }
+        QGroupBox::title {
+            subcontrol-origin: margin;
+            left: 10px;
+            padding: 0 5px;
+        }
+    """
+    _DARK_QSS = _QSS_TEMPLATE % {
+        'dialog_bg': '#1E1E1E',
+        'pane_bg': '#1E1E1E',
+        'tab_bg': '#2A2A2A',
+        'tab_selected_bg': '#1E1E1E',
+        'tab_hover_bg': '#333333',
+        'input_bg': '#2A2A2A',
+        'popup_bg': '#2A2A2A',
+        'indicator_bg': '#2A2A2A',
+        'text': '#E0E0E0',
+        'tab_text': '#888888',
+        'arrow': '#E0E0E0',
+        'frame_border': '#424242',
+        'input_border': '#424242',
+        'popup_selection': '#FF6B00',
+        'tab_extra': '',
+        'group_extra': '',
+    }
+    _LIGHT_QSS = _QSS_TEMPLATE % {
+        'dialog_bg': '#F5F5F5',
+        'pane_bg': 'rgba(255, 255, 255, 220)',
+        'tab_bg': 'rgba(238, 238, 238, 230)',
+        'tab_selected_bg': 'rgba(255, 255, 255, 240)',
+        'tab_hover_bg': 'rgba(224, 224, 224, 230)',
+        'input_bg': 'rgba(255, 255, 255, 230)',
+        'popup_bg': 'rgba(255, 255, 255, 250)',
+        'indicator_bg': '#FFFFFF',
+        'text': '#212121',
+        'tab_text': '#616161',
+        'arrow': '#616161',
+        'frame_border': '#E0E0E0',
+        'input_border': '#BDBDBD',
+        'popup_selection': '#FFE0B2',
+        'tab_extra': '\n            border: 1px solid #E0E0E0;\n            border-bottom: none;',
+        'group_extra': '\n            background-color: rgba(255, 255, 255, 180);',
+    }
 
     def init_ui(self):
-        if self.is_light_theme:
-            self.setStyleSheet(self.get_light_stylesheet())
-        else:
-            self.setStyleSheet(self.get_dark_stylesheet())
+        self.setStyleSheet(self._LIGHT_QSS if self.is_light_theme else self._DARK_QSS)
 
         layout = QVBoxLayout(self)
         layout.setSpacing(16)
@@ -5908,15 +6572,19 @@ class SettingsDialog(QDialog):
         self.tabs = QTabWidget()
         layout.addWidget(self.tabs)
 
-        # Create tabs
-        self.create_appearance_tab()
-        self.create_behavior_tab()
-        self.create_triggers_tab()
-        self.create_datetime_tab()
-        self.create_backup_tab()
-
-        # Connect all settings widgets to auto-apply
-        self.connect_auto_apply_signals()
+        # Create tabs as empty pages; each is filled in the first time it is shown
+        self._tab_builders = {
+            "Appearance": self.create_appearance_tab,
+            "Behavior": self.create_behavior_tab,
+            "Triggers": self.create_triggers_tab,
+            "Date/Time": self.create_datetime_tab,
+            "Backup": self.create_backup_tab,
+        }
+        self._built_tabs = set()
+        for title in self._tab_builders:
+            self.tabs.addTab(QWidget(), title)
+        self.build_tab(self.tabs.currentIndex())
+        self.tabs.currentChanged.connect(self.build_tab)
 
         # Single Close button (settings apply automatically)
         button_layout = QHBoxLayout()
@@ -5928,38 +6596,28 @@ class SettingsDialog(QDialog):
 
         layout.addLayout(button_layout)
 
-    def connect_auto_apply_signals(self):
-        """Connect all settings widgets to auto-apply changes"""
-        # Appearance tab
-        self.theme_combo.currentTextChanged.connect(self.apply_settings)
-        self.show_background_cb.stateChanged.connect(self.apply_settings)
-        self.bg_path_edit.textChanged.connect(self.apply_settings)
-        self.bg_light_path_edit.textChanged.connect(self.apply_settings)
-        self.bg_opacity_combo.currentTextChanged.connect(self.apply_settings)
-        self.font_size_spin.valueChanged.connect(self.apply_settings)
-
-        # Behavior tab
-        self.start_minimized_cb.stateChanged.connect(self.apply_settings)
-        self.start_on_login_cb.stateChanged.connect(self.apply_settings)
-        self.play_sound_cb.stateChanged.connect(self.apply_settings)
-        self.show_notification_cb.stateChanged.connect(self.apply_settings)
-        self.expansion_delay_spin.valueChanged.connect(self.apply_settings)
-
-        # Triggers tab
-        self.case_sensitive_cb.stateChanged.connect(self.apply_settings)
-        self.require_delimiter_cb.stateChanged.connect(self.apply_settings)
-        self.require_prefix_cb.stateChanged.connect(self.apply_settings)
-        self.prefix_char_edit.textChanged.connect(self.apply_settings)
-        self.clear_clipboard_cb.stateChanged.connect(self.apply_settings)
-
-        # Date/Time tab
-        self.date_format_combo.currentTextChanged.connect(self.apply_settings)
-        self.time_format_combo.currentTextChanged.connect(self.apply_settings)
-        self.first_day_combo.currentTextChanged.connect(self.apply_settings)
-
-        # Backup tab
-        self.auto_backup_cb.stateChanged.connect(self.apply_settings)
-        self.backup_path_edit.textChanged.connect(self.apply_settings)
+    def build_tab(self, index):
+        """Build a settings tab's widgets the first time it is shown"""
+        title = self.tabs.tabText(index)
+        if title in self._built_tabs or title not in self._tab_builders:
+            return
+        self._built_tabs.add(title)
+        page = self.tabs.widget(index)
+        # The page may already be on screen; hold off repaints until it is filled in
+        page.setUpdatesEnabled(False)
+        self._tab_builders[title](page)
+        page.setUpdatesEnabled(True)
+
+    def schedule_apply_settings(self):
+        """Apply settings after a short pause, coalescing bursts of changes"""
+        self._apply_timer.start()  # Restarts the wait if one is already pending
+
+    def done(self, result):
+        """Apply any pending change before the dialog closes"""
+        # Unconditional, as a line edit still being edited hasn't emitted editingFinished
+        self._apply_timer.stop()
+        self.apply_settings()
+        super().done(result)
 
     def apply_settings(self):
         """Apply settings immediately to parent window"""
@@ -5968,55 +6626,73 @@ class SettingsDialog(QDialog):
 
         # Get current settings from widgets
         new_settings = self.get_settings()
+        changed = {key for key, value in new_settings.items() if self._last_applied.get(key) != value}
+        if not changed:
+            return
+        self._last_applied = new_settings
 
         # Update parent's settings
         self.parent_window.settings = new_settings
         self.parent_window.save_settings()
 
-        # Apply visual changes
-        self.parent_window.apply_theme()
-        self.parent_window.load_background_image()
-        self.parent_window.update_background_label()
-        self.parent_window.refresh_tree()
-
-        # Update this dialog's theme if theme changed
-        new_theme = new_settings.get('theme', 'Dark')
-        new_is_light = (new_theme == 'Light')
-        if new_is_light != self.is_light_theme:
-            self.is_light_theme = new_is_light
-            self.update_dialog_theme()
+        # Apply visual changes, only the ones the changed settings affect
+        if 'theme' in changed:
+            self.parent_window.apply_theme()
+        if changed & self._BACKGROUND_SETTINGS:
+            self.parent_window.load_background_image()
+            self.parent_window.update_background_label()
+        if 'theme' in changed:
+            self.parent_window.refresh_tree()  # Folder colors follow the theme
+
+            # Update this dialog's theme if theme changed
+            new_theme = new_settings.get('theme', 'Dark')
+            new_is_light = (new_theme == 'Light')
+            if new_is_light != self.is_light_theme:
+                self.is_light_theme = new_is_light
+                self.update_dialog_theme()
 
         # Update listener settings
-        if hasattr(self.parent_window, 'listener_thread') and self.parent_window.listener_thread:
-            self.parent_window.listener_thread.case_sensitive = new_settings.get('case_sensitive', True)
-            self.parent_window.listener_thread.require_delimiter = new_settings.get('require_delimiter', False)
-            self.parent_window.listener_thread.require_prefix = new_settings.get('require_prefix', False)
-            self.parent_window.listener_thread.prefix_char = new_settings.get('prefix_char', '/')
+        if changed & self._TRIGGER_SETTINGS:
+            if hasattr(self.parent_window, 'listener_thread') and self.parent_window.listener_thread:
+                self.parent_window.listener_thread.update_settings(new_settings)
 
     def update_dialog_theme(self):
         """Update the dialog's stylesheet based on current theme"""
         if self.is_light_theme:
-            self.setStyleSheet(self.get_light_stylesheet())
+            self.setStyleSheet(self._LIGHT_QSS)
             self.auto_save_label.setStyleSheet("color: #757575; font-size: 12px; font-style: italic;")
         else:
-            self.setStyleSheet(self.get_dark_stylesheet())
+            self.setStyleSheet(self._DARK_QSS)
             self.auto_save_label.setStyleSheet("color: #888888; font-size: 12px; font-style: italic;")
 
-    def create_appearance_tab(self):
-        """Create the Appearance settings tab"""
-        tab = QWidget()
+    def create_tab_layout(self, tab):
+        """Give a settings tab page the standard vertical layout"""
         layout = QVBoxLayout(tab)
         layout.setSpacing(16)
         layout.setContentsMargins(16, 16, 16, 16)
+        return layout
+
+    def add_setting_checkbox(self, layout, text, key, default):
+        """Add a checkbox for a boolean setting that auto-applies when toggled"""
+        checkbox = QCheckBox(text)
+        checkbox.setChecked(self.settings.get(key, default))
+        checkbox.toggled.connect(self.schedule_apply_settings)
+        layout.addWidget(checkbox)
+        return checkbox
+
+    def create_appearance_tab(self, tab):
+        """Create the Appearance settings tab's widgets on its (empty) page"""
+        layout = self.create_tab_layout(tab)
 
         # Theme section
         theme_group = QGroupBox("Theme")
         theme_layout = QHBoxLayout(theme_group)
         theme_layout.addWidget(QLabel("Color theme:"))
         self.theme_combo = QComboBox()
-        self.theme_combo.addItems(['Dark', 'Light', 'Auto (System)'])
+        for value in ['Dark', 'Light', 'Auto (System)']:
+            self.theme_combo.addItem(value, value)  # Data is the value stored in settings
         current_theme = self.settings.get('theme', 'Dark')
-        index = self.theme_combo.findText(current_theme)
+        index = self.theme_combo.findData(current_theme)
         if index >= 0:
             self.theme_combo.setCurrentIndex(index)
         theme_layout.addWidget(self.theme_combo)
@@ -6027,9 +6703,7 @@ class SettingsDialog(QDialog):
         bg_group = QGroupBox("Background")
         bg_layout = QVBoxLayout(bg_group)
 
-        self.show_background_cb = QCheckBox("Show background image")
-        self.show_background_cb.setChecked(self.settings.get('show_background', True))
-        bg_layout.addWidget(self.show_background_cb)
+        self.show_background_cb = self.add_setting_checkbox(bg_layout, "Show background image", 'show_background', True)
 
         bg_path_layout = QHBoxLayout()
         bg_path_layout.addWidget(QLabel("Custom image:"))
@@ -6040,15 +6714,7 @@ class SettingsDialog(QDialog):
 
         browse_btn = QPushButton("Browse")
         browse_btn.clicked.connect(self.browse_background)
-        browse_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #4A90D9;
-                padding: 6px 12px;
-            }
-            QPushButton:hover {
-                background-color: #5AA0E9;
-            }
-        """)
+        browse_btn.setObjectName("accentBrowseBtn")
         bg_path_layout.addWidget(browse_btn)
         bg_layout.addLayout(bg_path_layout)
 
@@ -6062,15 +6728,7 @@ class SettingsDialog(QDialog):
 
         browse_light_btn = QPushButton("Browse")
         browse_light_btn.clicked.connect(self.browse_background_light)
-        browse_light_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #4A90D9;
-                padding: 6px 12px;
-            }
-            QPushButton:hover {
-                background-color: #5AA0E9;
-            }
-        """)
+        browse_light_btn.setObjectName("accentBrowseBtn")
         bg_light_layout.addWidget(browse_light_btn)
         bg_layout.addLayout(bg_light_layout)
 
@@ -6078,9 +6736,10 @@ class SettingsDialog(QDialog):
         opacity_layout = QHBoxLayout()
         opacity_layout.addWidget(QLabel("Opacity:"))
         self.bg_opacity_combo = QComboBox()
-        self.bg_opacity_combo.addItems(['0%', '25%', '50%', '75%', '100%'])
+        for value in ['0%', '25%', '50%', '75%', '100%']:
+            self.bg_opacity_combo.addItem(value, value)
         current_opacity = self.settings.get('background_opacity', '50%')
-        index = self.bg_opacity_combo.findText(current_opacity)
+        index = self.bg_opacity_combo.findData(current_opacity)
         if index >= 0:
             self.bg_opacity_combo.setCurrentIndex(index)
         opacity_layout.addWidget(self.bg_opacity_combo)
@@ -6103,26 +6762,26 @@ class SettingsDialog(QDialog):
         layout.addWidget(font_group)
 
         layout.addStretch()
-        self.tabs.addTab(tab, "Appearance")
 
-    def create_behavior_tab(self):
-        """Create the Behavior settings tab"""
-        tab = QWidget()
-        layout = QVBoxLayout(tab)
-        layout.setSpacing(16)
-        layout.setContentsMargins(16, 16, 16, 16)
+        # Auto-apply changes
+        self.theme_combo.currentTextChanged.connect(self.schedule_apply_settings)
+        self.bg_path_edit.editingFinished.connect(self.schedule_apply_settings)
+        self.bg_light_path_edit.editingFinished.connect(self.schedule_apply_settings)
+        self.bg_opacity_combo.currentTextChanged.connect(self.schedule_apply_settings)
+        self.font_size_spin.valueChanged.connect(self.schedule_apply_settings)
+
+    def create_behavior_tab(self, tab):
+        """Create the Behavior settings tab's widgets on its (empty) page"""
+        layout = self.create_tab_layout(tab)
 
         # Startup section
         startup_group = QGroupBox("Startup")
         startup_layout = QVBoxLayout(startup_group)
 
-        self.start_minimized_cb = QCheckBox("Start minimized to system tray")
-        self.start_minimized_cb.setChecked(self.settings.get('start_minimized', True))
-        startup_layout.addWidget(self.start_minimized_cb)
-
-        self.start_on_login_cb = QCheckBox("Start on system login")
-        self.start_on_login_cb.setChecked(self.settings.get('start_on_login', False))
-        startup_layout.addWidget(self.start_on_login_cb)
+        self.start_minimized_cb = self.add_setting_checkbox(startup_layout, "Start minimized to system tray",
+                                                            'start_minimized', True)
+        self.start_on_login_cb = self.add_setting_checkbox(startup_layout, "Start on system login",
+                                                           'start_on_login', False)
 
         layout.addWidget(startup_group)
 
@@ -6130,13 +6789,9 @@ class SettingsDialog(QDialog):
         notif_group = QGroupBox("Notifications")
         notif_layout = QVBoxLayout(notif_group)
 
-        self.play_sound_cb = QCheckBox("Play sound on expansion")
-        self.play_sound_cb.setChecked(self.settings.get('play_sound', False))
-        notif_layout.addWidget(self.play_sound_cb)
-
-        self.show_notification_cb = QCheckBox("Show notification on expansion")
-        self.show_notification_cb.setChecked(self.settings.get('show_notification', False))
-        notif_layout.addWidget(self.show_notification_cb)
+        self.play_sound_cb = self.add_setting_checkbox(notif_layout, "Play sound on expansion", 'play_sound', False)
+        self.show_notification_cb = self.add_setting_checkbox(notif_layout, "Show notification on expansion",
+                                                              'show_notification', False)
 
         layout.addWidget(notif_group)
 
@@ -6157,26 +6812,22 @@ class SettingsDialog(QDialog):
         layout.addWidget(expansion_group)
 
         layout.addStretch()
-        self.tabs.addTab(tab, "Behavior")
 
-    def create_triggers_tab(self):
-        """Create the Triggers settings tab"""
-        tab = QWidget()
-        layout = QVBoxLayout(tab)
-        layout.setSpacing(16)
-        layout.setContentsMargins(16, 16, 16, 16)
+        # Auto-apply changes
+        self.expansion_delay_spin.valueChanged.connect(self.schedule_apply_settings)
+
+    def create_triggers_tab(self, tab):
+        """Create the Triggers settings tab's widgets on its (empty) page"""
+        layout = self.create_tab_layout(tab)
 
         # Matching section
         match_group = QGroupBox("Trigger Matching")
         match_layout = QVBoxLayout(match_group)
 
-        self.case_sensitive_cb = QCheckBox("Case sensitive triggers")
-        self.case_sensitive_cb.setChecked(self.settings.get('case_sensitive', True))
-        match_layout.addWidget(self.case_sensitive_cb)
-
-        self.require_delimiter_cb = QCheckBox("Require space/punctuation after trigger")
-        self.require_delimiter_cb.setChecked(self.settings.get('require_delimiter', False))
-        match_layout.addWidget(self.require_delimiter_cb)
+        self.case_sensitive_cb = self.add_setting_checkbox(match_layout, "Case sensitive triggers",
+                                                           'case_sensitive', True)
+        self.require_delimiter_cb = self.add_setting_checkbox(match_layout, "Require space/punctuation after trigger",
+                                                              'require_delimiter', False)
 
         layout.addWidget(match_group)
 
@@ -6184,14 +6835,16 @@ class SettingsDialog(QDialog):
         prefix_group = QGroupBox("Trigger Prefix")
         prefix_layout = QVBoxLayout(prefix_group)
 
-        self.require_prefix_cb = QCheckBox("Only expand triggers starting with specific character")
-        self.require_prefix_cb.setChecked(self.settings.get('require_prefix', False))
-        prefix_layout.addWidget(self.require_prefix_cb)
+        self.require_prefix_cb = self.add_setting_checkbox(prefix_layout, "Only expand triggers starting with specific character",
+                                                           'require_prefix', False)
 
         prefix_char_layout = QHBoxLayout()
         prefix_char_layout.addWidget(QLabel("Prefix character:"))
         self.prefix_char_edit = QLineEdit()
         self.prefix_char_edit.setMaxLength(1)
+        # Only punctuation/symbols, so the prefix can't be part of a word
+        prefix_pattern = QRegularExpression(r'[^\w\s]', QRegularExpression.UseUnicodePropertiesOption)
+        self.prefix_char_edit.setValidator(QRegularExpressionValidator(prefix_pattern, self.prefix_char_edit))
         self.prefix_char_edit.setMaximumWidth(50)
         self.prefix_char_edit.setText(self.settings.get('prefix_char', '/'))
         prefix_char_layout.addWidget(self.prefix_char_edit)
@@ -6204,21 +6857,19 @@ class SettingsDialog(QDialog):
         clip_group = QGroupBox("Clipboard")
         clip_layout = QVBoxLayout(clip_group)
 
-        self.clear_clipboard_cb = QCheckBox("Clear clipboard after paste")
-        self.clear_clipboard_cb.setChecked(self.settings.get('clear_clipboard', False))
-        clip_layout.addWidget(self.clear_clipboard_cb)
+        self.clear_clipboard_cb = self.add_setting_checkbox(clip_layout, "Clear clipboard after paste",
+                                                            'clear_clipboard', False)
 
         layout.addWidget(clip_group)
 
         layout.addStretch()
-        self.tabs.addTab(tab, "Triggers")
 
-    def create_datetime_tab(self):
-        """Create the Date/Time settings tab"""
-        tab = QWidget()
-        layout = QVBoxLayout(tab)
-        layout.setSpacing(16)
-        layout.setContentsMargins(16, 16, 16, 16)
+        # Auto-apply changes
+        self.prefix_char_edit.editingFinished.connect(self.schedule_apply_settings)
+
+    def create_datetime_tab(self, tab):
+        """Create the Date/Time settings tab's widgets on its (empty) page"""
+        layout = self.create_tab_layout(tab)
 
         # Date format section
         date_group = QGroupBox("Date Format")
@@ -6228,9 +6879,10 @@ class SettingsDialog(QDialog):
         format_layout.addWidget(QLabel("Format:"))
         self.date_format_combo = QComboBox()
         date_formats = ['MM/DD/YYYY', 'DD/MM/YYYY', 'YYYY-MM-DD', 'MM-DD-YYYY', 'DD-MM-YYYY']
-        self.date_format_combo.addItems(date_formats)
+        for value in date_formats:
+            self.date_format_combo.addItem(value, value)
         current_format = self.settings.get('date_format', 'MM/DD/YYYY')
-        index = self.date_format_combo.findText(current_format)
+        index = self.date_format_combo.findData(current_format)
         if index >= 0:
             self.date_format_combo.setCurrentIndex(index)
         format_layout.addWidget(self.date_format_combo)
@@ -6238,6 +6890,7 @@ class SettingsDialog(QDialog):
         date_layout.addLayout(format_layout)
 
         self.date_preview_label = QLabel()
+        self._preview_date = datetime.now()  # Only illustrates the format, so it needn't tick
         self.date_preview_label.setStyleSheet("color: #888888; font-style: italic;")
         self.update_date_preview()
         self.date_format_combo.currentTextChanged.connect(self.update_date_preview)
@@ -6252,9 +6905,10 @@ class SettingsDialog(QDialog):
         time_format_layout = QHBoxLayout()
         time_format_layout.addWidget(QLabel("Format:"))
         self.time_format_combo = QComboBox()
-        self.time_format_combo.addItems(['12-hour (3:30 PM)', '24-hour (15:30)'])
+        for value in ['12-hour (3:30 PM)', '24-hour (15:30)']:
+            self.time_format_combo.addItem(value, value)
         current_time = self.settings.get('time_format', '12-hour (3:30 PM)')
-        index = self.time_format_combo.findText(current_time)
+        index = self.time_format_combo.findData(current_time)
         if index >= 0:
             self.time_format_combo.setCurrentIndex(index)
         time_format_layout.addWidget(self.time_format_combo)
@@ -6270,9 +6924,10 @@ class SettingsDialog(QDialog):
         week_layout = QHBoxLayout()
         week_layout.addWidget(QLabel("First day of week:"))
         self.first_day_combo = QComboBox()
-        self.first_day_combo.addItems(['Sunday', 'Monday'])
+        for value in ['Sunday', 'Monday']:
+            self.first_day_combo.addItem(value, value)
         current_day = self.settings.get('first_day_of_week', 'Sunday')
-        index = self.first_day_combo.findText(current_day)
+        index = self.first_day_combo.findData(current_day)
         if index >= 0:
             self.first_day_combo.setCurrentIndex(index)
         week_layout.addWidget(self.first_day_combo)
@@ -6282,22 +6937,21 @@ class SettingsDialog(QDialog):
         layout.addWidget(cal_group)
 
         layout.addStretch()
-        self.tabs.addTab(tab, "Date/Time")
 
-    def create_backup_tab(self):
-        """Create the Backup settings tab"""
-        tab = QWidget()
-        layout = QVBoxLayout(tab)
-        layout.setSpacing(16)
-        layout.setContentsMargins(16, 16, 16, 16)
+        # Auto-apply changes
+        self.date_format_combo.currentTextChanged.connect(self.schedule_apply_settings)
+        self.time_format_combo.currentTextChanged.connect(self.schedule_apply_settings)
+        self.first_day_combo.currentTextChanged.connect(self.schedule_apply_settings)
+
+    def create_backup_tab(self, tab):
+        """Create the Backup settings tab's widgets on its (empty) page"""
+        layout = self.create_tab_layout(tab)
 
         # Auto-backup section
         backup_group = QGroupBox("Auto-Backup")
         backup_layout = QVBoxLayout(backup_group)
 
-        self.auto_backup_cb = QCheckBox("Enable automatic backups")
-        self.auto_backup_cb.setChecked(self.settings.get('auto_backup', False))
-        backup_layout.addWidget(self.auto_backup_cb)
+        self.auto_backup_cb = self.add_setting_checkbox(backup_layout, "Enable automatic backups", 'auto_backup', False)
 
         backup_path_layout = QHBoxLayout()
         backup_path_layout.addWidget(QLabel("Backup location:"))
@@ -6308,15 +6962,7 @@ class SettingsDialog(QDialog):
 
         backup_browse_btn = QPushButton("Browse")
         backup_browse_btn.clicked.connect(self.browse_backup_location)
-        backup_browse_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #4A90D9;
-                padding: 6px 12px;
-            }
-            QPushButton:hover {
-                background-color: #5AA0E9;
-            }
-        """)
+        backup_browse_btn.setObjectName("accentBrowseBtn")
         backup_path_layout.addWidget(backup_browse_btn)
         backup_layout.addLayout(backup_path_layout)
 
@@ -6330,26 +6976,12 @@ class SettingsDialog(QDialog):
 
         export_btn = QPushButton("Export Snippets")
         export_btn.clicked.connect(self.export_snippets)
-        export_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #4A90D9;
-            }
-            QPushButton:hover {
-                background-color: #5AA0E9;
-            }
-        """)
+        export_btn.setObjectName("accentBtn")
         export_btn_layout.addWidget(export_btn)
 
         import_btn = QPushButton("Import Snippets")
         import_btn.clicked.connect(self.import_snippets)
-        import_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #4A90D9;
-            }
-            QPushButton:hover {
-                background-color: #5AA0E9;
-            }
-        """)
+        import_btn.setObjectName("accentBtn")
         export_btn_layout.addWidget(import_btn)
 
         export_btn_layout.addStretch()
@@ -6358,44 +6990,67 @@ class SettingsDialog(QDialog):
         layout.addWidget(export_group)
 
         layout.addStretch()
-        self.tabs.addTab(tab, "Backup")
+
+        # Auto-apply changes
+        self.backup_path_edit.editingFinished.connect(self.schedule_apply_settings)
+
+    def choose_path(self, kind, title):
+        """Show the file dialog for kind ('image', 'directory', 'export' or 'import').
+
+        Each kind's dialog is created on first use and reused after that, so it also
+        reopens where the user last was. Returns the chosen path, or '' if cancelled.
+        """
+        dialog = self._file_dialogs.get(kind)
+        if dialog is None:
+            dialog = QFileDialog(self, title, _HOME_DIR)
+            if kind == 'directory':
+                dialog.setFileMode(QFileDialog.Directory)
+                dialog.setOptions(QFileDialog.ShowDirsOnly | QFileDialog.DontResolveSymlinks)
+            elif kind == 'image':
+                dialog.setFileMode(QFileDialog.ExistingFile)
+                dialog.setNameFilters(["Image Files (*.png *.jpg *.jpeg *.bmp)", "All Files (*)"])
+            else:
+                dialog.setNameFilters(["JSON Files (*.json)", "All Files (*)"])
+                if kind == 'export':
+                    dialog.setAcceptMode(QFileDialog.AcceptSave)
+                    dialog.selectFile("snippets_export.json")
+                else:
+                    dialog.setFileMode(QFileDialog.ExistingFile)
+            self._file_dialogs[kind] = dialog
+        dialog.setWindowTitle(title)
+        files = dialog.selectedFiles() if dialog.exec_() == QDialog.Accepted else []
+        return files[0] if files else ''
 
     def browse_background(self):
         """Browse for a custom background image"""
-        file_path, _ = QFileDialog.getOpenFileName(
-            self, "Select Background Image", str(Path.home()),
-            "Image Files (*.png *.jpg *.jpeg *.bmp);;All Files (*)"
-        )
+        file_path = self.choose_path('image', "Select Background Image")
         if file_path:
             self.bg_path_edit.setText(file_path)
+            self.schedule_apply_settings()  # setText() doesn't emit editingFinished
 
     def browse_background_light(self):
         """Browse for a custom light mode background image"""
-        file_path, _ = QFileDialog.getOpenFileName(
-            self, "Select Light Mode Background Image", str(Path.home()),
-            "Image Files (*.png *.jpg *.jpeg *.bmp);;All Files (*)"
-        )
+        file_path = self.choose_path('image', "Select Light Mode Background Image")
         if file_path:
             self.bg_light_path_edit.setText(file_path)
+            self.schedule_apply_settings()  # setText() doesn't emit editingFinished
 
     def browse_backup_location(self):
         """Browse for backup location"""
-        dir_path = QFileDialog.getExistingDirectory(
-            self, "Select Backup Location", str(Path.home())
-        )
+        dir_path = self.choose_path('directory', "Select Backup Location")
         if dir_path:
             self.backup_path_edit.setText(dir_path)
+            self.schedule_apply_settings()  # setText() doesn't emit editingFinished
 
     def export_snippets(self):
         """Export snippets to a file"""
-        file_path, _ = QFileDialog.getSaveFileName(
-            self, "Export Snippets", str(Path.home() / "snippets_export.json"),
-            "JSON Files (*.json);;All Files (*)"
-        )
+        file_path = self.choose_path('export', "Export Snippets")
         if file_path and self.parent_window:
             try:
+                # Encode in one go and write once; json.dump() writes every token separately
+                data = json.dumps(self.parent_window.snippets, indent=2)
                 with open(file_path, 'w') as f:
-                    json.dump(self.parent_window.snippets, f, indent=2)
+                    f.write(data)
                 QMessageBox.information(self, "Export Complete",
                                        f"Exported {len(self.parent_window.snippets)} snippets to:\n{file_path}")
             except Exception as e:
@@ -6403,24 +7058,25 @@ class SettingsDialog(QDialog):
 
     def import_snippets(self):
         """Import snippets from a file"""
-        file_path, _ = QFileDialog.getOpenFileName(
-            self, "Import Snippets", str(Path.home()),
-            "JSON Files (*.json);;All Files (*)"
-        )
+        file_path = self.choose_path('import', "Import Snippets")
         if file_path and self.parent_window:
             try:
+                # Refuse oversized files before reading them into memory at all
+                if os.path.getsize(file_path) > self._IMPORT_MAX_BYTES:
+                    QMessageBox.warning(self, "Import Failed", "Snippet file is too large.")
+                    return
                 with open(file_path, 'r') as f:
                     imported = json.load(f)
-                if isinstance(imported, list):
+                if (isinstance(imported, list) and len(imported) <= self._IMPORT_MAX_SNIPPETS and
+                        all(isinstance(snippet, dict) and self._IMPORT_REQUIRED_KEYS <= snippet.keys()
+                            for snippet in imported)):
                     reply = QMessageBox.question(
                         self, "Import Snippets",
                         f"Import {len(imported)} snippets?\n\nThis will add to your existing snippets.",
                         QMessageBox.Yes | QMessageBox.No
                     )
                     if reply == QMessageBox.Yes:
-                        self.parent_window.snippets.extend(imported)
-                        self.parent_window.save_snippets()
-                        self.parent_window.refresh_tree()
+                        self.parent_window.append_snippets(imported)
                         QMessageBox.information(self, "Import Complete",
                                                f"Imported {len(imported)} snippets.")
                 else:
@@ -6430,48 +7086,56 @@ class SettingsDialog(QDialog):
 
     def update_date_preview(self):
         """Update the date format preview"""
-        format_name = self.date_format_combo.currentText()
-        formats = {
-            'MM/DD/YYYY': '%m/%d/%Y',
-            'DD/MM/YYYY': '%d/%m/%Y',
-            'YYYY-MM-DD': '%Y-%m-%d',
-            'MM-DD-YYYY': '%m-%d-%Y',
-            'DD-MM-YYYY': '%d-%m-%Y',
-        }
-        fmt = formats.get(format_name, '%m/%d/%Y')
-        preview = datetime.now().strftime(fmt)
+        format_name = self.date_format_combo.currentData()
+        fmt = MainWindow.DATE_FORMATS.get(format_name, '%m/%d/%Y')
+        preview = self._preview_date.strftime(fmt)
         self.date_preview_label.setText(f"Preview: {preview}")
 
     def get_settings(self):
         """Return all updated settings"""
-        return {
-            # Appearance
-            'theme': self.theme_combo.currentText(),
-            'show_background': self.show_background_cb.isChecked(),
-            'custom_background': self.bg_path_edit.text(),
-            'custom_background_light': self.bg_light_path_edit.text(),
-            'background_opacity': self.bg_opacity_combo.currentText(),
-            'font_size': self.font_size_spin.value(),
-            # Behavior
-            'start_minimized': self.start_minimized_cb.isChecked(),
-            'start_on_login': self.start_on_login_cb.isChecked(),
-            'play_sound': self.play_sound_cb.isChecked(),
-            'show_notification': self.show_notification_cb.isChecked(),
-            'expansion_delay': self.expansion_delay_spin.value(),
-            # Triggers
-            'case_sensitive': self.case_sensitive_cb.isChecked(),
-            'require_delimiter': self.require_delimiter_cb.isChecked(),
-            'require_prefix': self.require_prefix_cb.isChecked(),
-            'prefix_char': self.prefix_char_edit.text(),
-            'clear_clipboard': self.clear_clipboard_cb.isChecked(),
-            # Date/Time
-            'date_format': self.date_format_combo.currentText(),
-            'time_format': self.time_format_combo.currentText(),
-            'first_day_of_week': self.first_day_combo.currentText(),
-            # Backup
-            'auto_backup': self.auto_backup_cb.isChecked(),
-            'backup_path': self.backup_path_edit.text(),
-        }
+        # Tabs that haven't been built keep the values the dialog was opened with
+        settings = dict(self.settings)
+        if "Appearance" in self._built_tabs:
+            settings.update({
+                'theme': self.theme_combo.currentData(),
+                'show_background': self.show_background_cb.isChecked(),
+                'custom_background': self.bg_path_edit.text(),
+                'custom_background_light': self.bg_light_path_edit.text(),
+                'background_opacity': self.bg_opacity_combo.currentData(),
+                'font_size': self.font_size_spin.value(),
+            })
+        if "Behavior" in self._built_tabs:
+            settings.update({
+                'start_minimized': self.start_minimized_cb.isChecked(),
+                'start_on_login': self.start_on_login_cb.isChecked(),
+                'play_sound': self.play_sound_cb.isChecked(),
+                'show_notification': self.show_notification_cb.isChecked(),
+                'expansion_delay': self.expansion_delay_spin.value(),
+            })
+        if "Triggers" in self._built_tabs:
+            settings.update({
+                'case_sensitive': self.case_sensitive_cb.isChecked(),
+                'require_delimiter': self.require_delimiter_cb.isChecked(),
+                'require_prefix': self.require_prefix_cb.isChecked(),
+                'prefix_char': self.prefix_char_edit.text(),
+                'clear_clipboard': self.clear_clipboard_cb.isChecked(),
+            })
+        if "Date/Time" in self._built_tabs:
+            settings.update({
+                'date_format': self.date_format_combo.currentData(),
+                'time_format': self.time_format_combo.currentData(),
+                'first_day_of_week': self.first_day_combo.currentData(),
+            })
+        if "Backup" in self._built_tabs:
+            settings.update({
+                'auto_backup': self.auto_backup_cb.isChecked(),
+                'backup_path': self.backup_path_edit.text(),
+            })
+        return settings
+
+
+# Emoji database shared by every window/editor (built once per process)
+_EMOJI_DB_CACHE = None
 
 
 class MainWindow(QMainWindow):
@@ -6493,547 +7157,545 @@ class MainWindow(QMainWindow):
         '24-hour with seconds (15:30:45)': '%H:%M:%S',
     }
 
-    def get_dark_theme(self):
-        """Return the dark theme stylesheet"""
-        return """
-            QMainWindow, QDialog {
-                background-color: #000000;
-            }
-            QWidget {
-                font-family: 'Segoe UI', 'Roboto', 'Noto Sans', sans-serif;
-                font-size: 14px;
-                color: #E0E0E0;
-            }
-            QPushButton {
-                background-color: #FF6B00;
-                color: white;
-                border: none;
-                border-radius: 4px;
-                padding: 8px 16px;
-                font-weight: 500;
-                min-height: 36px;
-            }
-            QPushButton:hover {
-                background-color: #FF8C00;
-            }
-            QPushButton:pressed {
-                background-color: #E65100;
-            }
-            QPushButton:disabled {
-                background-color: #424242;
-                color: #757575;
-            }
-            QPushButton#backBtn {
-                background-color: transparent;
-                color: #9E9E9E;
-                border: 1px solid #616161;
-                border-radius: 4px;
-                font-size: 18px;
-                font-weight: normal;
-                padding: 0px;
-                margin: 0px;
-                min-width: 32px;
-                max-width: 32px;
-                min-height: 32px;
-                max-height: 32px;
-            }
-            QPushButton#backBtn:hover {
-                background-color: #3D3D3D;
-                color: #FFFFFF;
-                border: 1px solid #9E9E9E;
-            }
-            QPushButton#backBtn:pressed {
-                background-color: #4A4A4A;
-                color: #FFFFFF;
-                border: 1px solid #9E9E9E;
-            }
-            QTableWidget {
-                background-color: rgba(0, 0, 0, 100);
-                border: 1px solid #333333;
-                border-radius: 4px;
-                gridline-color: #2A2A2A;
-                selection-background-color: #3D2814;
-                selection-color: #FFFFFF;
-                color: #E0E0E0;
-            }
-            QTableWidget::item {
-                padding: 12px 8px;
-                border-bottom: 1px solid #2A2A2A;
-                color: #E0E0E0;
-                background-color: transparent;
-            }
-            QTableWidget::item:selected {
-                background-color: #3D2814;
-                color: #FFFFFF;
-            }
-            QHeaderView::section {
-                background-color: rgba(0, 0, 0, 120);
-                color: #E0E0E0;
-                font-weight: 600;
-                padding: 12px 8px;
-                border: none;
-                border-bottom: 2px solid #FF6B00;
-            }
-            QLineEdit, QTextEdit {
-                background-color: rgba(30, 30, 30, 215);
-                border: 1px solid #424242;
-                border-radius: 4px;
-                padding: 8px;
-                color: #E0E0E0;
-                selection-background-color: #3D2814;
-            }
-            QLineEdit:focus, QTextEdit:focus {
-                border: 2px solid #FF6B00;
-                padding: 7px;
-            }
-            QLabel {
-                color: #E0E0E0;
-            }
-            QMenu {
-                background-color: #1E1E1E;
-                border: 1px solid #333333;
-                border-radius: 4px;
-                padding: 4px 0px;
-            }
-            QMenu::item {
-                padding: 8px 24px;
-                color: #E0E0E0;
-            }
-            QMenu::item:selected {
-                background-color: #333333;
-            }
-            QMessageBox {
-                background-color: #121212;
-            }
-            QMessageBox QLabel {
-                color: #E0E0E0;
-            }
-            QInputDialog {
-                background-color: #121212;
-            }
-            QComboBox {
-                background-color: rgba(30, 30, 30, 215);
-                border: 1px solid #424242;
-                border-radius: 4px;
-                padding: 8px;
-                min-height: 20px;
-                color: #E0E0E0;
-            }
-            QComboBox:focus {
-                border: 2px solid #FF6B00;
-            }
-            QComboBox::drop-down {
-                border: none;
-                width: 24px;
-            }
-            QComboBox::down-arrow {
-                width: 12px;
-                height: 12px;
-            }
-            QComboBox QAbstractItemView {
-                background-color: #1E1E1E;
-                color: #E0E0E0;
-                selection-background-color: #3D2814;
-            }
-            QScrollBar:vertical {
-                background-color: #1E1E1E;
-                width: 12px;
-                border-radius: 6px;
-            }
-            QScrollBar::handle:vertical {
-                background-color: #424242;
-                border-radius: 6px;
-                min-height: 40px;
-            }
-            QScrollBar::handle:vertical:hover {
-                background-color: #FF6B00;
-            }
-            QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical {
-                height: 0px;
-            }
-            QTreeWidget {
-                background-color: rgba(0, 0, 0, 100);
-                border: 1px solid #333333;
-                border-radius: 4px;
-                selection-background-color: #3D2814;
-                selection-color: #FFFFFF;
-                color: #E0E0E0;
-                outline: none;
-            }
-            QTreeWidget::item {
-                padding: 8px 4px;
-                border-bottom: 1px solid #2A2A2A;
-                color: #E0E0E0;
-                background-color: transparent;
-            }
-            QTreeWidget::item:selected {
-                background-color: #3D2814;
-                color: #FFFFFF;
-            }
-            QTreeWidget::branch {
-                background-color: transparent;
-            }
-            QTreeWidget::branch:has-children:!has-siblings:closed,
-            QTreeWidget::branch:closed:has-children:has-siblings {
-                image: url(none);
-                border-image: none;
-            }
-            QTreeWidget::branch:open:has-children:!has-siblings,
-            QTreeWidget::branch:open:has-children:has-siblings {
-                image: url(none);
-                border-image: none;
-            }
-            QGroupBox {
-                font-weight: bold;
-                border: 1px solid #424242;
-                border-radius: 4px;
-                margin-top: 12px;
-                padding-top: 8px;
-                color: #E0E0E0;
-            }
-            QGroupBox::title {
-                subcontrol-origin: margin;
-                left: 10px;
-                padding: 0 5px;
-            }
-            QCheckBox {
-                color: #E0E0E0;
-            }
-            QCheckBox::indicator {
-                width: 18px;
-                height: 18px;
-            }
-            QSpinBox {
-                background-color: rgba(30, 30, 30, 215);
-                border: 1px solid #424242;
-                border-radius: 4px;
-                padding: 4px;
-                padding-right: 20px;
-                color: #E0E0E0;
-            }
-            QSpinBox::up-button, QSpinBox::down-button {
-                background-color: #3D3D3D;
-                border: 1px solid #555555;
-                width: 18px;
-            }
-            QSpinBox::up-button {
-                border-top-right-radius: 3px;
-                subcontrol-origin: border;
-                subcontrol-position: top right;
-            }
-            QSpinBox::down-button {
-                border-bottom-right-radius: 3px;
-                subcontrol-origin: border;
-                subcontrol-position: bottom right;
-            }
-            QSpinBox::up-button:hover, QSpinBox::down-button:hover {
-                background-color: #4A4A4A;
-                border-color: #757575;
-            }
-            QSpinBox::up-button:pressed, QSpinBox::down-button:pressed {
-                background-color: #555555;
-            }
-            QTabWidget::pane {
-                border: 1px solid #424242;
-                border-radius: 4px;
-                background-color: #1E1E1E;
-            }
-            QTabBar::tab {
-                background-color: #2A2A2A;
-                color: #E0E0E0;
-                padding: 8px 16px;
-                border: 1px solid #424242;
-                border-bottom: none;
-                border-top-left-radius: 4px;
-                border-top-right-radius: 4px;
-            }
-            QTabBar::tab:selected {
-                background-color: #1E1E1E;
-                border-bottom: 2px solid #FF6B00;
-            }
-            QTabBar::tab:hover:!selected {
-                background-color: #333333;
-            }
-            QToolTip {
-                background-color: #424242;
-                color: #FFFFFF;
-                border: 1px solid #616161;
-                border-radius: 4px;
-                padding: 4px 8px;
-            }
+    # Dark theme stylesheet
+    _DARK_QSS = """
+        QMainWindow, QDialog {
+            background-color: #000000;
+        }
+        QWidget {
+            font-family: 'Segoe UI', 'Roboto', 'Noto Sans', sans-serif;
+            font-size: 14px;
+            color: #E0E0E0;
+        }
+        QPushButton {
+            background-color: #FF6B00;
+            color: white;
+            border: none;
+            border-radius: 4px;
+            padding: 8px 16px;
+            font-weight: 500;
+            min-height: 36px;
+        }
+        QPushButton:hover {
+            background-color: #FF8C00;
+        }
+        QPushButton:pressed {
+            background-color: #E65100;
+        }
+        QPushButton:disabled {
+            background-color: #424242;
+            color: #757575;
+        }
+        QPushButton#backBtn {
+            background-color: transparent;
+            color: #9E9E9E;
+            border: 1px solid #616161;
+            border-radius: 4px;
+            font-size: 18px;
+            font-weight: normal;
+            padding: 0px;
+            margin: 0px;
+            min-width: 32px;
+            max-width: 32px;
+            min-height: 32px;
+            max-height: 32px;
+        }
+        QPushButton#backBtn:hover {
+            background-color: #3D3D3D;
+            color: #FFFFFF;
+            border: 1px solid #9E9E9E;
+        }
+        QPushButton#backBtn:pressed {
+            background-color: #4A4A4A;
+            color: #FFFFFF;
+            border: 1px solid #9E9E9E;
+        }
+        QTableWidget {
+            background-color: rgba(0, 0, 0, 100);
+            border: 1px solid #333333;
+            border-radius: 4px;
+            gridline-color: #2A2A2A;
+            selection-background-color: #3D2814;
+            selection-color: #FFFFFF;
+            color: #E0E0E0;
+        }
+        QTableWidget::item {
+            padding: 12px 8px;
+            border-bottom: 1px solid #2A2A2A;
+            color: #E0E0E0;
+            background-color: transparent;
+        }
+        QTableWidget::item:selected {
+            background-color: #3D2814;
+            color: #FFFFFF;
+        }
+        QHeaderView::section {
+            background-color: rgba(0, 0, 0, 120);
+            color: #E0E0E0;
+            font-weight: 600;
+            padding: 12px 8px;
+            border: none;
+            border-bottom: 2px solid #FF6B00;
+        }
+        QLineEdit, QTextEdit {
+            background-color: rgba(30, 30, 30, 215);
+            border: 1px solid #424242;
+            border-radius: 4px;
+            padding: 8px;
+            color: #E0E0E0;
+            selection-background-color: #3D2814;
+        }
+        QLineEdit:focus, QTextEdit:focus {
+            border: 2px solid #FF6B00;
+            padding: 7px;
+        }
+        QLabel {
+            color: #E0E0E0;
+        }
+        QMenu {
+            background-color: #1E1E1E;
+            border: 1px solid #333333;
+            border-radius: 4px;
+            padding: 4px 0px;
+        }
+        QMenu::item {
+            padding: 8px 24px;
+            color: #E0E0E0;
+        }
+        QMenu::item:selected {
+            background-color: #333333;
+        }
+        QMessageBox {
+            background-color: #121212;
+        }
+        QMessageBox QLabel {
+            color: #E0E0E0;
+        }
+        QInputDialog {
+            background-color: #121212;
+        }
+        QComboBox {
+            background-color: rgba(30, 30, 30, 215);
+            border: 1px solid #424242;
+            border-radius: 4px;
+            padding: 8px;
+            min-height: 20px;
+            color: #E0E0E0;
+        }
+        QComboBox:focus {
+            border: 2px solid #FF6B00;
+        }
+        QComboBox::drop-down {
+            border: none;
+            width: 24px;
+        }
+        QComboBox::down-arrow {
+            width: 12px;
+            height: 12px;
+        }
+        QComboBox QAbstractItemView {
+            background-color: #1E1E1E;
+            color: #E0E0E0;
+            selection-background-color: #3D2814;
+        }
+        QScrollBar:vertical {
+            background-color: #1E1E1E;
+            width: 12px;
+            border-radius: 6px;
+        }
+        QScrollBar::handle:vertical {
+            background-color: #424242;
+            border-radius: 6px;
+            min-height: 40px;
+        }
+        QScrollBar::handle:vertical:hover {
+            background-color: #FF6B00;
+        }
+        QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical {
+            height: 0px;
+        }
+        QTreeWidget {
+            background-color: rgba(0, 0, 0, 100);
+            border: 1px solid #333333;
+            border-radius: 4px;
+            selection-background-color: #3D2814;
+            selection-color: #FFFFFF;
+            color: #E0E0E0;
+            outline: none;
+        }
+        QTreeWidget::item {
+            padding: 8px 4px;
+            border-bottom: 1px solid #2A2A2A;
+            color: #E0E0E0;
+            background-color: transparent;
+        }
+        QTreeWidget::item:selected {
+            background-color: #3D2814;
+            color: #FFFFFF;
+        }
+        QTreeWidget::branch {
+            background-color: transparent;
+        }
+        QTreeWidget::branch:has-children:!has-siblings:closed,
+        QTreeWidget::branch:closed:has-children:has-siblings {
+            image: url(none);
+            border-image: none;
+        }
+        QTreeWidget::branch:open:has-children:!has-siblings,
+        QTreeWidget::branch:open:has-children:has-siblings {
+            image: url(none);
+            border-image: none;
+        }
+        QGroupBox {
+            font-weight: bold;
+            border: 1px solid #424242;
+            border-radius: 4px;
+            margin-top: 12px;
+            padding-top: 8px;
+            color: #E0E0E0;
+        }
+        QGroupBox::title {
+            subcontrol-origin: margin;
+            left: 10px;
+            padding: 0 5px;
+        }
+        QCheckBox {
+            color: #E0E0E0;
+        }
+        QCheckBox::indicator {
+            width: 18px;
+            height: 18px;
+        }
+        QSpinBox {
+            background-color: rgba(30, 30, 30, 215);
+            border: 1px solid #424242;
+            border-radius: 4px;
+            padding: 4px;
+            padding-right: 20px;
+            color: #E0E0E0;
+        }
+        QSpinBox::up-button, QSpinBox::down-button {
+            background-color: #3D3D3D;
+            border: 1px solid #555555;
+            width: 18px;
+        }
+        QSpinBox::up-button {
+            border-top-right-radius: 3px;
+            subcontrol-origin: border;
+            subcontrol-position: top right;
+        }
+        QSpinBox::down-button {
+            border-bottom-right-radius: 3px;
+            subcontrol-origin: border;
+            subcontrol-position: bottom right;
+        }
+        QSpinBox::up-button:hover, QSpinBox::down-button:hover {
+            background-color: #4A4A4A;
+            border-color: #757575;
+        }
+        QSpinBox::up-button:pressed, QSpinBox::down-button:pressed {
+            background-color: #555555;
+        }
+        QTabWidget::pane {
+            border: 1px solid #424242;
+            border-radius: 4px;
+            background-color: #1E1E1E;
+        }
+        QTabBar::tab {
+            background-color: #2A2A2A;
+            color: #E0E0E0;
+            padding: 8px 16px;
+            border: 1px solid #424242;
+            border-bottom: none;
+            border-top-left-radius: 4px;
+            border-top-right-radius: 4px;
+        }
+        QTabBar::tab:selected {
+            background-color: #1E1E1E;
+            border-bottom: 2px solid #FF6B00;
+        }
+        QTabBar::tab:hover:!selected {
+            background-color: #333333;
+        }
+        QToolTip {
+            background-color: #424242;
+            color: #FFFFFF;
+            border: 1px solid #616161;
+            border-radius: 4px;
+            padding: 4px 8px;
+        }
         """
 
-    def get_light_theme(self):
-        """Return the light theme stylesheet with transparency"""
-        return """
-            QMainWindow, QDialog {
-                background-color: rgba(245, 245, 245, 230);
-            }
-            QWidget {
-                font-family: 'Segoe UI', 'Roboto', 'Noto Sans', sans-serif;
-                font-size: 14px;
-                color: #212121;
-            }
-            QPushButton {
-                background-color: #FF6B00;
-                color: white;
-                border: none;
-                border-radius: 4px;
-                padding: 8px 16px;
-                font-weight: 500;
-                min-height: 36px;
-            }
-            QPushButton:hover {
-                background-color: #FF8C00;
-            }
-            QPushButton:pressed {
-                background-color: #E65100;
-            }
-            QPushButton:disabled {
-                background-color: #BDBDBD;
-                color: #757575;
-            }
-            QPushButton#backBtn {
-                background-color: transparent;
-                color: #757575;
-                border: 1px solid #9E9E9E;
-                border-radius: 4px;
-                font-size: 18px;
-                font-weight: normal;
-                padding: 0px;
-                margin: 0px;
-                min-width: 32px;
-                max-width: 32px;
-                min-height: 32px;
-                max-height: 32px;
-            }
-            QPushButton#backBtn:hover {
-                background-color: #D5D5D5;
-                color: #333333;
-                border: 1px solid #757575;
-            }
-            QPushButton#backBtn:pressed {
-                background-color: #C0C0C0;
-                color: #333333;
-                border: 1px solid #757575;
-            }
-            QTableWidget {
-                background-color: rgba(215, 215, 215, 235);
-                border: 1px solid #BDBDBD;
-                border-radius: 4px;
-                gridline-color: #D0D0D0;
-                selection-background-color: #E67E00;
-                selection-color: #FFFFFF;
-                color: #212121;
-            }
-            QTableWidget::item {
-                padding: 12px 8px;
-                border-bottom: 1px solid #D0D0D0;
-                color: #212121;
-                background-color: transparent;
-            }
-            QTableWidget::item:selected {
-                background-color: #FFE0B2;
-                color: #212121;
-            }
-            QHeaderView::section {
-                background-color: rgba(220, 220, 220, 230);
-                color: #212121;
-                font-weight: 600;
-                padding: 12px 8px;
-                border: none;
-                border-bottom: 2px solid #FF6B00;
-            }
-            QLineEdit, QTextEdit {
-                background-color: rgba(220, 220, 220, 245);
-                border: 1px solid #BDBDBD;
-                border-radius: 4px;
-                padding: 8px;
-                color: #212121;
-                selection-background-color: #E67E00;
-                selection-color: #FFFFFF;
-            }
-            QLineEdit:focus, QTextEdit:focus {
-                border: 2px solid #FF6B00;
-                padding: 7px;
-            }
-            QLabel {
-                color: #212121;
-            }
-            QMenu {
-                background-color: rgba(255, 255, 255, 245);
-                border: 1px solid #E0E0E0;
-                border-radius: 4px;
-                padding: 4px 0px;
-            }
-            QMenu::item {
-                padding: 8px 24px;
-                color: #212121;
-            }
-            QMenu::item:selected {
-                background-color: #EEEEEE;
-            }
-            QMessageBox {
-                background-color: rgba(255, 255, 255, 240);
-            }
-            QMessageBox QLabel {
-                color: #212121;
-            }
-            QInputDialog {
-                background-color: rgba(255, 255, 255, 240);
-            }
-            QComboBox {
-                background-color: rgba(220, 220, 220, 245);
-                border: 1px solid #BDBDBD;
-                border-radius: 4px;
-                padding: 8px;
-                min-height: 20px;
-                color: #212121;
-            }
-            QComboBox:focus {
-                border: 2px solid #FF6B00;
-            }
-            QComboBox::drop-down {
-                border: none;
-                width: 24px;
-            }
-            QComboBox::down-arrow {
-                width: 12px;
-                height: 12px;
-            }
-            QComboBox QAbstractItemView {
-                background-color: rgba(240, 240, 240, 250);
-                color: #212121;
-                selection-background-color: #E67E00;
-                selection-color: #FFFFFF;
-            }
-            QScrollBar:vertical {
-                background-color: rgba(245, 245, 245, 200);
-                width: 12px;
-                border-radius: 6px;
-            }
-            QScrollBar::handle:vertical {
-                background-color: #BDBDBD;
-                border-radius: 6px;
-                min-height: 40px;
-            }
-            QScrollBar::handle:vertical:hover {
-                background-color: #FF6B00;
-            }
-            QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical {
-                height: 0px;
-            }
-            QTreeWidget {
-                background-color: rgba(215, 215, 215, 235);
-                border: 1px solid #BDBDBD;
-                border-radius: 4px;
-                selection-background-color: #E67E00;
-                selection-color: #FFFFFF;
-                color: #212121;
-                outline: none;
-            }
-            QTreeWidget::item {
-                padding: 8px 4px;
-                border-bottom: 1px solid #D0D0D0;
-                color: #212121;
-                background-color: transparent;
-            }
-            QTreeWidget::item:selected {
-                background-color: #FFE0B2;
-                color: #212121;
-            }
-            QTreeWidget::branch {
-                background-color: transparent;
-            }
-            QTreeWidget::branch:has-children:!has-siblings:closed,
-            QTreeWidget::branch:closed:has-children:has-siblings {
-                image: url(none);
-                border-image: none;
-            }
-            QTreeWidget::branch:open:has-children:!has-siblings,
-            QTreeWidget::branch:open:has-children:has-siblings {
-                image: url(none);
-                border-image: none;
-            }
-            QGroupBox {
-                font-weight: bold;
-                border: 1px solid #E0E0E0;
-                border-radius: 4px;
-                margin-top: 12px;
-                padding-top: 8px;
-                color: #212121;
-                background-color: rgba(255, 255, 255, 180);
-            }
-            QGroupBox::title {
-                subcontrol-origin: margin;
-                left: 10px;
-                padding: 0 5px;
-            }
-            QCheckBox {
-                color: #212121;
-            }
-            QCheckBox::indicator {
-                width: 18px;
-                height: 18px;
-            }
-            QSpinBox {
-                background-color: rgba(255, 255, 255, 230);
-                border: 1px solid #BDBDBD;
-                border-radius: 4px;
-                padding: 4px;
-                padding-right: 20px;
-                color: #212121;
-            }
-            QSpinBox::up-button, QSpinBox::down-button {
-                background-color: #E0E0E0;
-                border: 1px solid #9E9E9E;
-                width: 18px;
-            }
-            QSpinBox::up-button {
-                border-top-right-radius: 3px;
-                subcontrol-origin: border;
-                subcontrol-position: top right;
-            }
-            QSpinBox::down-button {
-                border-bottom-right-radius: 3px;
-                subcontrol-origin: border;
-                subcontrol-position: bottom right;
-            }
-            QSpinBox::up-button:hover, QSpinBox::down-button:hover {
-                background-color: #D0D0D0;
-                border-color: #757575;
-            }
-            QSpinBox::up-button:pressed, QSpinBox::down-button:pressed {
-                background-color: #BDBDBD;
-            }
-            QTabWidget::pane {
-                border: 1px solid #E0E0E0;
-                border-radius: 4px;
-                background-color: rgba(255, 255, 255, 220);
-            }
-            QTabBar::tab {
-                background-color: rgba(238, 238, 238, 230);
-                color: #212121;
-                padding: 8px 16px;
-                border: 1px solid #E0E0E0;
-                border-bottom: none;
-                border-top-left-radius: 4px;
-                border-top-right-radius: 4px;
-            }
-            QTabBar::tab:selected {
-                background-color: rgba(255, 255, 255, 240);
-                border-bottom: 2px solid #FF6B00;
-            }
-            QTabBar::tab:hover:!selected {
-                background-color: rgba(224, 224, 224, 230);
-            }
-            QToolTip {
-                background-color: #333333;
-                color: #FFFFFF;
-                border: 1px solid #555555;
-                border-radius: 4px;
-                padding: 4px 8px;
-            }
+    # Light theme stylesheet (with transparency)
+    _LIGHT_QSS = """
+        QMainWindow, QDialog {
+            background-color: rgba(245, 245, 245, 230);
+        }
+        QWidget {
+            font-family: 'Segoe UI', 'Roboto', 'Noto Sans', sans-serif;
+            font-size: 14px;
+            color: #212121;
+        }
+        QPushButton {
+            background-color: #FF6B00;
+            color: white;
+            border: none;
+            border-radius: 4px;
+            padding: 8px 16px;
+            font-weight: 500;
+            min-height: 36px;
+        }
+        QPushButton:hover {
+            background-color: #FF8C00;
+        }
+        QPushButton:pressed {
+            background-color: #E65100;
+        }
+        QPushButton:disabled {
+            background-color: #BDBDBD;
+            color: #757575;
+        }
+        QPushButton#backBtn {
+            background-color: transparent;
+            color: #757575;
+            border: 1px solid #9E9E9E;
+            border-radius: 4px;
+            font-size: 18px;
+            font-weight: normal;
+            padding: 0px;
+            margin: 0px;
+            min-width: 32px;
+            max-width: 32px;
+            min-height: 32px;
+            max-height: 32px;
+        }
+        QPushButton#backBtn:hover {
+            background-color: #D5D5D5;
+            color: #333333;
+            border: 1px solid #757575;
+        }
+        QPushButton#backBtn:pressed {
+            background-color: #C0C0C0;
+            color: #333333;
+            border: 1px solid #757575;
+        }
+        QTableWidget {
+            background-color: rgba(215, 215, 215, 235);
+            border: 1px solid #BDBDBD;
+            border-radius: 4px;
+            gridline-color: #D0D0D0;
+            selection-background-color: #E67E00;
+            selection-color: #FFFFFF;
+            color: #212121;
+        }
+        QTableWidget::item {
+            padding: 12px 8px;
+            border-bottom: 1px solid #D0D0D0;
+            color: #212121;
+            background-color: transparent;
+        }
+        QTableWidget::item:selected {
+            background-color: #FFE0B2;
+            color: #212121;
+        }
+        QHeaderView::section {
+            background-color: rgba(220, 220, 220, 230);
+            color: #212121;
+            font-weight: 600;
+            padding: 12px 8px;
+            border: none;
+            border-bottom: 2px solid #FF6B00;
+        }
+        QLineEdit, QTextEdit {
+            background-color: rgba(220, 220, 220, 245);
+            border: 1px solid #BDBDBD;
+            border-radius: 4px;
+            padding: 8px;
+            color: #212121;
+            selection-background-color: #E67E00;
+            selection-color: #FFFFFF;
+        }
+        QLineEdit:focus, QTextEdit:focus {
+            border: 2px solid #FF6B00;
+            padding: 7px;
+        }
+        QLabel {
+            color: #212121;
+        }
+        QMenu {
+            background-color: rgba(255, 255, 255, 245);
+            border: 1px solid #E0E0E0;
+            border-radius: 4px;
+            padding: 4px 0px;
+        }
+        QMenu::item {
+            padding: 8px 24px;
+            color: #212121;
+        }
+        QMenu::item:selected {
+            background-color: #EEEEEE;
+        }
+        QMessageBox {
+            background-color: rgba(255, 255, 255, 240);
+        }
+        QMessageBox QLabel {
+            color: #212121;
+        }
+        QInputDialog {
+            background-color: rgba(255, 255, 255, 240);
+        }
+        QComboBox {
+            background-color: rgba(220, 220, 220, 245);
+            border: 1px solid #BDBDBD;
+            border-radius: 4px;
+            padding: 8px;
+            min-height: 20px;
+            color: #212121;
+        }
+        QComboBox:focus {
+            border: 2px solid #FF6B00;
+        }
+        QComboBox::drop-down {
+            border: none;
+            width: 24px;
+        }
+        QComboBox::down-arrow {
+            width: 12px;
+            height: 12px;
+        }
+        QComboBox QAbstractItemView {
+            background-color: rgba(240, 240, 240, 250);
+            color: #212121;
+            selection-background-color: #E67E00;
+            selection-color: #FFFFFF;
+        }
+        QScrollBar:vertical {
+            background-color: rgba(245, 245, 245, 200);
+            width: 12px;
+            border-radius: 6px;
+        }
+        QScrollBar::handle:vertical {
+            background-color: #BDBDBD;
+            border-radius: 6px;
+            min-height: 40px;
+        }
+        QScrollBar::handle:vertical:hover {
+            background-color: #FF6B00;
+        }
+        QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical {
+            height: 0px;
+        }
+        QTreeWidget {
+            background-color: rgba(215, 215, 215, 235);
+            border: 1px solid #BDBDBD;
+            border-radius: 4px;
+            selection-background-color: #E67E00;
+            selection-color: #FFFFFF;
+            color: #212121;
+            outline: none;
+        }
+        QTreeWidget::item {
+            padding: 8px 4px;
+            border-bottom: 1px solid #D0D0D0;
+            color: #212121;
+            background-color: transparent;
+        }
+        QTreeWidget::item:selected {
+            background-color: #FFE0B2;
+            color: #212121;
+        }
+        QTreeWidget::branch {
+            background-color: transparent;
+        }
+        QTreeWidget::branch:has-children:!has-siblings:closed,
+        QTreeWidget::branch:closed:has-children:has-siblings {
+            image: url(none);
+            border-image: none;
+        }
+        QTreeWidget::branch:open:has-children:!has-siblings,
+        QTreeWidget::branch:open:has-children:has-siblings {
+            image: url(none);
+            border-image: none;
+        }
+        QGroupBox {
+            font-weight: bold;
+            border: 1px solid #E0E0E0;
+            border-radius: 4px;
+            margin-top: 12px;
+            padding-top: 8px;
+            color: #212121;
+            background-color: rgba(255, 255, 255, 180);
+        }
+        QGroupBox::title {
+            subcontrol-origin: margin;
+            left: 10px;
+            padding: 0 5px;
+        }
+        QCheckBox {
+            color: #212121;
+        }
+        QCheckBox::indicator {
+            width: 18px;
+            height: 18px;
+        }
+        QSpinBox {
+            background-color: rgba(255, 255, 255, 230);
+            border: 1px solid #BDBDBD;
+            border-radius: 4px;
+            padding: 4px;
+            padding-right: 20px;
+            color: #212121;
+        }
+        QSpinBox::up-button, QSpinBox::down-button {
+            background-color: #E0E0E0;
+            border: 1px solid #9E9E9E;
+            width: 18px;
+        }
+        QSpinBox::up-button {
+            border-top-right-radius: 3px;
+            subcontrol-origin: border;
+            subcontrol-position: top right;
+        }
+        QSpinBox::down-button {
+            border-bottom-right-radius: 3px;
+            subcontrol-origin: border;
+            subcontrol-position: bottom right;
+        }
+        QSpinBox::up-button:hover, QSpinBox::down-button:hover {
+            background-color: #D0D0D0;
+            border-color: #757575;
+        }
+        QSpinBox::up-button:pressed, QSpinBox::down-button:pressed {
+            background-color: #BDBDBD;
+        }
+        QTabWidget::pane {
+            border: 1px solid #E0E0E0;
+            border-radius: 4px;
+            background-color: rgba(255, 255, 255, 220);
+        }
+        QTabBar::tab {
+            background-color: rgba(238, 238, 238, 230);
+            color: #212121;
+            padding: 8px 16px;
+            border: 1px solid #E0E0E0;
+            border-bottom: none;
+            border-top-left-radius: 4px;
+            border-top-right-radius: 4px;
+        }
+        QTabBar::tab:selected {
+            background-color: rgba(255, 255, 255, 240);
+            border-bottom: 2px solid #FF6B00;
+        }
+        QTabBar::tab:hover:!selected {
+            background-color: rgba(224, 224, 224, 230);
+        }
+        QToolTip {
+            background-color: #333333;
+            color: #FFFFFF;
+            border: 1px solid #555555;
+            border-radius: 4px;
+            padding: 4px 8px;
+        }
         """
 
     def detect_system_theme(self):
@@ -7078,10 +7740,9 @@ class MainWindow(QMainWindow):
         if theme == 'Auto (System)':
             theme = self.detect_system_theme()
 
-        if theme == 'Light':
-            self.setStyleSheet(self.get_light_theme())
-        else:
-            self.setStyleSheet(self.get_dark_theme())
+        qss = self._LIGHT_QSS if theme == 'Light' else self._DARK_QSS
+        if self.styleSheet() != qss:  # Re-applying makes Qt re-parse and re-polish everything
+            self.setStyleSheet(qss)
 
         # Set tooltip palette for proper colors (works with native tooltips)
         from PyQt5.QtGui import QPalette, QColor
@@ -7112,13 +7773,10 @@ class MainWindow(QMainWindow):
         self.snippets = self.load_snippets()
         self.custom_folders = self.load_folders()
         self.settings = self.load_settings()
+        self.settings_writer = SettingsWriter(self.settings_file)
         self.keyboard_controller = Controller()
         self.form_inputs = {}
 
-        # Emoji database cache (built once on first use)
-        self._emoji_database_cache = None
-        self._emoji_search_index_cache = None
-        self._emoji_categories_cache = None
         
         # Setup shared memory for single instance communication
         self.shared_memory = QSharedMemory("SnipForgeInstance")
@@ -7415,14 +8073,18 @@ class MainWindow(QMainWindow):
             theme = self.detect_system_theme()
         is_light = (theme == 'Light')
 
-        # Check for custom background first
+        # Check for custom background first (paths stay plain strings)
         custom_bg = self.settings.get('custom_background', '')
         custom_bg_light = self.settings.get('custom_background_light', '')
+        if custom_bg:
+            custom_bg = _norm_path(custom_bg)
+        if custom_bg_light:
+            custom_bg_light = _norm_path(custom_bg_light)
 
-        if is_light and custom_bg_light and Path(custom_bg_light).exists():
+        if is_light and custom_bg_light and os.path.exists(custom_bg_light):
             # Use custom light mode background
             self.background_pixmap = QPixmap(custom_bg_light)
-        elif custom_bg and Path(custom_bg).exists():
+        elif custom_bg and os.path.exists(custom_bg):
             # Use custom background (works for both modes if no light-specific one)
             self.background_pixmap = QPixmap(custom_bg)
         else:
@@ -7575,9 +8237,8 @@ class MainWindow(QMainWindow):
         return default_settings
 
     def save_settings(self):
-        """Save application settings"""
-        with open(self.settings_file, 'w') as f:
-            json.dump(self.settings, f, indent=2)
+        """Save application settings (written in the background)"""
+        self.settings_writer.save(self.settings)
 
     def load_emoji_favorites(self):
         """Load user's favorite emojis list"""
@@ -7611,9 +8272,10 @@ class MainWindow(QMainWindow):
 
     def build_emoji_database(self):
         """Build categorized emoji database with curated popular emojis (~400 total)"""
+        global _EMOJI_DB_CACHE
         # Return cached data if available
-        if self._emoji_database_cache is not None:
-            return self._emoji_database_cache, self._emoji_search_index_cache, self._emoji_categories_cache
+        if _EMOJI_DB_CACHE is not None:
+            return _EMOJI_DB_CACHE
 
         # Category definitions with icons
         EMOJI_CATEGORIES = [
@@ -8664,12 +9326,14 @@ class MainWindow(QMainWindow):
                         search_index[term] = set()
                     search_index[term].add(emoji_char)
 
+        # Freeze category lists; the cached data is shared and never mutated
+        database = {category: tuple(emojis) for category, emojis in database.items()}
+        search_index = {term: frozenset(emojis) for term, emojis in search_index.items()}
+
         # Cache the results
-        self._emoji_database_cache = database
-        self._emoji_search_index_cache = search_index
-        self._emoji_categories_cache = EMOJI_CATEGORIES
+        _EMOJI_DB_CACHE = (database, search_index, tuple(EMOJI_CATEGORIES))
 
-        return database, search_index, EMOJI_CATEGORIES
+        return _EMOJI_DB_CACHE
 
     def get_date_format(self):
         """Get the current date format string for strftime"""
@@ -8684,9 +9348,7 @@ class MainWindow(QMainWindow):
     def show_settings(self):
         """Show the settings dialog (settings auto-apply when changed)"""
         dialog = SettingsDialog(self, self.settings)
-        dialog.exec_()
-        # Settings are auto-applied, just reload in case dialog was closed unexpectedly
-        self.settings = self.load_settings()
+        dialog.exec_()  # Settings are auto-applied as they change
 
     def get_folders(self):
         """Get list of unique folder names from snippets and custom folders"""
@@ -8732,44 +9394,90 @@ class MainWindow(QMainWindow):
 
         # Create tree items
         for folder in sorted_folders:
-            # Create folder item
-            folder_item = QTreeWidgetItem(self.tree)
-            snippet_count = len(folder_snippets[folder])
-            # Start expanded with down arrow
-            folder_item.setText(0, f"▼  {folder} ({snippet_count})")
-            folder_item.setData(0, Qt.UserRole, {'type': 'folder', 'name': folder, 'count': snippet_count})
-            folder_item.setExpanded(True)
-
-            # Style folder row
-            folder_font = folder_item.font(0)
-            folder_font.setBold(True)
-            folder_item.setFont(0, folder_font)
-            folder_item.setForeground(0, QColor('#FF6B00'))
-            # Set folder background based on current theme
-            if hasattr(self, 'current_theme') and self.current_theme == 'Light':
-                folder_item.setBackground(0, QColor(230, 230, 230))
-                folder_item.setBackground(1, QColor(230, 230, 230))
-                folder_item.setBackground(2, QColor(230, 230, 230))
-            else:
-                folder_item.setBackground(0, QColor(30, 30, 30))
-                folder_item.setBackground(1, QColor(30, 30, 30))
-                folder_item.setBackground(2, QColor(30, 30, 30))
-
-            # Add snippet children
-            for snippet_index, snippet in folder_snippets[folder]:
-                snippet_item = QTreeWidgetItem(folder_item)
-                snippet_item.setText(0, snippet.get('trigger', ''))
-                snippet_item.setText(1, snippet.get('description', ''))
-                type_name = {
-                    'simple': 'Simple',
-                    'variables': 'Variables',
-                    'form': 'Form',
-                    'text_image': 'Text+Image',
-                    'universal': 'Universal'
-                }.get(snippet.get('type', 'universal'), 'Universal')
-                snippet_item.setText(2, type_name)
-                # Store the snippet index for retrieval
-                snippet_item.setData(0, Qt.UserRole, {'type': 'snippet', 'index': snippet_index})
+            folder_item = self.create_folder_item(folder, folder_snippets[folder])
+            self.tree.addTopLevelItem(folder_item)
+            folder_item.setExpanded(True)  # Start expanded with down arrow
+
+    def create_folder_item(self, folder, snippets):
+        """Create a folder tree item with children for (snippet index, snippet) pairs"""
+        folder_item = QTreeWidgetItem()
+        snippet_count = len(snippets)
+        folder_item.setText(0, f"▼  {folder} ({snippet_count})")
+        folder_item.setData(0, Qt.UserRole, {'type': 'folder', 'name': folder, 'count': snippet_count})
+
+        # Style folder row
+        folder_font = folder_item.font(0)
+        folder_font.setBold(True)
+        folder_item.setFont(0, folder_font)
+        folder_item.setForeground(0, QColor('#FF6B00'))
+        # Set folder background based on current theme
+        if hasattr(self, 'current_theme') and self.current_theme == 'Light':
+            folder_item.setBackground(0, QColor(230, 230, 230))
+            folder_item.setBackground(1, QColor(230, 230, 230))
+            folder_item.setBackground(2, QColor(230, 230, 230))
+        else:
+            folder_item.setBackground(0, QColor(30, 30, 30))
+            folder_item.setBackground(1, QColor(30, 30, 30))
+            folder_item.setBackground(2, QColor(30, 30, 30))
+
+        # Add snippet children
+        folder_item.addChildren([self.create_snippet_item(index, snippet) for index, snippet in snippets])
+        return folder_item
+
+    def create_snippet_item(self, snippet_index, snippet):
+        """Create the tree item for a snippet"""
+        snippet_item = QTreeWidgetItem()
+        snippet_item.setText(0, snippet.get('trigger', ''))
+        snippet_item.setText(1, snippet.get('description', ''))
+        type_name = {
+            'simple': 'Simple',
+            'variables': 'Variables',
+            'form': 'Form',
+            'text_image': 'Text+Image',
+            'universal': 'Universal'
+        }.get(snippet.get('type', 'universal'), 'Universal')
+        snippet_item.setText(2, type_name)
+        # Store the snippet index for retrieval
+        snippet_item.setData(0, Qt.UserRole, {'type': 'snippet', 'index': snippet_index})
+        return snippet_item
+
+    def append_snippets(self, new_snippets):
+        """Add snippets to the end of the list, inserting only their tree items"""
+        start = len(self.snippets)
+        self.snippets.extend(new_snippets)
+        self.save_snippets()  # Also fills in missing folders
+
+        # Group the new snippets by folder, as refresh_tree does
+        folder_snippets = {}
+        for i, snippet in enumerate(new_snippets, start):
+            folder_snippets.setdefault(snippet.get('folder') or 'General', []).append((i, snippet))
+
+        folder_items = {}
+        for i in range(self.tree.topLevelItemCount()):
+            item = self.tree.topLevelItem(i)
+            folder_items[item.data(0, Qt.UserRole)['name']] = item
+        # Folder order used by refresh_tree (General first, then alphabetically)
+        sort_keys = [(name != 'General', name.lower()) for name in folder_items]
+
+        self.tree.setUpdatesEnabled(False)
+        for folder, snippets in folder_snippets.items():
+            folder_item = folder_items.get(folder)
+            if folder_item is None:
+                sort_key = (folder != 'General', folder.lower())
+                position = bisect.bisect(sort_keys, sort_key)
+                sort_keys.insert(position, sort_key)
+                folder_item = self.create_folder_item(folder, snippets)
+                self.tree.insertTopLevelItem(position, folder_item)
+                folder_item.setExpanded(True)
+                continue
+
+            folder_item.addChildren([self.create_snippet_item(index, snippet) for index, snippet in snippets])
+            data = folder_item.data(0, Qt.UserRole)
+            data['count'] += len(snippets)
+            folder_item.setData(0, Qt.UserRole, data)
+            arrow = "▼" if folder_item.isExpanded() else "▶"
+            folder_item.setText(0, f"{arrow}  {folder} ({data['count']})")
+        self.tree.setUpdatesEnabled(True)
 
     def refresh_table(self):
         """Alias for refresh_tree for backward compatibility"""
@@ -9155,9 +9863,9 @@ class MainWindow(QMainWindow):
             def convert_formatting_to_html(text):
                 """Convert markdown-style formatting to HTML"""
                 # Convert bold: **text** -> <b>text</b>
-                text = re.sub(r'\*\*(.+?)\*\*', r'<b>\1</b>', text)
+                text = _BOLD_RE.sub(r'<b>\1</b>', text)
                 # Convert italic: *text* -> <i>text</i> (but not inside bold tags)
-                text = re.sub(r'(?<![*<])\*([^*]+?)\*(?![*>])', r'<i>\1</i>', text)
+                text = _ITALIC_RE.sub(r'<i>\1</i>', text)
                 # <u>text</u> is already HTML, no conversion needed
                 # Convert newlines to <br> for proper line breaks
                 text = text.replace('\n', '<br>')
@@ -9957,6 +10665,7 @@ EndFragment:{end_fragment:08d}
         """Quit the application"""
         self.listener_thread.stop()
         self.listener_thread.wait()
+        QThreadPool.globalInstance().waitForDone()  # Finish any pending settings write
         QApplication.quit()
 
 
@@ -10027,6 +10736,9 @@ def main():
     import os
     os.environ['QT_QUICK_CONTROLS_STYLE'] = 'Default'
 
+    if '--verbose' in sys.argv:
+        logging.basicConfig(level=logging.DEBUG, format='%(asctime)s %(levelname)s %(message)s')
+
     app = QApplication(sys.argv)
     app.setQuitOnLastWindowClosed(False)
     app.setDesktopFileName("snipforge")  # Match StartupWMClass in .desktop file